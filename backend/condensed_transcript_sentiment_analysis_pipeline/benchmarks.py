@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the transcript pipeline stages on a synthetic corpus.
+
+Each benchmark times the current stage implementation against the
+straightforward row-by-row reference it replaced, and checks that both
+produce the same output.
+
+Usage:
+    python benchmarks.py                       # every stage
+    python benchmarks.py stage_01 --lines 100000 --files 5000
+"""
+
+import argparse
+import random
+import re
+import time
+
+import pandas as pd
+from nltk.tokenize import sent_tokenize
+
+from full_sentiment_analyzer_pipeline import (
+    DEFAULT_OTHER_SERVICES,
+    _nltk_setup,
+    stage_01_tag_roles,
+    stage_02_sentence_level,
+    stage_04_separate_services,
+)
+
+_SPEAKERS = ["Interviewer", "Jordan Lee", "Sam Patel", "Alex Kim", ""]
+_SENTENCES = [
+    "I use Figma every day for client work.",
+    "Honestly, the templates save me a lot of time!",
+    "We tried Sketch before but it was hard to share files.",
+    "Why did you switch?",
+    "The pricing is a bit steep for students, e.g. the pro plan.",
+    "We moved our decks from PowerPoint to Canva.",
+    "Canva is what our whole club uses now.",
+    "Um, I think so.",
+    "Photoshop is still better for photo editing, at least for me.",
+    "It crashes sometimes... but not often.",
+    "Dr. Smith recommended it to our team in 2021.",
+    "Yeah.",
+]
+
+
+def make_corpus(n_lines: int, n_files: int, seed: int = 0) -> pd.DataFrame:
+    """A stage_01-shaped DataFrame of n_lines lines spread over n_files transcripts."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_lines):
+        file_idx = i * n_files // n_lines
+        name     = f"Participant {file_idx}"
+        # Every third file labels its interviewee by the filename-derived name
+        speaker  = rng.choice(_SPEAKERS + [name] * (file_idx % 3 == 0))
+        rows.append({
+            "interviewee": name,
+            "line_number": i + 1,
+            "speaker":     speaker,
+            "timestamp":   "",
+            "text":        " ".join(rng.choices(_SENTENCES, k=rng.randint(1, 4))),
+            "role":        "interviewer" if speaker == "Interviewer" else ("unknown" if not speaker else "interviewee"),
+        })
+    return pd.DataFrame(rows)
+
+
+def _stage_01_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The original per-file loop implementation of stage_01."""
+    df = df.copy()
+    df["speaker"]     = df["speaker"].fillna("").astype(str).str.strip()
+    df["interviewee"] = df["interviewee"].astype(str).str.strip()
+    df["text"]        = df["text"].astype(str)
+    df["role"]        = "unknown"
+
+    for interviewee_name, file_df in df.groupby("interviewee"):
+        labeled = file_df[file_df["speaker"].ne("")]
+        if labeled.empty:
+            continue
+        exact = labeled[labeled["speaker"].eq(interviewee_name)]
+        if not exact.empty:
+            top_speaker = interviewee_name
+        else:
+            top_speaker = labeled["speaker"].value_counts().idxmax()
+        is_top = file_df["speaker"].eq(top_speaker)
+        df.loc[file_df[is_top].index, "role"] = "interviewee"
+        df.loc[file_df[~is_top & file_df["speaker"].ne("")].index, "role"] = "interviewer"
+    return df
+
+
+def _stage_02_reference(df: pd.DataFrame) -> pd.DataFrame:
+    """The original iterrows implementation of stage_02."""
+    rows = []
+    for _, row in df.iterrows():
+        for sent in sent_tokenize(str(row.get("text", ""))):
+            sent = sent.strip()
+            if not sent:
+                continue
+            rows.append({
+                "interviewee": row.get("interviewee", ""),
+                "role":        row.get("role", ""),
+                "speaker":     row.get("speaker", ""),
+                "line_number": row.get("line_number"),
+                "sentence":    sent,
+            })
+    return pd.DataFrame(rows)
+
+
+def _stage_04_reference(df: pd.DataFrame, target_company: str, services: list[str]):
+    """The original regex implementation of stage_04."""
+    sentences = df["sentence"].astype(str)
+    mentions_target = sentences.str.contains(
+        r"\b" + re.escape(target_company) + r"\b", flags=re.IGNORECASE, na=False
+    )
+    mentions_other = sentences.str.contains(
+        r"\b(?:" + "|".join(re.escape(w) for w in services) + r")\b", flags=re.IGNORECASE, na=False
+    )
+    return df[mentions_target & ~mentions_other].copy(), df[mentions_other].copy()
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """
+    Equal values and column order, ignoring categorical vs object dtypes
+    (the references return object columns; stage_02's dtypes are asserted
+    separately in tests/test_parity.py).
+    """
+    plain = lambda df: df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    return plain(a).equals(plain(b))
+
+
+def bench_stage_01(corpus: pd.DataFrame) -> None:
+    untagged = corpus.drop(columns="role")
+    reference, t_ref = _timed(_stage_01_reference, untagged)
+    current,   t_cur = _timed(stage_01_tag_roles, untagged)
+    print(f"stage_01  reference: {t_ref:7.2f}s   current: {t_cur:7.2f}s   "
+          f"speedup: {t_ref / t_cur:5.1f}x   identical: {_same(reference, current)}")
+
+
+def bench_stage_02(corpus: pd.DataFrame) -> None:
+    _nltk_setup()
+    reference, t_ref = _timed(_stage_02_reference, corpus)
+    current,   t_cur = _timed(stage_02_sentence_level, corpus)
+    print(f"stage_02  reference: {t_ref:7.2f}s   current: {t_cur:7.2f}s   "
+          f"speedup: {t_ref / t_cur:5.1f}x   identical: {_same(reference, current)}")
+    print(f"          sentences: {len(current)}   memory: "
+          f"{reference.memory_usage(deep=True).sum() / 1e6:.1f} MB → "
+          f"{current.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+
+
+def bench_stage_04(corpus: pd.DataFrame) -> None:
+    # Lines stand in for sentences; matching cost is the same
+    sentences = corpus.rename(columns={"text": "sentence"})
+    reference, t_ref = _timed(_stage_04_reference, sentences, "Canva", DEFAULT_OTHER_SERVICES)
+    current,   t_cur = _timed(stage_04_separate_services, sentences, "Canva", DEFAULT_OTHER_SERVICES)
+    identical = all(_same(r, c) for r, c in zip(reference, current))
+    print(f"stage_04  reference: {t_ref:7.2f}s   current: {t_cur:7.2f}s   "
+          f"speedup: {t_ref / t_cur:5.1f}x   identical: {identical}")
+
+
+BENCHMARKS = {
+    "stage_01": bench_stage_01,
+    "stage_02": bench_stage_02,
+    "stage_04": bench_stage_04,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transcript pipeline stage benchmarks")
+    parser.add_argument("stages", nargs="*", default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument("--lines", type=int, default=100_000, help="Transcript lines in the synthetic corpus")
+    parser.add_argument("--files", type=int, default=100,     help="Transcript files the lines are spread over")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.lines, args.files)
+    print(f"Synthetic corpus: {len(corpus)} lines, {args.files} files\n")
+    for stage in args.stages:
+        BENCHMARKS[stage](corpus)
@@ -22,27 +22,32 @@ Usage:
 """
 
 import argparse
+import io
 import os
+import posixpath
 import re
 import sys
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+import zipfile
+from collections import defaultdict, deque
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import BinaryIO
+from xml.etree import ElementTree
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from docx import Document
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from sentiment_model import classify, classify_batch
-
-_BATCH_SIZE = 20   # sentences per OpenAI call
-_MAX_WORKERS = 10  # parallel batch requests
+from sentiment_model import cache_namespace, classify, classify_batch, classify_batch_async, is_placeholder
+import transcript_cache
 
 # ===========================================================================
 # CONFIG — module-level defaults used only when running from the CLI
@@ -53,6 +58,36 @@ _MAX_WORKERS = 10  # parallel batch requests
 INPUT_DIR  = "./raw_transcripts"   # folder with .docx / .txt transcripts
 OUTPUT_DIR = "./outputs"           # all plots and (optional) CSVs go here
 
+# ── Stage 00 parallelism ─────────────────────────────────────────────────────
+# Worker processes used to parse transcript files. 1 parses in-process, one
+# file after another; 0 means one worker per CPU core.
+PARSE_WORKERS = int(os.getenv("TRANSCRIPT_PARSE_WORKERS", "1"))
+
+# ── PDF extraction ───────────────────────────────────────────────────────────
+# "layout" — pdfplumber, page by page (full character/layout analysis).
+# "text"   — raw text layer only via PDFium, no table or character geometry;
+#            pages of PDFs with at least PDF_PARALLEL_PAGES pages are spread
+#            over a process pool. Pages that come back empty are re-read
+#            with pdfplumber.
+PDF_MODE           = os.getenv("TRANSCRIPT_PDF_MODE", "layout").lower()
+PDF_PARALLEL_PAGES = int(os.getenv("TRANSCRIPT_PDF_PARALLEL_PAGES", "40"))
+
+# ── Streaming stages 00–03 ───────────────────────────────────────────────────
+# With TRANSCRIPT_STREAM=1 (CLI --stream) parse, role tagging, sentence
+# splitting and classification run overlapped, so classification starts while
+# later files are still parsing. STREAM_QUEUE_SIZE bounds the files waiting
+# between two stages; STREAM_BATCH_SIZE is the sentences per classify call and
+# STREAM_IN_FLIGHT the classify calls running at once.
+STREAM             = os.getenv("TRANSCRIPT_STREAM", "0").lower() in ("1", "true", "on")
+STREAM_QUEUE_SIZE  = int(os.getenv("TRANSCRIPT_STREAM_QUEUE", "4"))
+STREAM_BATCH_SIZE  = int(os.getenv("TRANSCRIPT_STREAM_BATCH", "256"))
+STREAM_IN_FLIGHT   = int(os.getenv("TRANSCRIPT_STREAM_IN_FLIGHT", "4"))
+
+# Per-file results (parsed lines, sentences, sentiment) are reused across runs
+# through transcript_cache. Bump this whenever parsing, sentence splitting or
+# the cached entry layout changes so entries from older versions are ignored.
+PIPELINE_VERSION = "2"
+
 # ── Target company fallback ──────────────────────────────────────────────────
 # Only used when running the CLI without --company.
 # In API usage the frontend always supplies the company name explicitly.
@@ -133,6 +168,21 @@ def _nltk_setup() -> None:
         nltk.download(resource, quiet=True)
 
 
+_punkt = None
+
+
+def _sentence_tokenizer():
+    """The Punkt tokenizer sent_tokenize uses, loaded once per process."""
+    global _punkt
+    if _punkt is None:
+        try:
+            from nltk.tokenize import _get_punkt_tokenizer  # nltk >= 3.8.2
+            _punkt = _get_punkt_tokenizer("english")
+        except ImportError:
+            _punkt = nltk.data.load("tokenizers/punkt/english.pickle")
+    return _punkt
+
+
 def _company_slug(company: str) -> str:
     """Return a lowercase, filesystem-safe version of the company name."""
     return re.sub(r"[^a-z0-9]+", "_", company.lower()).strip("_")
@@ -188,65 +238,302 @@ def _parse_line(raw: str):
     return "", "", stripped
 
 
-def _iter_docx(filepath: str):
-    for para in Document(filepath).paragraphs:
-        if para.text.strip():
-            yield para.text.strip()
-
+# A transcript source: a path on disk, raw bytes, or a binary file-like object
+# (e.g. an upload's spooled file). Every _iter_* reader accepts all three.
+Source = str | bytes | BinaryIO
+
+
+def _binary(source: Source) -> str | BinaryIO:
+    """Path unchanged; bytes wrapped in BytesIO; file-likes rewound."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+# ── Fast .docx text extraction ──────────────────────────────────────────────
+# Streams the main document XML out of the .docx zip with an incremental
+# parser instead of building python-docx's object model. Mirrors
+# Document(...).paragraphs[i].text exactly: only paragraphs directly under
+# w:body, and only w:r / w:hyperlink/w:r runs directly under each paragraph.
+_W_NS       = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_REL_NS     = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_OFFICE_DOC = "/officeDocument"
+
+_W_BODY, _W_P, _W_R, _W_HYPERLINK = (_W_NS + t for t in ("body", "p", "r", "hyperlink"))
+_W_BR_TYPE = _W_NS + "type"
+# Run children with a fixed text equivalent (w:t and w:br are handled separately)
+_W_RUN_TEXT = {_W_NS + "tab": "\t", _W_NS + "ptab": "\t", _W_NS + "cr": "\n", _W_NS + "noBreakHyphen": "-"}
+
+
+def _docx_main_part(zf: zipfile.ZipFile) -> str:
+    """Zip path of the main document part, resolved through _rels/.rels."""
+    with zf.open("_rels/.rels") as f:
+        for rel in ElementTree.parse(f).getroot().iter(_REL_NS + "Relationship"):
+            if rel.get("Type", "").endswith(_OFFICE_DOC) and rel.get("TargetMode") != "External":
+                return posixpath.normpath(rel.get("Target", "").lstrip("/"))
+    raise KeyError("no officeDocument relationship")
+
+
+def _docx_fast_paragraphs(source: Source) -> list[str]:
+    """Text of every body-level paragraph, via iterparse over the document XML."""
+    paragraphs = []
+    with zipfile.ZipFile(_binary(source)) as zf, zf.open(_docx_main_part(zf)) as xml:
+        stack: list[str] = []
+        parts: list[str] = []
+        for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                stack.append(elem.tag)
+                continue
 
-def _iter_txt(filepath: str):
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            depth = len(stack)
+            # stack: document, body, p, [hyperlink,] r, <run child>
+            if depth >= 5 and stack[1] == _W_BODY and stack[2] == _W_P and (
+                (depth == 5 and stack[3] == _W_R)
+                or (depth == 6 and stack[3] == _W_HYPERLINK and stack[4] == _W_R)
+            ):
+                if elem.tag == _W_NS + "t":
+                    parts.append(elem.text or "")
+                elif elem.tag == _W_NS + "br":
+                    parts.append("\n" if elem.get(_W_BR_TYPE, "textWrapping") == "textWrapping" else "")
+                else:
+                    parts.append(_W_RUN_TEXT.get(elem.tag, ""))
+            elif depth == 3 and stack[1] == _W_BODY:
+                if elem.tag == _W_P:
+                    paragraphs.append("".join(parts))
+                parts = []
+                elem.clear()  # body children are done with — keep memory flat
+            stack.pop()
+    return paragraphs
+
+
+def _iter_docx(source: Source):
+    """
+    Non-blank paragraph text of a .docx. Uses the streaming extractor and
+    falls back to python-docx for documents it can't read (missing parts,
+    strict-OOXML namespaces, malformed XML).
+    """
+    try:
+        paragraphs = _docx_fast_paragraphs(source)
+    except (KeyError, ValueError, zipfile.BadZipFile, ElementTree.ParseError):
+        paragraphs = None
+    if not paragraphs:
+        paragraphs = [para.text for para in Document(_binary(source)).paragraphs]
+    for text in paragraphs:
+        if text.strip():
+            yield text.strip()
+
+
+def _iter_txt(source: Source):
+    if isinstance(source, str):
+        f = open(source, "r", encoding="utf-8", errors="ignore")
+    else:
+        f = io.TextIOWrapper(_binary(source), encoding="utf-8", errors="ignore")
+    try:
         for line in f:
             if line.strip():
                 yield line.rstrip("\n")
+    finally:
+        if isinstance(source, str):
+            f.close()
+        else:
+            f.detach()  # leave the caller's file object open
+
+
+def _iter_pdf(source: Source):
+    """Extract lines from a PDF transcript (see PDF_MODE)."""
+    if PDF_MODE == "text":
+        pages = _pdf_text_layer(source)
+    else:
+        pages = _pdf_layout_pages(source)
+    for text in pages:
+        for line in text.splitlines():
+            if line.strip():
+                yield line.strip()
 
 
-def _iter_pdf(filepath: str):
-    """Extract lines from a PDF transcript using pdfplumber."""
+def _pdf_layout_pages(source: Source, page_numbers: list[int] | None = None) -> list[str]:
+    """Page text via pdfplumber — all pages, or only page_numbers (0-based)."""
     import pdfplumber
-    with pdfplumber.open(filepath) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            for line in text.splitlines():
-                if line.strip():
-                    yield line.strip()
+    with pdfplumber.open(_binary(source)) as pdf:
+        pages = pdf.pages if page_numbers is None else [pdf.pages[i] for i in page_numbers]
+        return [page.extract_text() or "" for page in pages]
+
+
+def _pdf_page_count(source: str | bytes) -> int:
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(source)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _pdf_text_range(args: tuple[str | bytes, int, int]) -> list[str]:
+    """Raw text layer of pages [start, stop). Top-level so it can run in a worker process."""
+    import pypdfium2
+    source, start, stop = args
+    pdf = pypdfium2.PdfDocument(source)
+    try:
+        texts = []
+        for i in range(start, stop):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+
+def _pdf_text_layer(source: Source) -> list[str]:
+    """
+    Text-layer-only page texts, in page order. Large PDFs are split into
+    contiguous page ranges across a process pool — unless we are already
+    inside a stage_00 worker, where nesting pools would oversubscribe.
+    """
+    if not isinstance(source, (str, bytes)):
+        source = _binary(source).read()  # workers need something picklable
+    n_pages = _pdf_page_count(source)
+    workers = min(os.cpu_count() or 1, n_pages // max(PDF_PARALLEL_PAGES // 2, 1))
+    if n_pages >= PDF_PARALLEL_PAGES and workers > 1 and not _IN_PARSE_WORKER:
+        step   = -(-n_pages // workers)
+        ranges = [(source, start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+        with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+            pages = [text for chunk in executor.map(_pdf_text_range, ranges) for text in chunk]
+    else:
+        pages = _pdf_text_range((source, 0, n_pages))
+
+    empty = [i for i, text in enumerate(pages) if not text.strip()]
+    if empty:
+        # Scanned or oddly-encoded pages: let pdfplumber have a go
+        for i, text in zip(empty, _pdf_layout_pages(source, empty)):
+            pages[i] = text
+    return pages
+
+
+_TRANSCRIPT_EXTS = (".docx", ".txt", ".pdf")
+
+
+def _is_transcript(fname: str) -> bool:
+    return not fname.startswith("~$") and os.path.splitext(fname)[1].lower() in _TRANSCRIPT_EXTS
+
+
+def _parse_file(fname: str, source: Source) -> dict[str, list]:
+    """
+    Parse one transcript into column arrays:
+        speaker, timestamp, text (one entry per non-blank line)
+    fname only picks the format. Top-level so it can run in a worker process.
+    """
+    ext = os.path.splitext(fname)[1].lower()
+    if ext == ".docx":
+        lines = _iter_docx(source)
+    elif ext == ".pdf":
+        lines = _iter_pdf(source)
+    else:
+        lines = _iter_txt(source)
+
+    columns: dict[str, list] = {"speaker": [], "timestamp": [], "text": []}
+    for raw in lines:
+        speaker, timestamp, text = _parse_line(raw)
+        columns["speaker"].append(speaker)
+        columns["timestamp"].append(timestamp)
+        columns["text"].append(text)
+    return columns
 
 
-def stage_00_parse_transcripts(input_dir: str) -> pd.DataFrame:
+# Set in stage_00 pool workers by their initializer, so nested work (PDF page
+# ranges) stays serial there. Checked instead of multiprocessing.parent_process(),
+# which is also set in processes that uvicorn --reload/--workers starts.
+_IN_PARSE_WORKER = False
+
+
+def _mark_parse_worker() -> None:
+    global _IN_PARSE_WORKER
+    _IN_PARSE_WORKER = True
+
+
+def _parse_pool(workers: int) -> ProcessPoolExecutor:
+    """A stage_00 process pool whose workers know they are one."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_mark_parse_worker)
+
+
+def _parse_columns(fnames: list[str], sources: list[Source], workers: int | None) -> list[dict[str, list]]:
+    """
+    _parse_file for every (fname, source), in fnames order. With workers > 1
+    (0 = one per CPU core) files are parsed in a process pool; the result is
+    identical to a serial run.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+    if workers > 1:
+        # Open file objects can't be sent to a worker process; their bytes can.
+        sources = [s if isinstance(s, (str, bytes)) else _binary(s).read() for s in sources]
+        with _parse_pool(workers) as executor:
+            return list(executor.map(_parse_file, fnames, sources))
+    return list(map(_parse_file, fnames, sources))
+
+
+def _parse_all(fnames: list[str], sources: list[Source], workers: int | None) -> pd.DataFrame:
+    """Parse every (fname, source) and concatenate the column arrays in fnames order."""
+    return _combine_parsed(fnames, _parse_columns(fnames, sources, workers))
+
+
+def _combine_parsed(fnames: list[str], parsed, quiet: bool = False) -> pd.DataFrame:
+    """Concatenate per-file column arrays (in fnames order) into one DataFrame."""
+    data: dict[str, list] = {
+        "interviewee": [], "line_number": [], "speaker": [], "timestamp": [], "text": [],
+    }
+    for fname, columns in zip(fnames, parsed):
+        n = len(columns["text"])
+        data["interviewee"].extend([os.path.splitext(fname)[0].replace("_", " ")] * n)
+        data["line_number"].extend(range(1, n + 1))
+        data["speaker"].extend(columns["speaker"])
+        data["timestamp"].extend(columns["timestamp"])
+        data["text"].extend(columns["text"])
+        if not quiet:
+            print(f"  Parsed: {fname}")
+    return pd.DataFrame(data)
+
+
+def _unique_names(fnames: list[str]) -> list[str]:
+    """Disambiguate repeated filenames: Jane.txt, Jane.txt → Jane.txt, Jane (2).txt"""
+    seen: dict[str, int] = {}
+    taken = set(fnames)
+    unique = []
+    for fname in fnames:
+        seen[fname] = seen.get(fname, 0) + 1
+        if seen[fname] == 1:
+            unique.append(fname)
+            continue
+        base, ext = os.path.splitext(fname)
+        n = seen[fname]
+        while f"{base} ({n}){ext}" in taken:
+            n += 1
+        seen[fname] = n
+        unique.append(f"{base} ({n}){ext}")
+        taken.add(unique[-1])
+    return unique
+
+
+def stage_00_parse_transcripts(input_dir: str, workers: int | None = None) -> pd.DataFrame:
     """
-    Read all .docx/.txt files from input_dir.
+    Read all .docx/.txt/.pdf files from input_dir, in filename order.
     Returns a DataFrame with columns:
         interviewee, line_number, speaker, timestamp, text
+
+    With workers > 1 (or 0 = one per CPU core) files are parsed in a process
+    pool — python-docx and pdfplumber are CPU-bound — and their column arrays
+    are concatenated in filename order, so the result is identical to a
+    serial run. Defaults to PARSE_WORKERS.
     """
-    all_rows = []
-    for fname in os.listdir(input_dir):
-        if fname.startswith("~$"):
-            continue
-        ext = os.path.splitext(fname)[1].lower()
-        if ext not in (".docx", ".txt", ".pdf"):
-            continue
-        filepath    = os.path.join(input_dir, fname)
-        base        = os.path.splitext(fname)[0]
-        interviewee = base.replace("_", " ")
-        if ext == ".docx":
-            lines = _iter_docx(filepath)
-        elif ext == ".pdf":
-            lines = _iter_pdf(filepath)
-        else:
-            lines = _iter_txt(filepath)
-        for i, raw in enumerate(lines, start=1):
-            speaker, timestamp, text = _parse_line(raw)
-            all_rows.append({
-                "interviewee": interviewee,
-                "line_number":  i,
-                "speaker":      speaker,
-                "timestamp":    timestamp,
-                "text":         text,
-            })
-        print(f"  Parsed: {fname}")
-    if not all_rows:
+    fnames = sorted(fname for fname in os.listdir(input_dir) if _is_transcript(fname))
+    combined = _parse_all(fnames, [os.path.join(input_dir, fname) for fname in fnames], workers)
+    if combined.empty:
         raise RuntimeError(f"No .docx/.txt files found in {input_dir!r}")
-    return pd.DataFrame(all_rows)
+    return combined
 
 
 # ===========================================================================
@@ -270,27 +557,33 @@ def stage_01_tag_roles(df: pd.DataFrame) -> pd.DataFrame:
     df["speaker"]     = df["speaker"].fillna("").astype(str).str.strip()
     df["interviewee"] = df["interviewee"].astype(str).str.strip()
     df["text"]        = df["text"].astype(str)
-    df["role"]        = "unknown"
-
-    for interviewee_name, file_df in df.groupby("interviewee"):
-        labeled = file_df[file_df["speaker"].ne("")]
-
-        if labeled.empty:
-            # No speaker labels at all — leave everyone as "unknown"
-            continue
-
-        # Strategy 1: exact filename match
-        exact = labeled[labeled["speaker"].eq(interviewee_name)]
-        if not exact.empty:
-            top_speaker = interviewee_name
-        else:
-            # Strategy 2: speaker with the most labeled lines
-            top_speaker = labeled["speaker"].value_counts().idxmax()
-
-        is_top = file_df["speaker"].eq(top_speaker)
-        df.loc[file_df[is_top].index, "role"] = "interviewee"
-        df.loc[file_df[~is_top & file_df["speaker"].ne("")].index, "role"] = "interviewer"
 
+    # One pass over all files at once: per-file speaker line counts, then
+    # the exact-name match or the most-lines speaker for each file.
+    labeled = df["speaker"].ne("")
+    counts = (
+        df.loc[labeled, ["interviewee", "speaker"]]
+        .groupby(["interviewee", "speaker"], sort=False)
+        .size()
+        .reset_index(name="lines")
+    )
+    is_max = counts["lines"].eq(counts.groupby("interviewee", sort=False)["lines"].transform("max"))
+    top_speaker = dict(zip(counts.loc[is_max, "interviewee"], counts.loc[is_max, "speaker"]))
+
+    # Files where several speakers tie for most lines: value_counts breaks
+    # ties by hash-table order, so defer to it there to pick the same winner.
+    tied = counts.loc[is_max, "interviewee"]
+    tied = tied[tied.duplicated()].unique()
+    if len(tied):
+        tied_lines = df.loc[labeled & df["interviewee"].isin(tied), ["interviewee", "speaker"]]
+        for name, speakers in tied_lines.groupby("interviewee", sort=False)["speaker"]:
+            top_speaker[name] = speakers.value_counts().idxmax()
+
+    exact_names = counts.loc[counts["speaker"].eq(counts["interviewee"]), "interviewee"]
+    top_speaker.update(zip(exact_names, exact_names))
+
+    is_top = df["speaker"].to_numpy() == df["interviewee"].map(top_speaker).to_numpy()
+    df["role"] = np.where(is_top, "interviewee", np.where(labeled, "interviewer", "unknown"))
     return df
 
 
@@ -302,35 +595,63 @@ def stage_02_sentence_level(df: pd.DataFrame) -> pd.DataFrame:
     """
     Explode each transcript line into individual sentences.
     Returns a DataFrame with columns:
-        interviewee, role, speaker, line_number, sentence
+        interviewee, role, speaker  category (a handful of distinct values
+                                    repeated over every sentence; these were
+                                    object before the column-wise rewrite)
+        line_number                 int, as in df
+        sentence                    object (str)
+
+    Column-wise: each distinct line is split once with the cached Punkt
+    tokenizer, the sentence lists are exploded, and the per-line columns
+    are gathered by position. Convert a categorical column with
+    .astype(str) before writing new values into it.
+    """
+    texts = df["text"] if "text" in df.columns else pd.Series("", index=df.index)
+    return _sentence_frame(df, *_split_sentences(texts))
+
+
+def _split_sentences(texts: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (pos, sentences): every non-blank sentence of every text, in order, and
+    the position of the text it came from. Each distinct text is split once.
     """
     _nltk_setup()
-    rows = []
-    for _, row in df.iterrows():
-        for sent in sent_tokenize(str(row.get("text", ""))):
-            sent = sent.strip()
-            if not sent:
-                continue
-            rows.append({
-                "interviewee": row.get("interviewee", ""),
-                "role":        row.get("role", ""),
-                "speaker":     row.get("speaker", ""),
-                "line_number": row.get("line_number"),
-                "sentence":    sent,
-            })
-    return pd.DataFrame(rows)
+    tokenize = _sentence_tokenizer().tokenize
+
+    texts = [str(t) for t in texts]
+    split = {t: tokenize(t) for t in dict.fromkeys(texts)}
+    sentences = pd.Series([split[t] for t in texts], dtype=object).explode().dropna().astype(str).str.strip()
+    sentences = sentences[sentences.ne("")]
+    return sentences.index.to_numpy(dtype=np.int64), sentences.to_numpy()
+
+
+def _sentence_frame(df: pd.DataFrame, pos: np.ndarray, sentences: np.ndarray) -> pd.DataFrame:
+    """stage_02's output: per-line columns of df gathered by line position pos."""
+    def column(name: str, default) -> np.ndarray:
+        return df[name].to_numpy() if name in df.columns else np.full(len(df), default, dtype=object)
+
+    return pd.DataFrame({
+        "interviewee": pd.Categorical(column("interviewee", "")[pos]),
+        "role":        pd.Categorical(column("role", "")[pos]),
+        "speaker":     pd.Categorical(column("speaker", "")[pos]),
+        "line_number": column("line_number", None)[pos],
+        "sentence":    sentences,
+    })
 
 
 # ===========================================================================
 # STAGE 03 — Sentiment analysis
 # ===========================================================================
 
-def stage_03_hf_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+def stage_03_hf_sentiment(df: pd.DataFrame, stats: dict | None = None) -> pd.DataFrame:
     """
     Add sentiment columns to each sentence row.
 
-    Calls classify() from sentiment_model, which routes to whichever
+    Calls classify_batch() from sentiment_model, which routes to whichever
     backend is active (OpenAI or Railway) depending on SENTIMENT_BACKEND.
+    Batch sizing and parallelism follow sentiment_model's token-budget
+    packing policy, so no pre-chunking is done here. Pass a dict as stats to
+    collect classification counts (cached / local / escalated).
 
     Columns added:
         hf_label    — "positive" | "negative" | "neutral"
@@ -338,20 +659,24 @@ def stage_03_hf_sentiment(df: pd.DataFrame) -> pd.DataFrame:
         hf_compound — overall intensity: positive → +score,
                       negative → -score, neutral → 0
     """
-    sentences = df["sentence"].astype(str).tolist()
+    flat = classify_batch(df["sentence"].astype(str).tolist(), stats)
+    return _attach_sentiment(df, flat)
 
-    # Split into batches, then run batches in parallel
-    batches = [sentences[i:i + _BATCH_SIZE] for i in range(0, len(sentences), _BATCH_SIZE)]
-    results: list[dict] = [None] * len(batches)
 
-    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
-        futures = {executor.submit(classify_batch, batch): idx for idx, batch in enumerate(batches)}
-        for future, idx in futures.items():
-            results[idx] = future.result()
+async def stage_03_hf_sentiment_async(df: pd.DataFrame, stats: dict | None = None) -> pd.DataFrame:
+    """
+    Async variant of stage_03_hf_sentiment for the FastAPI handlers.
 
-    # Flatten results back into per-sentence lists
-    flat = [item for batch_result in results for item in batch_result]
+    Hands every sentence to classify_batch_async in one call — chunking and
+    concurrency are bounded by sentiment_model's process-wide semaphore, so
+    no per-request thread pool is needed. Adds the same columns.
+    """
+    flat = await classify_batch_async(df["sentence"].astype(str).tolist(), stats)
+    return _attach_sentiment(df, flat)
 
+
+def _attach_sentiment(df: pd.DataFrame, flat: list[dict]) -> pd.DataFrame:
+    """Copy df and add hf_label / hf_score / hf_compound from per-sentence results."""
     df = df.copy()
     df["hf_label"]    = [r["label"]    for r in flat]
     df["hf_score"]    = [r["score"]    for r in flat]
@@ -359,14 +684,452 @@ def stage_03_hf_sentiment(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# ===========================================================================
+# STAGES 00–03 — Incremental runs with per-file reuse
+# ===========================================================================
+
+_STREAM_DONE = object()  # end-of-stream marker between IncrementalRun.stream stages
+
+
+def _read_bytes(source: Source) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return _binary(source).read()
+
+
+def _file_namespace(fname: str) -> str:
+    """What a file's cached results depend on besides its bytes."""
+    ext = os.path.splitext(fname)[1].lower()
+    namespace = f"transcripts:{PIPELINE_VERSION}:{ext}"
+    return f"{namespace}:{PDF_MODE}" if ext == ".pdf" else namespace
+
+
+class IncrementalRun:
+    """
+    Stages 00–03 over one set of transcripts, reusing per-file results from
+    transcript_cache. Files are keyed by a hash of their bytes, so re-running
+    a set with one new interview only parses, splits and classifies that
+    file; the rest come from the cache. The steps mirror the staged calls
+    and return the same DataFrames:
+
+        run          = IncrementalRun.from_dir(input_dir)
+        combined_df  = run.parse(workers)                 # stage_00
+        combined_df  = stage_01_tag_roles(combined_df)    # always re-run
+        sentences_df = run.split(combined_df)             # stage_02
+        sentiment_df = run.classify(sentences_df, stats)  # stage_03 (or classify_async)
+
+    Roles are not cached: stage_01 is cheap and looks at every file of an
+    interviewee together.
+    """
+
+    def __init__(self, fnames: list[str], sources: list[Source], origin: str = "the given files"):
+        self.fnames   = fnames
+        self.sources  = sources
+        self.origin   = origin
+        self.reused   = 0  # files served from the cache by parse()
+        self._keys:    list[str]  = []
+        self._entries: list[dict] = []
+        self._dirty:   set[int]   = set()
+        # Filled by stream(): per-file role-tagged rows and fresh sentiment
+        self._tagged:         dict[int, pd.DataFrame] = {}
+        self._stream_results: dict[int, list[dict]]   = {}
+
+    @classmethod
+    def from_dir(cls, input_dir: str) -> "IncrementalRun":
+        """Every transcript in input_dir, in filename order (as stage_00_parse_transcripts)."""
+        fnames = sorted(fname for fname in os.listdir(input_dir) if _is_transcript(fname))
+        return cls(fnames, [os.path.join(input_dir, fname) for fname in fnames], repr(input_dir))
+
+    @classmethod
+    def from_uploads(cls, uploads: list[tuple[str, bytes | BinaryIO]]) -> "IncrementalRun":
+        """
+        (filename, bytes or binary file-like) API uploads, in upload order, read
+        straight from memory. Repeated filenames are kept apart as "Jane (2)",
+        "Jane (3)", ... instead of one upload silently replacing another.
+        """
+        uploads = [(fname, source) for fname, source in uploads if _is_transcript(fname)]
+        return cls(_unique_names([fname for fname, _ in uploads]), [source for _, source in uploads],
+                   "the uploaded files")
+
+    def _save(self) -> None:
+        transcript_cache.put_many({self._keys[i]: self._entries[i] for i in self._dirty})
+        self._dirty.clear()
+
+    def _lookup(self) -> tuple[list[bytes], list[int]]:
+        """Hash every file and load cache hits. Returns (file bytes, indices still to parse)."""
+        blobs = [_read_bytes(source) for source in self.sources]
+        self._keys = [transcript_cache.make_key(b, _file_namespace(f)) for f, b in zip(self.fnames, blobs)]
+        cached = transcript_cache.get_many(self._keys)
+        self._entries = [cached.get(key) for key in self._keys]
+        missing = [i for i, entry in enumerate(self._entries) if entry is None]
+        self.reused = len(self.fnames) - len(missing)
+        return blobs, missing
+
+    def _parsed(self, i: int, columns: dict[str, list]) -> None:
+        self._entries[i] = {"columns": columns, "sentiment": {}}
+        self._dirty.add(i)
+
+    def _check_content(self, rows: int) -> None:
+        if rows == 0:
+            raise RuntimeError(f"No .docx/.txt/.pdf transcript content in {self.origin}")
+
+    def parse(self, workers: int | None = None) -> pd.DataFrame:
+        """stage_00: parse the files not in the cache, combine with the cached ones."""
+        blobs, missing = self._lookup()
+        parsed = _parse_columns([self.fnames[i] for i in missing], [blobs[i] for i in missing], workers)
+        for i, columns in zip(missing, parsed):
+            self._parsed(i, columns)
+        self._save()
+
+        combined = _combine_parsed(self.fnames, [entry["columns"] for entry in self._entries])
+        self._check_content(len(combined))
+        return combined
+
+    def split(self, df: pd.DataFrame) -> pd.DataFrame:
+        """stage_02 for df = stage_01_tag_roles(parse()): only new files are sentence-split."""
+        todo = [i for i, entry in enumerate(self._entries) if "sentences" not in entry]
+        if todo:
+            texts = [t for i in todo for t in self._entries[i]["columns"]["text"]]
+            owner = np.repeat(todo, [len(self._entries[i]["columns"]["text"]) for i in todo])
+            start = np.concatenate(([0], np.cumsum([len(self._entries[i]["columns"]["text"]) for i in todo])))
+            pos, sentences = _split_sentences(pd.Series(texts, dtype=object))
+            for n, i in enumerate(todo):
+                mine = owner[pos] == i
+                self._entries[i]["pos"]       = (pos[mine] - start[n]).tolist()
+                self._entries[i]["sentences"] = sentences[mine].tolist()
+                self._dirty.add(i)
+            self._save()
+        return self._sentence_frame(df)
+
+    def _sentence_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """stage_02's frame for df from every file's (pos, sentences)."""
+        offsets = np.cumsum([0] + [len(entry["columns"]["text"]) for entry in self._entries])
+        pos = np.concatenate([
+            np.asarray(entry["pos"], dtype=np.int64) + offsets[i] for i, entry in enumerate(self._entries)
+        ])
+        sentences = np.array([s for entry in self._entries for s in entry["sentences"]], dtype=object)
+        return _sentence_frame(df, pos, sentences)
+
+    def _pending(self) -> tuple[str, list[int], list[str]]:
+        """Files without results from the active sentiment backend, and their sentences."""
+        namespace = cache_namespace()
+        todo  = [i for i, entry in enumerate(self._entries) if namespace not in entry["sentiment"]]
+        texts = [str(s) for i in todo for s in self._entries[i]["sentences"]]
+        return namespace, todo, texts
+
+    def _classified(self, namespace: str, todo: list[int], fresh: list[dict]) -> dict[int, list[dict]]:
+        """Split fresh results (sentences of todo, in order) per file, keeping reusable ones."""
+        per_file: dict[int, list[dict]] = {}
+        at = 0
+        for i in todo:
+            n = len(self._entries[i]["sentences"])
+            per_file[i], at = fresh[at:at + n], at + n
+            # A failed batch's neutral filler must not be reused on later runs
+            if not any(is_placeholder(r) for r in per_file[i]):
+                self._entries[i]["sentiment"][namespace] = per_file[i]
+                self._dirty.add(i)
+        return per_file
+
+    def _attach(self, df: pd.DataFrame, namespace: str, todo: list[int], fresh: list[dict]) -> pd.DataFrame:
+        per_file = self._classified(namespace, todo, fresh)
+        self._save()
+        return self._sentiment_frame(df, namespace, per_file)
+
+    def _sentiment_frame(self, df: pd.DataFrame, namespace: str, per_file: dict[int, list[dict]]) -> pd.DataFrame:
+        flat = [
+            r for i, entry in enumerate(self._entries)
+            for r in per_file.get(i, entry["sentiment"].get(namespace))
+        ]
+        return _attach_sentiment(df, flat)
+
+    def classify(self, df: pd.DataFrame, stats: dict | None = None) -> pd.DataFrame:
+        """stage_03 for df = split(...): only sentences of files not classified before are sent."""
+        namespace, todo, texts = self._pending()
+        return self._attach(df, namespace, todo, classify_batch(texts, stats) if texts else [])
+
+    async def classify_async(self, df: pd.DataFrame, stats: dict | None = None) -> pd.DataFrame:
+        """Async variant of classify for the FastAPI handlers."""
+        namespace, todo, texts = self._pending()
+        return self._attach(df, namespace, todo, await classify_batch_async(texts, stats) if texts else [])
+
+    # ── Streaming mode ──────────────────────────────────────────────────────
+    # Each stage is a generator over file indices running in its own thread,
+    # connected by bounded queues, so the first files are being classified
+    # while later ones are still parsing. Stages fill self._entries[i] in
+    # place; the final frames are assembled in file order afterwards.
+
+    def _stream_parse(self, blobs: list[bytes], missing: list[int], workers: int | None):
+        """stage_00: yields file indices in order as each is parsed (or found in the cache)."""
+        workers = PARSE_WORKERS if workers is None else workers
+        workers = min(workers or os.cpu_count() or 1, len(missing))
+        fnames  = [self.fnames[i] for i in missing]
+        sources = [blobs[i] for i in missing]
+        executor = _parse_pool(workers) if workers > 1 else None
+        try:
+            parsed = executor.map(_parse_file, fnames, sources) if executor else map(_parse_file, fnames, sources)
+            todo = set(missing)
+            for i in range(len(self.fnames)):
+                if i in todo:
+                    self._parsed(i, next(parsed))
+                print(f"  Parsed: {self.fnames[i]}")
+                yield i
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+    def _stream_tag(self, files):
+        """
+        stage_01: tags each interviewee's files together once they have all
+        been parsed (usually one file each), storing per-file role frames.
+        """
+        names = [os.path.splitext(f)[0].replace("_", " ").strip() for f in self.fnames]
+        waiting = {name: names.count(name) for name in names}
+        ready: dict[str, list[int]] = defaultdict(list)
+        for i in files:
+            ready[names[i]].append(i)
+            if len(ready[names[i]]) < waiting[names[i]]:
+                continue
+            group = sorted(ready.pop(names[i]))
+            tagged = stage_01_tag_roles(_combine_parsed(
+                [self.fnames[j] for j in group], [self._entries[j]["columns"] for j in group], quiet=True,
+            ))
+            bounds = np.cumsum([0] + [len(self._entries[j]["columns"]["text"]) for j in group])
+            for n, j in enumerate(group):
+                self._tagged[j] = tagged.iloc[bounds[n]:bounds[n + 1]]
+                yield j
+
+    def _stream_split(self, files):
+        """stage_02: sentence-splits each new file."""
+        for i in files:
+            entry = self._entries[i]
+            if "sentences" not in entry:
+                pos, sentences = _split_sentences(pd.Series(entry["columns"]["text"], dtype=object))
+                entry["pos"], entry["sentences"] = pos.tolist(), sentences.tolist()
+                self._dirty.add(i)
+            yield i
+
+    def _stream_classify(self, files, namespace: str, stats: dict | None, batch_size: int, in_flight: int):
+        """
+        stage_03: classifies new files' sentences in batches of about
+        batch_size, with up to in_flight batches running at once while the
+        next one is being filled. Batches finish in the order they were sent.
+        """
+        running: deque[tuple[list[int], Future, dict]] = deque()
+        todo: list[int] = []
+        texts: list[str] = []
+
+        def send():
+            batch_stats: dict = {}  # per batch: concurrent calls must not share a dict
+            running.append((list(todo), executor.submit(classify_batch, list(texts), batch_stats), batch_stats))
+            todo.clear()
+            texts.clear()
+
+        def collect(limit: int):
+            """Finish batches until at most limit are running, plus any already done."""
+            while running and (len(running) > limit or running[0][1].done()):
+                done, future, batch_stats = running.popleft()
+                self._stream_results.update(self._classified(namespace, done, future.result()))
+                if stats is not None:
+                    for name, value in batch_stats.items():
+                        stats[name] = stats.get(name, 0) + value
+                yield from done
+
+        executor = ThreadPoolExecutor(max_workers=max(in_flight, 1), thread_name_prefix="stream-classify")
+        try:
+            for i in files:
+                if namespace in self._entries[i]["sentiment"]:
+                    yield i
+                    continue
+                todo.append(i)
+                texts.extend(str(t) for t in self._entries[i]["sentences"])
+                if len(texts) >= batch_size:
+                    send()
+                yield from collect(max(in_flight, 1))
+            if todo:
+                send()
+            yield from collect(0)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def stream(
+        self,
+        workers:    int | None  = None,
+        stats:      dict | None = None,
+        queue_size: int | None  = None,
+        batch_size: int | None  = None,
+        in_flight:  int | None  = None,
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Stages 00–03 overlapped: parse → tag roles → split sentences →
+        classify in batches, one thread per stage over bounded queues
+        (queue_size files, default STREAM_QUEUE_SIZE; batches of about
+        batch_size sentences, default STREAM_BATCH_SIZE, up to in_flight of
+        them at once, default STREAM_IN_FLIGHT). Returns
+        (combined_df, sentences_df, sentiment_df), identical to
+        stage_01_tag_roles(parse()), split() and classify().
+        """
+        queue_size = STREAM_QUEUE_SIZE if queue_size is None else queue_size
+        batch_size = STREAM_BATCH_SIZE if batch_size is None else batch_size
+        in_flight  = STREAM_IN_FLIGHT if in_flight is None else in_flight
+        namespace  = cache_namespace()
+        blobs, missing = self._lookup()
+        self._tagged.clear()
+        self._stream_results.clear()
+
+        stages = [
+            lambda _: self._stream_parse(blobs, missing, workers),
+            self._stream_tag,
+            self._stream_split,
+            lambda files: self._stream_classify(files, namespace, stats, batch_size, in_flight),
+        ]
+        queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        errors: list[BaseException] = []
+
+        def run(stage, inbox, outbox):
+            drained = inbox is None
+
+            def incoming():
+                nonlocal drained
+                yield from iter(inbox.get, _STREAM_DONE)
+                drained = True
+
+            try:
+                for i in stage(incoming() if inbox else None):
+                    if errors:
+                        break
+                    outbox.put(i)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                if not drained:  # after a failure, keep the upstream stage from blocking
+                    for _ in iter(inbox.get, _STREAM_DONE):
+                        pass
+                outbox.put(_STREAM_DONE)
+
+        threads = [
+            threading.Thread(target=run, args=(stage, queues[n - 1] if n else None, queues[n]), daemon=True)
+            for n, stage in enumerate(stages)
+        ]
+        for t in threads:
+            t.start()
+        for _ in iter(queues[-1].get, _STREAM_DONE):
+            pass
+        for t in threads:
+            t.join()
+        self._save()
+        if errors:
+            raise errors[0]
+
+        # Empty files add no rows (and would upset column dtypes in concat)
+        frames = [self._tagged[i] for i in range(len(self.fnames)) if len(self._tagged[i])]
+        self._check_content(len(frames))
+        combined = pd.concat(frames, ignore_index=True)
+        sentences = self._sentence_frame(combined)
+        return combined, sentences, self._sentiment_frame(sentences, namespace, self._stream_results)
+
+
 # ===========================================================================
 # STAGE 04 — Separate target-company sentences vs. competitor sentences
 # ===========================================================================
 
+# Entity names and sentences are matched case-insensitively as sequences of
+# these tokens: runs of word characters and single punctuation marks. For names
+# that start and end with a word character (Canva, Monday.com, AT&T) that is
+# the same match as r"\bname\b". Two differences, both deliberate:
+#   - names with a punctuation edge (C++, C#, .NET) match as standalone words;
+#     r"\bC\+\+\b" needs a word character after the "+", so it only ever
+#     matched the likes of "C++17", never "C++ is great"
+#   - whitespace between tokens is ignored: "Final  Cut Pro" (two spaces),
+#     "AT & T" and "Monday . com" all match.
+_MENTION_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _mention_tokens(text: str) -> list[str]:
+    return _MENTION_TOKEN_RE.findall(text.lower())
+
+
+class MentionIndex:
+    """
+    Aho-Corasick automaton over word tokens for a set of entity names (the
+    target company plus competitor services), built once. scan() makes a
+    single pass over the sentences and returns one boolean column per entity,
+    so stage_04, stage_05 and the API share one match instead of re-running
+    a regex alternation per call. Cost per sentence is independent of how
+    many names are indexed.
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+        self._goto: list[dict[str, int]] = [{}]
+        self._out:  list[tuple[int, ...]] = [()]
+
+        # Trie of token sequences
+        for entity, name in enumerate(self.names):
+            state = 0
+            for tok in _mention_tokens(name):
+                nxt = self._goto[state].get(tok)
+                if nxt is None:
+                    nxt = self._goto[state][tok] = len(self._goto)
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            if state:
+                self._out[state] += (entity,)
+
+        # Failure links, breadth-first (depth-1 states fail to the root);
+        # each state also reports the names ending at its failure state
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for tok, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and tok not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(tok, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def _match(self, text: str) -> set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        tokens = _mention_tokens(text)
+        if goto[0].keys().isdisjoint(tokens):
+            return found  # no name starts anywhere in this sentence
+        state = 0
+        for tok in tokens:
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def scan(self, sentences: pd.Series) -> pd.DataFrame:
+        """Boolean DataFrame (index of sentences, one column per name): does the sentence mention it?"""
+        # Each distinct sentence is matched once, then broadcast to its rows
+        codes, uniques = pd.factorize(sentences.fillna("").astype(str))
+        hits = np.zeros((len(uniques), len(self.names)), dtype=bool)
+        for i, text in enumerate(uniques):
+            entities = self._match(text)
+            if entities:
+                hits[i, list(entities)] = True
+        return pd.DataFrame(hits[codes], index=sentences.index, columns=self.names)
+
+    @staticmethod
+    def any_of(mentions: pd.DataFrame, names: list[str]) -> pd.Series:
+        """Rows mentioning at least one of names (names not indexed count as no match)."""
+        columns = [n for n in dict.fromkeys(n.strip() for n in names) if n in mentions.columns]
+        return mentions[columns].any(axis=1) if columns else pd.Series(False, index=mentions.index)
+
+
 def stage_04_separate_services(
     df: pd.DataFrame,
     target_company: str            = TARGET_COMPANY,
     other_services: list[str] | None = None,
+    mentions:       pd.DataFrame | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Splits the sentence DataFrame into two groups:
@@ -389,6 +1152,9 @@ def stage_04_separate_services(
                         user via the frontend Competitor Services input field.
                         Falls back to DEFAULT_OTHER_SERVICES when running from
                         the CLI without --other-services.
+        mentions:       Optional MentionIndex.scan() result for df's sentences
+                        covering the target and services. Built here if omitted;
+                        pass it in to share one scan with stage_05 and the API.
 
     Returns:
         (df_target, df_other)
@@ -396,22 +1162,13 @@ def stage_04_separate_services(
     # Use provided list or fall back to the module-level CLI default
     services = other_services if other_services else DEFAULT_OTHER_SERVICES
 
-    # Build regex pattern for the target company
-    target_pattern  = r"\b" + re.escape(target_company) + r"\b"
-    mentions_target = df["sentence"].astype(str).str.contains(
-        target_pattern, flags=re.IGNORECASE, na=False
-    )
+    if mentions is None:
+        mentions = MentionIndex([target_company, *services]).scan(df["sentence"])
 
-    if services:
-        # Build regex pattern for all competitor services
-        other_pattern  = r"\b(" + "|".join(re.escape(w) for w in services) + r")\b"
-        mentions_other = df["sentence"].astype(str).str.contains(
-            other_pattern, flags=re.IGNORECASE, na=False
-        )
-    else:
-        # No competitors specified — all target mentions are treated as pure,
-        # df_other will be empty and stage_07 will skip the comparison chart
-        mentions_other = pd.Series(False, index=df.index)
+    mentions_target = MentionIndex.any_of(mentions, [target_company])
+    # With no competitors specified, all target mentions are treated as pure,
+    # df_other is empty and stage_07 skips the comparison chart
+    mentions_other  = MentionIndex.any_of(mentions, services)
 
     df_target = df[mentions_target & ~mentions_other].copy()
     df_other  = df[mentions_other].copy()
@@ -432,9 +1189,133 @@ def _tokenize_clean(text: str, stopwords_all: set) -> set:
     }
 
 
+_WORD_STATS_COLUMNS = ["word", "count", "avg_hf_compound"]
+
+
+class WordIndex:
+    """
+    Sentence × vocabulary incidence matrix for one target company, built with
+    a single tokenization pass over the sentences.
+
+    Stored sparsely as coordinate arrays (sentence row, word id) — one entry
+    per distinct cleaned word per sentence, in sentence order. Word counts and
+    compound sums for any grouping of the sentences (overall, per interviewee,
+    per role) are then indexed reductions over those arrays (np.bincount on
+    group × vocab cells) instead of re-tokenizing per group.
+
+    word_stats() / word_stats_by() apply stage_05's row selection: interviewee
+    sentences mentioning the target company, falling back to every speaker's
+    target sentences when a group has none. Pass `mentions` (a MentionIndex
+    scan covering df's rows, e.g. the one stage_04 used) to skip re-matching
+    the company name.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        target_company: str = TARGET_COMPANY,
+        mentions: pd.DataFrame | None = None,
+    ):
+        _nltk_setup()
+        stopwords_all = (
+            set(stopwords.words("english"))
+            | CUSTOM_STOPWORDS
+            | {target_company.lower()}
+        )
+
+        self.df = df
+        self.target_company = target_company
+        sentences = df["sentence"].astype(str).tolist()
+        if mentions is None:
+            mentions = MentionIndex([target_company]).scan(df["sentence"])
+        self.mentions_target = (
+            MentionIndex.any_of(mentions, [target_company]).reindex(df.index, fill_value=False).to_numpy(dtype=bool)
+        )
+        self.is_interviewee = df["role"].astype(str).str.lower().eq("interviewee").to_numpy()
+        self.compound = df["hf_compound"].to_numpy(dtype=float)
+
+        vocab: dict[str, int] = {}
+        tokens: dict[str, list[int]] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        for i, (sentence, wanted) in enumerate(zip(sentences, self.mentions_target)):
+            if not wanted:
+                continue  # only target sentences are ever counted
+            ids = tokens.get(sentence)
+            if ids is None:
+                words = sorted(_tokenize_clean(sentence, stopwords_all))
+                ids = tokens[sentence] = [vocab.setdefault(w, len(vocab)) for w in words]
+            rows.extend([i] * len(ids))
+            cols.extend(ids)
+
+        self.words = np.array(list(vocab), dtype=object)
+        self.rows = np.array(rows, dtype=np.int64)
+        self.cols = np.array(cols, dtype=np.int64)
+
+    def _selected(self, group_codes: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rows stage_05 would use, deciding the interviewee-only fallback per
+        group. Also returns which groups had interviewee target sentences.
+        """
+        in_group  = group_codes >= 0
+        preferred = self.mentions_target & self.is_interviewee & in_group
+        has_preferred = np.bincount(group_codes[preferred], minlength=n_groups) > 0
+        use_all = np.zeros(len(group_codes), dtype=bool)
+        use_all[in_group] = ~has_preferred[group_codes[in_group]]
+        return in_group & self.mentions_target & (self.is_interviewee | use_all), has_preferred
+
+    def _stats(self, group_codes: np.ndarray, n_groups: int) -> list[pd.DataFrame]:
+        selected, has_preferred = self._selected(group_codes, n_groups)
+        has_target = np.bincount(group_codes[selected], minlength=n_groups) > 0
+        for g in range(n_groups):
+            if not has_preferred[g]:
+                print(f"  Warning: no interviewee sentences mentioning '{self.target_company}' found. Falling back to all speakers.")
+            if not has_target[g]:
+                print(f"  Warning: no sentences mentioning '{self.target_company}' found at all.")
+
+        # Sparse reduction: only (group, word) cells that occur are materialized.
+        keep = selected[self.rows]
+        rows, cols = self.rows[keep], self.cols[keep]
+        cells, cell_of = np.unique(group_codes[rows] * len(self.words) + cols, return_inverse=True)
+        counts = np.bincount(cell_of, minlength=len(cells))
+        sums   = np.bincount(cell_of, weights=self.compound[rows], minlength=len(cells))
+
+        frequent = counts >= MIN_WORD_COUNT
+        cells, counts, sums = cells[frequent], counts[frequent], sums[frequent]
+        groups = cells // max(len(self.words), 1)
+        all_stats = pd.DataFrame({
+            "group":           groups,
+            "word":            self.words[cells % max(len(self.words), 1)],
+            "count":           counts,
+            "avg_hf_compound": sums / np.maximum(counts, 1),
+        }).sort_values(
+            ["group", "count", "avg_hf_compound", "word"], ascending=[True, False, False, True]
+        )
+
+        bounds = np.searchsorted(all_stats["group"].to_numpy(), np.arange(n_groups + 1))
+        return [
+            all_stats.iloc[bounds[g]:bounds[g + 1]][_WORD_STATS_COLUMNS].reset_index(drop=True)
+            for g in range(n_groups)
+        ]
+
+    def word_stats(self) -> pd.DataFrame:
+        """Word stats over all sentences — same result as stage_05_word_stats(df)."""
+        return self._stats(np.zeros(len(self.df), dtype=np.int64), 1)[0]
+
+    def word_stats_by(self, column: str) -> dict:
+        """
+        {value: word stats} for each distinct value of df[column] (e.g.
+        "interviewee" or "role") — same result as stage_05_word_stats on
+        each group's rows, from the one shared tokenization pass.
+        """
+        codes, keys = pd.factorize(self.df[column])
+        return dict(zip(keys, self._stats(np.asarray(codes, dtype=np.int64), len(keys))))
+
+
 def stage_05_word_stats(
     df: pd.DataFrame,
     target_company: str = TARGET_COMPANY,
+    mentions: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
     """
     Build word-level sentiment stats from interviewee sentences that
@@ -445,60 +1326,23 @@ def stage_05_word_stats(
     understand which other words co-occur with the company and how they
     correlate with sentiment.
 
+    If no interviewee-tagged sentence mentions the company (role tagging
+    found no speaker labels, or the name filter found nothing), falls back
+    to ALL sentences mentioning it. To compute stats for several groupings
+    of the same sentences, build one WordIndex and call word_stats_by().
+
     Args:
         df:             Sentence-level DataFrame. Pass df_target from
                         stage_04 so only pure target-company sentences
                         are analyzed.
         target_company: Company name — added to stopwords automatically.
+        mentions:       Optional MentionIndex.scan() result covering df's rows.
 
     Returns:
         DataFrame with columns: word, count, avg_hf_compound
+        (ties in count and sentiment ordered alphabetically)
     """
-    _nltk_setup()
-
-    stopwords_all = (
-        set(stopwords.words("english"))
-        | CUSTOM_STOPWORDS
-        | {target_company.lower()}
-    )
-
-    mask_role   = df["role"].astype(str).str.lower().eq("interviewee")
-    target_pat  = r"\b" + re.escape(target_company) + r"\b"
-    mask_target = df["sentence"].str.contains(
-        target_pat, flags=re.IGNORECASE, na=False
-    )
-    target_df = df[mask_role & mask_target]
-
-    if target_df.empty:
-        # No interviewee-tagged sentences — either role tagging couldn't identify
-        # the interviewee (no speaker labels) or the name filter found nothing.
-        # Fall back to ALL sentences mentioning the target company.
-        print(f"  Warning: no interviewee sentences mentioning '{target_company}' found. Falling back to all speakers.")
-        target_df = df[mask_target]
-
-    if target_df.empty:
-        print(f"  Warning: no sentences mentioning '{target_company}' found at all.")
-        return pd.DataFrame(columns=["word", "count", "avg_hf_compound"])
-
-    count: dict[str, int]   = defaultdict(int)
-    sum_s: dict[str, float] = defaultdict(float)
-
-    for _, row in target_df.iterrows():
-        words = _tokenize_clean(str(row["sentence"]), stopwords_all)
-        score = float(row["hf_compound"])
-        for w in words:
-            count[w] += 1
-            sum_s[w] += score
-
-    rows = [
-        {"word": w, "count": c, "avg_hf_compound": sum_s[w] / c}
-        for w, c in count.items()
-        if c >= MIN_WORD_COUNT
-    ]
-    word_df = pd.DataFrame(rows).sort_values(
-        ["count", "avg_hf_compound"], ascending=[False, False]
-    )
-    return word_df
+    return WordIndex(df, target_company, mentions).word_stats()
 
 
 # Alias so existing callers in main.py continue to work without changes
@@ -731,6 +1575,8 @@ def run_pipeline(
     target_company:    str              = TARGET_COMPANY,
     other_services:    list[str] | None = None,
     save_intermediate: bool             = False,
+    parse_workers:     int | None       = None,
+    stream:            bool | None      = None,
 ) -> dict:
     """
     Run the full pipeline end-to-end.
@@ -748,6 +1594,12 @@ def run_pipeline(
                           --other-services. Pass an empty list [] to skip
                           competitor separation entirely.
         save_intermediate: If True, write each stage's DataFrame to CSV.
+        parse_workers:    Processes used to parse transcripts in stage_00
+                          (1 = serial, 0 = one per CPU core). Defaults to
+                          PARSE_WORKERS (env TRANSCRIPT_PARSE_WORKERS).
+        stream:           Run stages 00–03 overlapped (IncrementalRun.stream)
+                          instead of one after another. Same DataFrames.
+                          Defaults to STREAM (env TRANSCRIPT_STREAM).
 
     Returns:
         dict with keys:
@@ -765,34 +1617,51 @@ def run_pipeline(
             df.to_csv(path, index=False, encoding="utf-8")
             print(f"  Saved intermediate: {path}")
 
-    print("\n[Stage 00] Parsing transcripts...")
-    combined_df = stage_00_parse_transcripts(input_dir)
-    print(f"  Rows parsed: {len(combined_df)}")
-    _maybe_save(combined_df, "00_combined.csv")
+    # Files whose bytes were seen before reuse their cached stage 00–03 results
+    run = IncrementalRun.from_dir(input_dir)
+
+    stream = STREAM if stream is None else stream
+    if stream:
+        print("\n[Stages 00–03] Parsing, tagging, splitting and classifying (streamed)...")
+        combined_df, sentences_df, sentiment_df = run.stream(parse_workers)
+        print(f"  Rows parsed: {len(combined_df)} ({run.reused} of {len(run.fnames)} files reused from cache)")
+        print(f"  Sentences: {len(sentences_df)}")
+        _maybe_save(combined_df.drop(columns="role"), "00_combined.csv")
+        _maybe_save(combined_df, "01_with_roles.csv")
+        _maybe_save(sentences_df, "02_sentences.csv")
+        _maybe_save(sentiment_df, "03_sentiment.csv")
+    else:
+        print("\n[Stage 00] Parsing transcripts...")
+        combined_df = run.parse(parse_workers)
+        print(f"  Rows parsed: {len(combined_df)} ({run.reused} of {len(run.fnames)} files reused from cache)")
+        _maybe_save(combined_df, "00_combined.csv")
 
-    print("\n[Stage 01] Tagging speaker roles...")
-    combined_df = stage_01_tag_roles(combined_df)
-    _maybe_save(combined_df, "01_with_roles.csv")
+        print("\n[Stage 01] Tagging speaker roles...")
+        combined_df = stage_01_tag_roles(combined_df)
+        _maybe_save(combined_df, "01_with_roles.csv")
 
-    print("\n[Stage 02] Tokenizing into sentences...")
-    sentences_df = stage_02_sentence_level(combined_df)
-    print(f"  Sentences: {len(sentences_df)}")
-    _maybe_save(sentences_df, "02_sentences.csv")
+        print("\n[Stage 02] Tokenizing into sentences...")
+        sentences_df = run.split(combined_df)
+        print(f"  Sentences: {len(sentences_df)}")
+        _maybe_save(sentences_df, "02_sentences.csv")
 
-    print("\n[Stage 03] Running sentiment analysis...")
-    sentiment_df = stage_03_hf_sentiment(sentences_df)
-    _maybe_save(sentiment_df, "03_sentiment.csv")
+        print("\n[Stage 03] Running sentiment analysis...")
+        sentiment_df = run.classify(sentences_df)
+        _maybe_save(sentiment_df, "03_sentiment.csv")
 
     print(f"\n[Stage 04] Separating '{target_company}' sentences vs competitor sentences...")
+    mentions = MentionIndex(
+        [target_company, *(other_services or DEFAULT_OTHER_SERVICES)]
+    ).scan(sentiment_df["sentence"])
     df_target, df_other = stage_04_separate_services(
-        sentiment_df, target_company, other_services
+        sentiment_df, target_company, other_services, mentions
     )
     print(f"  {target_company}-only: {len(df_target)} | Competitors: {len(df_other)}")
     _maybe_save(df_target, "04_target_only.csv")
     _maybe_save(df_other,  "04_other_services.csv")
 
     print(f"\n[Stage 05] Building '{target_company}' word-sentiment stats...")
-    word_stats_df = stage_05_word_stats(df_target, target_company)
+    word_stats_df = stage_05_word_stats(df_target, target_company, mentions)
     print(f"  Unique words: {len(word_stats_df)}")
     _maybe_save(word_stats_df, "05_word_stats.csv")
 
@@ -832,6 +1701,10 @@ if __name__ == "__main__":
     )
     parser.add_argument("--save-intermediate", action="store_true",
                         help="Also save each stage's DataFrame to CSV")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Processes for parsing transcripts (1 = serial, 0 = one per core)")
+    parser.add_argument("--stream", action="store_true", default=None,
+                        help="Overlap parsing, role tagging, sentence splitting and classification")
     args = parser.parse_args()
 
     parsed_other = (
@@ -846,4 +1719,6 @@ if __name__ == "__main__":
         target_company    = args.company,
         other_services    = parsed_other,
         save_intermediate = args.save_intermediate,
+        parse_workers     = args.parse_workers,
+        stream            = args.stream,
     )
\ No newline at end of file
@@ -8,6 +8,7 @@ top-N most positive and top-N most negative reviews per location.
 Requires SERPAPI_KEY in backend/.env.
 """
 
+import asyncio
 import os
 import sys
 from concurrent.futures import ThreadPoolExecutor
@@ -19,7 +20,7 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from sentiment_model import classify_batch
+from sentiment_model import classify_batch, classify_batch_async
 
 SERPAPI_KEY  = os.getenv("SERPAPI_KEY", "")
 _SERPAPI_URL = "https://serpapi.com/search"
@@ -149,6 +150,23 @@ def analyze_place(place: dict, n: int) -> dict:
     except Exception as e:
         return {**place, "error": str(e), "top_positive": [], "top_negative": [], "all_reviews": []}
 
+    sentiments = classify_batch([r["text"] for r in reviews]) if reviews else []
+    return _summarize_place(place, reviews, sentiments, n)
+
+
+async def analyze_place_async(place: dict, n: int, stats: dict | None = None) -> dict:
+    """Async variant of analyze_place: fetch in a worker thread, classify via classify_batch_async."""
+    try:
+        reviews = await asyncio.to_thread(_fetch_reviews, place.get("data_id", ""))
+    except Exception as e:
+        return {**place, "error": str(e), "top_positive": [], "top_negative": [], "all_reviews": []}
+
+    sentiments = await classify_batch_async([r["text"] for r in reviews], stats) if reviews else []
+    return _summarize_place(place, reviews, sentiments, n)
+
+
+def _summarize_place(place: dict, reviews: list[dict], sentiments: list[dict], n: int) -> dict:
+    """Attach sentiments to reviews and pick the top-N positive / negative."""
     if not reviews:
         return {
             **place,
@@ -159,7 +177,6 @@ def analyze_place(place: dict, n: int) -> dict:
             "all_reviews":    [],
         }
 
-    sentiments = classify_batch([r["text"] for r in reviews])
     for review, sentiment in zip(reviews, sentiments):
         review["sentiment_label"]    = sentiment["label"]
         review["sentiment_compound"] = sentiment["compound"]
@@ -191,3 +208,12 @@ def analyze_places(places: list[dict], n: int) -> list[dict]:
             f.result()
 
     return results
+
+
+async def analyze_places_async(places: list[dict], n: int, stats: dict | None = None) -> list[dict]:
+    """
+    Analyze multiple places concurrently on the event loop. OpenAI concurrency
+    is bounded by sentiment_model's process-wide semaphore. Pass a dict as
+    stats to collect classification counts across all places.
+    """
+    return list(await asyncio.gather(*(analyze_place_async(p, n, stats) for p in places)))
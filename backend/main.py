@@ -1,8 +1,10 @@
+import asyncio
 import base64
 import math
 import os
 import sys
 import tempfile
+import threading
 import pandas as pd
 from fastapi import FastAPI, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,15 +18,16 @@ import re
 # Make the condensed pipeline importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "condensed_transcript_sentiment_analysis_pipeline"))
 from full_sentiment_analyzer_pipeline import (
-    stage_00_parse_transcripts,
+    IncrementalRun,
     stage_01_tag_roles,
-    stage_02_sentence_level,
-    stage_03_hf_sentiment,
     stage_04_separate_services,
-    stage_05_canva_word_stats,
+    MentionIndex,
+    WordIndex,
     stage_06_plot_word_sentiment,
     POS_THRESHOLD,
     NEG_THRESHOLD,
+    DEFAULT_OTHER_SERVICES,
+    STREAM as TRANSCRIPT_STREAM,
     DEFAULT_PLOT_TITLE,
     DEFAULT_PLOT_XLABEL,
     DEFAULT_PLOT_YLABEL,
@@ -35,8 +38,8 @@ _reddit_available = False
 try:
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), "reddit-sentiment-analyzer"))
     from reddit_sentiment_analyzer import (
-        analyze_reddit_sentiment,
-        analyze_multiple_subreddits,
+        analyze_reddit_sentiment_async,
+        analyze_multiple_subreddits_async,
     )
     _reddit_available = True
 except Exception as _e:
@@ -46,7 +49,7 @@ except Exception as _e:
 _google_available = False
 try:
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), "google-reviews-analyzer"))
-    from google_reviews_analyzer import search_places, analyze_places
+    from google_reviews_analyzer import search_places, analyze_places_async
     _google_available = True
 except Exception as _e:
     print(f"[warning] Google Reviews analyzer unavailable: {_e}")
@@ -54,6 +57,8 @@ except Exception as _e:
 
 # Analytics
 from analytics import init_db, record as analytics_record
+import sentiment_cache
+import transcript_cache
 
 _REDDIT_UNAVAILABLE = {"success": False, "error": "Reddit analyzer unavailable — set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET in backend/.env"}
 
@@ -122,65 +127,53 @@ async def health_check():
     return {"status": "ok"}
 
 
-# Transcript sentiment analysis — generalized for any target company
-@app.post("/api/analyze_transcripts")
-async def analyze_transcripts(
-    files:          List[UploadFile] = File(...),
-    company:        str              = Form(...),
-    other_services: str              = Form(""),
-):
-    """
-    Analyze interview transcripts for sentiment toward a specified company.
+# Sentiment result cache counters (hits, misses, evictions, entry count)
+@app.get("/api/sentiment/cache_stats")
+def sentiment_cache_stats():
+    return sentiment_cache.stats()
 
-    Accepts:
-        files:          One or more .docx or .txt transcript files.
-        company:        The company to focus on (e.g. "Canva", "Figma").
-                        Sentences mentioning this company are analyzed for
-                        word-sentiment associations in stages 05 and 06.
-        other_services: Comma-separated list of competitor/other service names
-                        entered by the user (e.g. "adobe, sketch, xd").
-                        Stage 04 uses this to separate pure target-company
-                        sentences from competitor-mention sentences.
-                        Leave empty to skip competitor separation.
 
-    Returns per-interviewee sentiment summary plus an overall word-sentiment
-    scatter plot encoded as a base64 PNG string.
-    """
-    parsed_other_services = (
-        [s.strip() for s in other_services.split(",") if s.strip()]
-        if other_services.strip()
-        else []
-    )
+# Per-file transcript cache counters (hits, misses, evictions, stored bytes)
+@app.get("/api/transcripts/cache_stats")
+def transcript_cache_stats():
+    return transcript_cache.stats()
 
-    results = []
-    _sentence_count = 0
 
-    for file in files:
-        fname = file.filename or "unknown"
-        if not fname.lower().endswith((".docx", ".txt", ".pdf")):
-            results.append({"filename": fname, "error": "Only .docx, .txt, and .pdf files are supported"})
+def _split_names(value: str) -> list[str]:
+    """Comma-separated form field → list of non-empty, stripped names."""
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
+def _parse_and_split(run: IncrementalRun, workers: Optional[int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Stages 00–02 for the non-streaming path: (role-tagged lines, sentences)."""
+    combined_df = stage_01_tag_roles(run.parse(workers))
+    return combined_df, run.split(combined_df)
+
+
+# pyplot keeps global figure state, so concurrent company analyses take turns plotting
+_plot_lock = threading.Lock()
 
-    valid_files = [f for f in files if (f.filename or "").lower().endswith((".docx", ".txt", ".pdf"))]
-    if not valid_files:
-        return {"results": results}
 
+def _analyze_company(
+    sentiment_df:   pd.DataFrame,
+    company:        str,
+    other_services: list[str],
+    mentions:       pd.DataFrame,
+) -> dict:
+    """
+    Stages 04–06 for one target company over already-classified sentences:
+    per-interviewee summaries, overall word stats and the scatter plot.
+    """
+    results = []
+    word_index = None
     try:
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            for file in valid_files:
-                dest    = os.path.join(tmp_dir, file.filename)
-                content = await file.read()
-                with open(dest, "wb") as f:
-                    f.write(content)
-
-            combined_df  = stage_00_parse_transcripts(tmp_dir)
-            combined_df  = stage_01_tag_roles(combined_df)
-            sentences_df = stage_02_sentence_level(combined_df)
-            sentiment_df = stage_03_hf_sentiment(sentences_df)
-            _sentence_count = int(len(sentiment_df))
-
-            df_target, df_other = stage_04_separate_services(
-                sentiment_df, company, parsed_other_services or None
-            )
+        df_target, df_other = stage_04_separate_services(
+            sentiment_df, company, other_services or None, mentions
+        )
+        # Tokenize the target sentences once; per-interviewee and overall
+        # word stats below are reductions over this one index.
+        word_index = WordIndex(df_target, company, mentions)
+        word_stats_by_interviewee = word_index.word_stats_by("interviewee")
 
         for interviewee in sentiment_df["interviewee"].unique():
             idf = sentiment_df[sentiment_df["interviewee"] == interviewee]
@@ -200,9 +193,8 @@ async def analyze_transcripts(
             target_count = int(len(df_target[df_target["interviewee"] == interviewee]))
             other_count  = int(len(df_other[df_other["interviewee"] == interviewee]))
 
-            idf_target     = df_target[df_target["interviewee"] == interviewee]
-            idf_word_stats = stage_05_canva_word_stats(idf_target, company)
-            top_words      = idf_word_stats.head(10).to_dict(orient="records")
+            idf_word_stats = word_stats_by_interviewee.get(interviewee)
+            top_words      = [] if idf_word_stats is None else idf_word_stats.head(10).to_dict(orient="records")
 
             results.append({
                 "filename":              interviewee,
@@ -226,30 +218,147 @@ async def analyze_transcripts(
 
     overall_plot: str | None = None
     word_stats_json: list    = []
+    # No index means stage 04 failed, which is already reported in results
+    if word_index is not None:
+        try:
+            all_word_stats  = word_index.word_stats()
+            word_stats_json = all_word_stats.to_dict(orient="records")
+            with _plot_lock, tempfile.TemporaryDirectory() as plot_tmp:
+                stage_06_plot_word_sentiment(all_word_stats, plot_tmp, company)
+                slug      = re.sub(r"[^a-z0-9]+", "_", company.lower()).strip("_")
+                plot_path = os.path.join(plot_tmp, f"{slug}_word_freq_sentiment.png")
+                if os.path.exists(plot_path):
+                    with open(plot_path, "rb") as f:
+                        overall_plot = base64.b64encode(f.read()).decode("utf-8")
+        except Exception as e:
+            # The per-interviewee results still stand without the plot
+            print(f"[warning] Word stats / plot for {company!r} failed: {e!r}")
+
+    return {
+        "target_company": company,
+        "results":        results,
+        "overall_plot":   overall_plot,
+        "word_stats":     word_stats_json,
+    }
+
+
+# Transcript sentiment analysis — generalized for any target company
+@app.post("/api/analyze_transcripts")
+async def analyze_transcripts(
+    files:          List[UploadFile] = File(...),
+    company:        str              = Form(""),
+    companies:      str              = Form(""),
+    other_services: str              = Form(""),
+    parse_workers:  Optional[int]    = Form(None),
+    stream:         Optional[bool]   = Form(None),
+):
+    """
+    Analyze interview transcripts for sentiment toward a specified company.
+
+    Accepts:
+        files:          One or more .docx or .txt transcript files.
+        company:        The company to focus on (e.g. "Canva", "Figma").
+                        Sentences mentioning this company are analyzed for
+                        word-sentiment associations in stages 05 and 06.
+        companies:      Comma-separated target companies (e.g. "Canva, Figma,
+                        Adobe") to compare in one request. Files are parsed
+                        and classified once (stages 00–03); stages 04–06 then
+                        run for each company in parallel. Takes precedence
+                        over `company`.
+        other_services: Comma-separated list of competitor/other service names
+                        entered by the user (e.g. "adobe, sketch, xd").
+                        Stage 04 uses this to separate pure target-company
+                        sentences from competitor-mention sentences.
+                        Leave empty to skip competitor separation.
+        parse_workers:  Optional number of processes used to parse the files
+                        (1 = serial, 0 = one per CPU core). Defaults to
+                        TRANSCRIPT_PARSE_WORKERS.
+        stream:         Optionally overlap parsing, role tagging, sentence
+                        splitting and classification (same results).
+                        Defaults to TRANSCRIPT_STREAM.
+
+    Returns per-interviewee sentiment summary plus an overall word-sentiment
+    scatter plot encoded as a base64 PNG string. With `companies`, those come
+    back once per company under "companies", in the order given.
+    """
+    parsed_other_services = _split_names(other_services)
+    multi   = bool(_split_names(companies))
+    targets = list(dict.fromkeys(_split_names(companies))) if multi else [company.strip()]
+
+    results = []
+    _sentence_count = 0
+    classification_stats: dict = {}
+    company_reports: list[dict] = []
+
+    if not targets[0]:
+        return {"results": [{"filename": "pipeline", "error": "Provide a company or companies to analyze"}]}
+
+    for file in files:
+        fname = file.filename or "unknown"
+        if not fname.lower().endswith((".docx", ".txt", ".pdf")):
+            results.append({"filename": fname, "error": "Only .docx, .txt, and .pdf files are supported"})
+
+    valid_files = [f for f in files if (f.filename or "").lower().endswith((".docx", ".txt", ".pdf"))]
+    if not valid_files:
+        return {"results": results}
+
     try:
-        all_word_stats  = stage_05_canva_word_stats(df_target, company)
-        word_stats_json = all_word_stats.to_dict(orient="records")
-        with tempfile.TemporaryDirectory() as plot_tmp:
-            stage_06_plot_word_sentiment(all_word_stats, plot_tmp, company)
-            slug      = re.sub(r"[^a-z0-9]+", "_", company.lower()).strip("_")
-            plot_path = os.path.join(plot_tmp, f"{slug}_word_freq_sentiment.png")
-            if os.path.exists(plot_path):
-                with open(plot_path, "rb") as f:
-                    overall_plot = base64.b64encode(f.read()).decode("utf-8")
-    except Exception:
-        pass
+        # Parse straight from the spooled upload files — no temp-dir round-trip.
+        # Files uploaded before (same bytes) reuse their cached parse,
+        # sentences and sentiment; only new or changed files are processed.
+        # Reading, hashing and parsing are blocking, so they run off the event loop.
+        run = IncrementalRun.from_uploads([(file.filename, file.file) for file in valid_files])
+        stream = TRANSCRIPT_STREAM if stream is None else stream
+        if stream:
+            # Stage threads over bounded queues
+            combined_df, sentences_df, sentiment_df = await asyncio.to_thread(
+                run.stream, parse_workers, classification_stats
+            )
+        else:
+            combined_df, sentences_df = await asyncio.to_thread(_parse_and_split, run, parse_workers)
+            sentiment_df = await run.classify_async(sentences_df, classification_stats)
+        classification_stats["reused_files"] = run.reused
+        _sentence_count = int(len(sentiment_df))
+
+        # One automaton pass marks every company/service mention; each
+        # company's stage_04 split and word index read from it.
+        mentions = MentionIndex(
+            [*targets, *(parsed_other_services or DEFAULT_OTHER_SERVICES)]
+        ).scan(sentiment_df["sentence"])
+        company_reports = list(await asyncio.gather(*(
+            asyncio.to_thread(_analyze_company, sentiment_df, target, parsed_other_services, mentions)
+            for target in targets
+        )))
+
+    except Exception as e:
+        results.append({"filename": "pipeline", "error": str(e)})
 
     # Record analytics
     analytics_record("transcript_analysis", {
-        "success": any("error" not in r for r in results),
+        "success": any("error" not in r for report in company_reports for r in report["results"]),
         "file_count": len(valid_files),
-        "company": company,
+        "company": ", ".join(targets),
         "sentence_count": _sentence_count,
+        "escalated_count": classification_stats.get("escalated", 0),
     })
-    if overall_plot:
-        analytics_record("graph_generated", {"company": company})
-
-    return {"results": results, "overall_plot": overall_plot, "word_stats": word_stats_json}
+    for report in company_reports:
+        if report["overall_plot"]:
+            analytics_record("graph_generated", {"company": report["target_company"]})
+
+    if multi:
+        return {
+            "results":              results,
+            "companies":            company_reports,
+            "classification_stats": classification_stats,
+        }
+
+    report = company_reports[0] if company_reports else {"results": [], "overall_plot": None, "word_stats": []}
+    return {
+        "results":              results + report["results"],
+        "overall_plot":         report["overall_plot"],
+        "word_stats":           report["word_stats"],
+        "classification_stats": classification_stats,
+    }
 
 
 @app.post("/api/regenerate_plot")
@@ -287,11 +396,11 @@ async def regenerate_plot(req: RegeneratePlotRequest):
 
 # Reddit Sentiment Analysis Endpoints
 @app.post("/api/reddit/analyze")
-def analyze_reddit(req: RedditAnalysisRequest):
+async def analyze_reddit(req: RedditAnalysisRequest):
     if not _reddit_available:
         return _REDDIT_UNAVAILABLE
     try:
-        result = analyze_reddit_sentiment(
+        result = await analyze_reddit_sentiment_async(
             subreddit=req.subreddit,
             query=req.query,
             time_filter=req.time_filter or "year",
@@ -310,11 +419,11 @@ def analyze_reddit(req: RedditAnalysisRequest):
 
 
 @app.post("/api/reddit/analyze_multi")
-def analyze_reddit_multi(req: RedditMultiSubredditRequest):
+async def analyze_reddit_multi(req: RedditMultiSubredditRequest):
     if not _reddit_available:
         return _REDDIT_UNAVAILABLE
     try:
-        result = analyze_multiple_subreddits(
+        result = await analyze_multiple_subreddits_async(
             subreddits=req.subreddits,
             query=req.query,
             time_filter=req.time_filter or "year",
@@ -332,11 +441,11 @@ def analyze_reddit_multi(req: RedditMultiSubredditRequest):
 
 
 @app.post("/api/reddit/download_csv")
-def download_reddit_csv(req: RedditAnalysisRequest):
+async def download_reddit_csv(req: RedditAnalysisRequest):
     if not _reddit_available:
         return _REDDIT_UNAVAILABLE
     try:
-        result = analyze_reddit_sentiment(
+        result = await analyze_reddit_sentiment_async(
             subreddit=req.subreddit,
             query=req.query,
             time_filter=req.time_filter or "year",
@@ -361,11 +470,11 @@ def download_reddit_csv(req: RedditAnalysisRequest):
 
 
 @app.post("/api/reddit/download_csv_multi")
-def download_reddit_csv_multi(req: RedditMultiSubredditRequest):
+async def download_reddit_csv_multi(req: RedditMultiSubredditRequest):
     if not _reddit_available:
         return _REDDIT_UNAVAILABLE
     try:
-        result = analyze_multiple_subreddits(
+        result = await analyze_multiple_subreddits_async(
             subreddits=req.subreddits,
             query=req.query,
             time_filter=req.time_filter or "year",
@@ -410,15 +519,16 @@ async def google_analyze_reviews(req: GoogleReviewsAnalysisRequest):
     if not _google_available:
         return _GOOGLE_UNAVAILABLE
     n = max(1, min(30, req.n))
+    classification_stats: dict = {}
     try:
-        results = analyze_places(req.places, n)
+        results = await analyze_places_async(req.places, n, classification_stats)
         analytics_record("google_reviews_analysis", {
             "success": True,
             "place_count": len(req.places),
             "n": n,
             "review_count": sum(r.get("total_reviews_analyzed", 0) for r in results if isinstance(r, dict)),
         })
-        return {"success": True, "results": results}
+        return {"success": True, "results": results, "classification_stats": classification_stats}
     except Exception as e:
         analytics_record("google_reviews_analysis", {"success": False})
         return {"success": False, "error": str(e)}
@@ -5,6 +5,7 @@ This module provides functionality to scrape Reddit posts from specified subredd
 analyze their sentiment using VADER, and return results with a downloadable CSV option.
 """
 
+import asyncio
 import os
 import re
 import sys
@@ -33,7 +34,7 @@ nltk.download("brown", quiet=True)
 from nltk.corpus import stopwords, brown
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from sentiment_model import classify
+from sentiment_model import classify, classify_batch_async
 
 
 # Reddit API credentials loaded from environment variables
@@ -154,6 +155,40 @@ def analyze_sentiment(df: pd.DataFrame) -> pd.DataFrame:
         df["title_sentiment"] = [f.result() for f in title_futures]
         df["text_sentiment"] = [f.result() for f in text_futures]
 
+    return _add_combined_sentiment(df)
+
+
+async def analyze_sentiment_async(df: pd.DataFrame, stats: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Async variant of analyze_sentiment for the FastAPI handlers.
+
+    Titles and bodies go through classify_batch_async in a single call, so
+    concurrency is bounded by sentiment_model's process-wide semaphore
+    instead of a 20-thread pool per request.
+
+    Args:
+        df: DataFrame with 'title' and 'text' columns
+        stats: Optional dict that collects classification counts
+
+    Returns:
+        DataFrame with added sentiment columns
+    """
+    if df.empty:
+        return df
+
+    df = df.copy()
+    titles = df["title"].tolist()
+    texts = df["text"].tolist()
+
+    results = await classify_batch_async(titles + texts, stats)
+    df["title_sentiment"] = [r["compound"] for r in results[:len(titles)]]
+    df["text_sentiment"] = [r["compound"] for r in results[len(titles):]]
+
+    return _add_combined_sentiment(df)
+
+
+def _add_combined_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive combined_sentiment and sentiment_label from title/text sentiment."""
     # Combined sentiment (weighted average: text is usually more informative)
     df["combined_sentiment"] = df.apply(
         lambda row: (row["title_sentiment"] * 0.3 + row["text_sentiment"] * 0.7)
@@ -329,6 +364,42 @@ def analyze_reddit_sentiment(
         limit=limit
     )
 
+    # Analyze sentiment
+    if not df.empty:
+        df = analyze_sentiment(df)
+
+    return _build_single_result(subreddit, query, df)
+
+
+async def analyze_reddit_sentiment_async(
+    subreddit: str,
+    query: str,
+    time_filter: str = "year",
+    limit: Optional[int] = None
+) -> dict:
+    """
+    Async variant of analyze_reddit_sentiment. Scraping (blocking PRAW calls)
+    runs in a worker thread; classification uses analyze_sentiment_async.
+    """
+    df = await asyncio.to_thread(
+        scrape_subreddit_posts,
+        subreddit_name=subreddit,
+        query=query,
+        time_filter=time_filter,
+        limit=limit
+    )
+
+    stats: dict = {}
+    if not df.empty:
+        df = await analyze_sentiment_async(df, stats)
+
+    result = await asyncio.to_thread(_build_single_result, subreddit, query, df)
+    result["classification_stats"] = stats
+    return result
+
+
+def _build_single_result(subreddit: str, query: str, df: pd.DataFrame) -> dict:
+    """Assemble the single-subreddit response from a sentiment-scored DataFrame."""
     if df.empty:
         return {
             "success": True,
@@ -341,9 +412,6 @@ def analyze_reddit_sentiment(
             "csv_data": "",
         }
 
-    # Analyze sentiment
-    df = analyze_sentiment(df)
-
     # Compute statistics
     summary = compute_summary_stats(df)
     monthly_trend = get_monthly_sentiment_trend(df)
@@ -391,6 +459,50 @@ def analyze_multiple_subreddits(
     Returns:
         Dictionary with combined analysis results
     """
+    combined_df, errors = _scrape_multiple_subreddits(subreddits, query, time_filter, limit)
+
+    # Analyze sentiment
+    if combined_df is not None:
+        combined_df = analyze_sentiment(combined_df)
+
+    return _build_multi_result(subreddits, query, combined_df, errors)
+
+
+async def analyze_multiple_subreddits_async(
+    subreddits: list,
+    query: str,
+    time_filter: str = "year",
+    limit: Optional[int] = None
+) -> dict:
+    """
+    Async variant of analyze_multiple_subreddits. Scraping runs in a worker
+    thread; classification uses analyze_sentiment_async.
+    """
+    combined_df, errors = await asyncio.to_thread(
+        _scrape_multiple_subreddits, subreddits, query, time_filter, limit
+    )
+
+    stats: dict = {}
+    if combined_df is not None:
+        combined_df = await analyze_sentiment_async(combined_df, stats)
+
+    result = await asyncio.to_thread(_build_multi_result, subreddits, query, combined_df, errors)
+    result["classification_stats"] = stats
+    return result
+
+
+def _scrape_multiple_subreddits(
+    subreddits: list,
+    query: str,
+    time_filter: str,
+    limit: Optional[int]
+) -> tuple[Optional[pd.DataFrame], list]:
+    """
+    Scrape each subreddit and combine the posts, de-duplicated by id.
+
+    Returns:
+        (combined DataFrame or None if nothing was found, per-subreddit errors)
+    """
     all_dfs = []
     errors = []
 
@@ -408,6 +520,22 @@ def analyze_multiple_subreddits(
             errors.append({"subreddit": subreddit, "error": str(e)})
 
     if not all_dfs:
+        return None, errors
+
+    # Combine all DataFrames
+    combined_df = pd.concat(all_dfs, ignore_index=True)
+    combined_df = combined_df.drop_duplicates(subset=["id"])
+    return combined_df, errors
+
+
+def _build_multi_result(
+    subreddits: list,
+    query: str,
+    combined_df: Optional[pd.DataFrame],
+    errors: list
+) -> dict:
+    """Assemble the multi-subreddit response from a sentiment-scored DataFrame."""
+    if combined_df is None:
         return {
             "success": False,
             "subreddits": subreddits,
@@ -420,13 +548,6 @@ def analyze_multiple_subreddits(
             "csv_data": "",
         }
 
-    # Combine all DataFrames
-    combined_df = pd.concat(all_dfs, ignore_index=True)
-    combined_df = combined_df.drop_duplicates(subset=["id"])
-
-    # Analyze sentiment
-    combined_df = analyze_sentiment(combined_df)
-
     # Compute statistics
     summary = compute_summary_stats(combined_df)
     monthly_trend = get_monthly_sentiment_trend(combined_df)
@@ -0,0 +1,64 @@
+"""
+Sentiment cache: persistent, content-addressed store for classification results.
+
+Results are keyed by a SHA-256 of (namespace, text), where the namespace encodes
+the backend, model and prompt version that produced them — changing any of those
+automatically invalidates old entries. Backed by SQLite so the cache survives
+restarts and is shared by every worker thread in the process.
+
+Environment:
+  SENTIMENT_CACHE              "0"/"false"/"off" disables the cache (default: on)
+  SENTIMENT_CACHE_PATH         SQLite file (default: backend/sentiment_cache.db)
+  SENTIMENT_CACHE_MAX_ENTRIES  LRU bound on stored results (default: 200000)
+"""
+
+import hashlib
+import json
+import os
+
+from sqlite_lru import SQLiteLRU
+
+ENABLED     = os.getenv("SENTIMENT_CACHE", "1").lower() not in ("0", "false", "off")
+DB_PATH     = os.getenv("SENTIMENT_CACHE_PATH", os.path.join(os.path.dirname(__file__), "sentiment_cache.db"))
+MAX_ENTRIES = int(os.getenv("SENTIMENT_CACHE_MAX_ENTRIES", "200000"))
+
+_store = SQLiteLRU(DB_PATH, table="results", value_column="result", capacity=MAX_ENTRIES)
+
+
+def make_key(text: str, namespace: str) -> str:
+    """Content address for a text under a given backend/model/prompt namespace."""
+    return hashlib.sha256(f"{namespace}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def get_many(keys: list[str]) -> dict[str, dict]:
+    """
+    Look up cached results. Returns {key: result} for hits only and bumps
+    their recency so they survive eviction.
+    """
+    if not ENABLED or not keys:
+        return {}
+    return {k: json.loads(v) for k, v in _store.get_many(keys).items()}
+
+
+def put_many(items: dict[str, dict]) -> None:
+    """Store results, then evict least-recently-used rows beyond MAX_ENTRIES."""
+    if not ENABLED or not items:
+        return
+    _store.put_many({k: json.dumps(v) for k, v in items.items()})
+
+
+def stats() -> dict:
+    """Hit/miss counters for this process plus the current on-disk entry count."""
+    s = _store.stats(read_db=ENABLED)
+    return {
+        "enabled":     ENABLED,
+        "entries":     s["entries"],
+        "max_entries": _store.capacity,
+        **_store.counters,
+        "hit_ratio":   s["hit_ratio"],
+    }
+
+
+def clear() -> None:
+    """Drop every cached result and reset the counters."""
+    _store.clear(read_db=ENABLED)
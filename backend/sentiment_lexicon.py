@@ -0,0 +1,200 @@
+"""
+Vectorized lexicon sentiment scorer (SENTIMENT_BACKEND=lexicon).
+
+A VADER-style bulk scorer for large Reddit and transcript corpora where LLM
+latency and cost are too high. The NLTK VADER lexicon is loaded once into
+NumPy arrays; each batch is tokenized in a single regex pass over the joined
+texts and scored with array operations:
+
+  - word valences from the lexicon
+  - negation: a negator in the three preceding tokens flips and damps (×-0.74)
+  - intensifiers: a booster in the three preceding tokens pushes valence
+    away from zero (±0.293, decaying 0.95 / 0.9 with distance)
+  - contrast: words before the first "but" count ×0.5, words after it ×1.5
+  - caps emphasis: an ALL-CAPS word in a text that isn't all caps pushes its
+    valence away from zero (±0.733)
+  - "!" emphasis: up to four per text, +0.292 each in the direction of the sum
+  - compound = sum / sqrt(sum² + 15), VADER's normalisation
+
+Returns the same {label, score, compound} contract as every other backend.
+"""
+
+import re
+from itertools import repeat
+
+import nltk
+import numpy as np
+
+_LEXICON_PATH = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+
+_ALPHA       = 15.0    # compound normalisation constant
+_N_SCALAR    = -0.74   # negation flip/damp factor
+_BOOST       = 0.293   # intensifier increment
+_BANG_BOOST  = 0.292   # per "!" (max 4)
+_CAPS_BOOST  = 0.733   # ALL-CAPS word in mixed-case text
+_MAX_BANGS   = 4
+_LOOKBACK    = ((1, 1.0), (2, 0.95), (3, 0.9))  # (distance, booster decay)
+_POS_CUTOFF  = 0.05
+_NEG_CUTOFF  = -0.05
+
+_NEGATORS = {
+    "aint", "arent", "cannot", "cant", "couldnt", "darent", "didnt", "doesnt",
+    "ain't", "aren't", "can't", "couldn't", "daren't", "didn't", "doesn't",
+    "dont", "hadnt", "hasnt", "havent", "isnt", "mightnt", "mustnt", "neither",
+    "don't", "hadn't", "hasn't", "haven't", "isn't", "mightn't", "mustn't",
+    "neednt", "needn't", "never", "none", "nope", "nor", "not", "nothing",
+    "nowhere", "oughtnt", "shant", "shouldnt", "uhuh", "wasnt", "werent",
+    "oughtn't", "shan't", "shouldn't", "uh-uh", "wasn't", "weren't", "without",
+    "wont", "wouldnt", "won't", "wouldn't", "rarely", "seldom", "despite",
+}
+
+_BOOSTERS = {
+    **{w: _BOOST for w in (
+        "absolutely", "amazingly", "awfully", "completely", "considerably",
+        "decidedly", "deeply", "enormously", "entirely", "especially",
+        "exceptionally", "extremely", "fabulously", "fully", "greatly", "hella",
+        "highly", "hugely", "incredibly", "intensely", "majorly", "more", "most",
+        "particularly", "purely", "quite", "really", "remarkably", "so",
+        "substantially", "thoroughly", "totally", "tremendously", "uber",
+        "unbelievably", "unusually", "utterly", "very",
+    )},
+    **{w: -_BOOST for w in (
+        "almost", "barely", "hardly", "kinda", "kindof", "kind-of", "less",
+        "little", "marginally", "occasionally", "partly", "scarcely", "slightly",
+        "somewhat", "sorta", "sortof", "sort-of",
+    )},
+}
+
+_BUT_BEFORE  = 0.5
+_BUT_AFTER   = 1.5
+
+_SEP  = "\x00"  # text separator inside the joined batch
+_BANG = "!"
+_BUT  = "but"
+_TOKEN_RE = re.compile(r"[a-z][a-z'\-]*|!|\x00", re.IGNORECASE)
+
+# Populated once by _load(); id 0 is "unknown word".
+_vocab:   dict[str, int] | None = None
+_valence: np.ndarray
+_negator: np.ndarray
+_booster: np.ndarray
+_SEP_ID  = -1
+_BANG_ID = -1
+_BUT_ID  = -1
+
+
+def _load() -> None:
+    """Read the VADER lexicon into vocabulary-indexed arrays (first call only)."""
+    if _vocab is not None:
+        return
+
+    nltk.download("vader_lexicon", quiet=True)
+    raw = nltk.data.load(_LEXICON_PATH, format="text")
+
+    lexicon: dict[str, float] = {}
+    for line in raw.splitlines():
+        parts = line.strip().split("\t")
+        if len(parts) >= 2:
+            lexicon[parts[0]] = float(parts[1])
+    _build(lexicon)
+
+
+def _build(lexicon: dict[str, float]) -> None:
+    """Index a {word: valence} lexicon plus the negators and boosters."""
+    global _vocab, _valence, _negator, _booster, _SEP_ID, _BANG_ID, _BUT_ID
+    vocab = {"": 0}
+    for word in (*lexicon, *_NEGATORS, *_BOOSTERS, _BANG, _BUT, _SEP):
+        vocab.setdefault(word, len(vocab))
+
+    valence = np.zeros(len(vocab))
+    negator = np.zeros(len(vocab), dtype=bool)
+    booster = np.zeros(len(vocab))
+    for word, value in lexicon.items():
+        valence[vocab[word]] = value
+    for word in _NEGATORS:
+        negator[vocab[word]] = True
+    for word, value in _BOOSTERS.items():
+        booster[vocab[word]] = value
+
+    _valence, _negator, _booster = valence, negator, booster
+    _SEP_ID, _BANG_ID, _BUT_ID = vocab[_SEP], vocab[_BANG], vocab[_BUT]
+    _vocab = vocab
+
+
+def _compound_scores(texts: list[str]) -> np.ndarray:
+    """Compound score in [-1, 1] for every text, computed in one vectorized pass."""
+    _load()
+    n = len(texts)
+
+    joined = _SEP.join((t or "").replace(_SEP, " ") for t in texts).replace("’", "'")
+    tokens = _TOKEN_RE.findall(joined)
+    caps   = np.fromiter(map(str.isupper, tokens), dtype=bool, count=len(tokens))
+    ids = np.fromiter(map(_vocab.get, map(str.lower, tokens), repeat(0)), dtype=np.int64, count=len(tokens))
+
+    # Separators mark text boundaries: the running count is each token's text index.
+    is_sep = ids == _SEP_ID
+    doc  = np.cumsum(is_sep)[~is_sep]
+    ids  = ids[~is_sep]
+    caps = caps[~is_sep]
+
+    # Caps only count as emphasis in texts that mix ALL-CAPS and other words.
+    n_words = np.bincount(doc, weights=(ids != _BANG_ID), minlength=n)
+    n_caps  = np.bincount(doc, weights=caps, minlength=n)
+    mixed   = (n_caps > 0) & (n_caps < n_words)
+
+    valence = _valence[ids]
+    sign    = np.sign(valence)
+    adjusted = valence + np.where(caps & mixed[doc], _CAPS_BOOST, 0.0) * sign
+    negated  = np.zeros(len(ids), dtype=bool)
+    for k, decay in _LOOKBACK:
+        prev = np.zeros(len(ids), dtype=np.int64)
+        if len(ids) > k:
+            same_doc = doc[k:] == doc[:-k]
+            prev[k:] = np.where(same_doc, ids[:-k], 0)
+        adjusted += _booster[prev] * decay * sign
+        negated  |= _negator[prev]
+    adjusted = np.where(negated, adjusted * _N_SCALAR, adjusted)
+
+    pos = np.arange(len(ids))
+    is_but = ids == _BUT_ID
+    first_but = np.full(n, len(ids))
+    np.minimum.at(first_but, doc[is_but], pos[is_but])
+    has_but = first_but[doc] < len(ids)
+    adjusted *= np.where(
+        has_but & (pos < first_but[doc]), _BUT_BEFORE,
+        np.where(has_but & (pos > first_but[doc]), _BUT_AFTER, 1.0),
+    )
+
+    sums  = np.bincount(doc, weights=adjusted, minlength=n)
+    bangs = np.minimum(np.bincount(doc, weights=(ids == _BANG_ID), minlength=n), _MAX_BANGS)
+    sums += np.sign(sums) * bangs * _BANG_BOOST
+
+    return sums / np.sqrt(sums * sums + _ALPHA)
+
+
+def classify_batch(texts: list[str]) -> list[dict]:
+    """
+    Score a batch of texts. Same contract as sentiment_model.classify_batch:
+        [{"label": ..., "score": ..., "compound": ...}, ...]
+    """
+    if not texts:
+        return []
+
+    compound = _compound_scores(texts)
+    positive = compound >= _POS_CUTOFF
+    negative = compound <= _NEG_CUTOFF
+
+    labels = np.where(positive, "positive", np.where(negative, "negative", "neutral"))
+    scores = np.where(
+        positive, (compound + 1.0) / 2.0,
+        np.where(negative, (1.0 - compound) / 2.0, 1.0 - np.abs(compound) / _POS_CUTOFF * 0.5),
+    )
+
+    results = [
+        {"label": label, "score": score, "compound": c}
+        for label, score, c in zip(labels.tolist(), np.round(scores, 4).tolist(), np.round(compound, 4).tolist())
+    ]
+    for i, t in enumerate(texts):
+        if not t or not t.strip():
+            results[i] = {"label": "neutral", "score": 0.0, "compound": 0.0}
+    return results
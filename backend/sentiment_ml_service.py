@@ -0,0 +1,149 @@
+"""
+ML service backend (SENTIMENT_BACKEND=railway or ml_service).
+
+Calls the Cardiff RoBERTa microservice in ml_service/ over HTTP. One pooled,
+keep-alive httpx client per process (sync and async) sends size-bounded
+batches of texts to /analyze concurrently, with timeouts and retries on
+connection errors, 429 and 5xx. Results come back in the standard
+{label, score, compound} format, so every analyzer works unchanged.
+
+To test locally, run ml_service with a tiny model and point the backend at it:
+    ML_MODEL=<tiny HF sequence-classification model> python ml_service/main.py
+    ML_SERVICE_URL=http://localhost:8001 SENTIMENT_BACKEND=ml_service python main.py
+
+Environment:
+  ML_SERVICE_URL              base URL of the service (required)
+  ML_SERVICE_SECRET           shared X-Internal-Secret header value
+  ML_SERVICE_MODEL            model id, used to namespace cached results
+  ML_SERVICE_BATCH_SIZE       texts per /analyze call        (default: 64)
+  ML_SERVICE_MAX_CONCURRENCY  concurrent /analyze calls      (default: 4)
+  ML_SERVICE_TIMEOUT          seconds per call               (default: 30)
+  ML_SERVICE_MAX_ATTEMPTS     attempts per batch             (default: 3)
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+import sentiment_scheduler
+
+ML_SERVICE_URL    = os.getenv("ML_SERVICE_URL", "").rstrip("/")
+ML_SERVICE_SECRET = os.getenv("ML_SERVICE_SECRET", "")
+ML_SERVICE_MODEL  = os.getenv("ML_SERVICE_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+
+_BATCH_SIZE      = int(os.getenv("ML_SERVICE_BATCH_SIZE", "64"))
+_MAX_CONCURRENCY = int(os.getenv("ML_SERVICE_MAX_CONCURRENCY", "4"))
+_TIMEOUT         = float(os.getenv("ML_SERVICE_TIMEOUT", "30"))
+_MAX_ATTEMPTS    = int(os.getenv("ML_SERVICE_MAX_ATTEMPTS", "3"))
+
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_async_semaphore: asyncio.Semaphore | None = None
+
+
+def _client_kwargs() -> dict:
+    headers = {"X-Internal-Secret": ML_SERVICE_SECRET} if ML_SERVICE_SECRET else {}
+    return {
+        "base_url": ML_SERVICE_URL,
+        "headers":  headers,
+        "timeout":  _TIMEOUT,
+        "limits":   httpx.Limits(
+            max_connections=_MAX_CONCURRENCY,
+            max_keepalive_connections=_MAX_CONCURRENCY,
+        ),
+    }
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        _client = httpx.Client(**_client_kwargs())
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(**_client_kwargs())
+    return _async_client
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    global _async_semaphore
+    if _async_semaphore is None:
+        _async_semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+    return _async_semaphore
+
+
+def _chunks(texts: list[str]) -> list[list[str]]:
+    return [texts[i:i + _BATCH_SIZE] for i in range(0, len(texts), _BATCH_SIZE)]
+
+
+def _is_retriable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """Delay before the next attempt; re-raises when retrying is pointless."""
+    if not _is_retriable(exc) or attempt + 1 >= _MAX_ATTEMPTS:
+        raise exc
+    server_delay = sentiment_scheduler.retry_after(exc)
+    return server_delay if server_delay is not None else sentiment_scheduler.backoff(attempt)
+
+
+def _parse(response: httpx.Response, n: int) -> list[dict]:
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    if len(results) != n:
+        raise RuntimeError(f"ML service returned {len(results)} results for {n} texts")
+    return [
+        {"label": r["label"], "score": float(r["score"]), "compound": float(r["compound"])}
+        for r in results
+    ]
+
+
+def _post_batch(texts: list[str]) -> list[dict]:
+    client = _get_client()
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            return _parse(client.post("/analyze", json={"texts": texts}), len(texts))
+        except Exception as e:
+            time.sleep(_retry_delay(e, attempt))
+    raise RuntimeError("unreachable")
+
+
+async def _post_batch_async(texts: list[str]) -> list[dict]:
+    client = _get_async_client()
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            async with _get_async_semaphore():
+                response = await client.post("/analyze", json={"texts": texts})
+            return _parse(response, len(texts))
+        except Exception as e:
+            await asyncio.sleep(_retry_delay(e, attempt))
+    raise RuntimeError("unreachable")
+
+
+def classify_batch(texts: list[str]) -> list[dict]:
+    """Classify non-blank texts via the ML service, batches sent concurrently."""
+    chunks = _chunks(texts)
+    if len(chunks) <= 1:
+        return _post_batch(chunks[0]) if chunks else []
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_CONCURRENCY)) as executor:
+        chunk_results = list(executor.map(_post_batch, chunks))
+    return [r for chunk in chunk_results for r in chunk]
+
+
+async def classify_batch_async(texts: list[str]) -> list[dict]:
+    """Async counterpart of classify_batch, bounded by this module's semaphore."""
+    chunk_results = await asyncio.gather(*(_post_batch_async(c) for c in _chunks(texts)))
+    return [r for chunk in chunk_results for r in chunk]
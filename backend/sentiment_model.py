@@ -3,57 +3,119 @@ Sentiment classification.
 
 Reads SENTIMENT_BACKEND from the environment (default: "openai").
   - "openai"  → OpenAI Chat Completions (requires OPENAI_API_KEY)
+  - "railway" / "ml_service" → Cardiff RoBERTa microservice over HTTP
+                (requires ML_SERVICE_URL; see sentiment_ml_service.py)
+  - "lexicon" → vectorized VADER-style scorer for bulk, zero-cost runs
+                (see sentiment_lexicon.py; bypasses the cache — it is faster)
   - anything else → TextBlob fallback (no API key needed)
+
+SENTIMENT_CASCADE ("lexicon" | "textblob") puts a cheap local scorer in front
+of OpenAI so only ambiguous texts are sent to the LLM.
+
+Results are memoised in a persistent content-addressed cache (see
+sentiment_cache.py), so repeated reviews, posts and sentences are only
+classified once per backend/model/prompt version.
+
+Async callers (the FastAPI handlers in main.py) should use classify_async /
+classify_batch_async. These share one AsyncOpenAI client and one process-wide
+semaphore, so the number of in-flight OpenAI requests never exceeds
+SENTIMENT_MAX_CONCURRENCY no matter how many HTTP requests overlap.
+
+Every OpenAI call, sync or async, goes through sentiment_scheduler: a shared
+RPM/TPM limiter plus retries that re-submit only the items a reply dropped.
 """
 
+import asyncio
 import json
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 from dotenv import load_dotenv
 
+import sentiment_cache
+import sentiment_scheduler
+
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
 _BACKEND = os.getenv("SENTIMENT_BACKEND", "openai").lower()
 _OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
-_OPENAI_BATCH_SIZE = 50  # texts per batch call — keeps prompt well under token limits
+_OPENAI_MODEL = "gpt-4o-mini"
+_MAX_CONCURRENCY = int(os.getenv("SENTIMENT_MAX_CONCURRENCY", "16"))  # in-flight batch calls
+_REQUEST_TIMEOUT = float(os.getenv("SENTIMENT_REQUEST_TIMEOUT", "60"))  # seconds per API call
+_MAX_ATTEMPTS    = int(os.getenv("SENTIMENT_MAX_ATTEMPTS", "5"))
+
+# ── Cascade mode ─────────────────────────────────────────────────────────────
+# With SENTIMENT_CASCADE set to "lexicon" or "textblob", every text is first
+# scored locally; only those with |compound| below the band are escalated to
+# OpenAI. Clearly positive/negative texts never cost an API call.
+_CASCADE      = os.getenv("SENTIMENT_CASCADE", "").lower()
+_CASCADE_BAND = float(os.getenv("SENTIMENT_CASCADE_BAND", "0.5"))
+
+# Shared by every thread and task in the process — see sentiment_scheduler.py
+_limiter = sentiment_scheduler.RateLimiter(
+    requests_per_minute=int(os.getenv("SENTIMENT_RPM", "500")),
+    tokens_per_minute=int(os.getenv("SENTIMENT_TPM", "200000")),
+)
+
+# ── Batch packing policy ─────────────────────────────────────────────────────
+# Batch calls are packed by estimated tokens rather than a fixed item count:
+# short sentences share one request, long reviews are no longer cut at 500 chars.
+_INPUT_TOKEN_BUDGET     = int(os.getenv("SENTIMENT_BATCH_INPUT_TOKENS", "8000"))   # prompt tokens per call
+_OUTPUT_TOKEN_BUDGET    = int(os.getenv("SENTIMENT_BATCH_OUTPUT_TOKENS", "4000"))  # completion tokens per call
+_MAX_TEXT_TOKENS        = int(os.getenv("SENTIMENT_MAX_TEXT_TOKENS", "512"))       # longer texts are truncated
+_CHARS_PER_TOKEN        = 4   # rough English average; good enough for budgeting
+_ITEM_OVERHEAD_TOKENS   = 4   # "123. " prefix + newline
+_OUTPUT_TOKENS_PER_ITEM = 24  # '{"i": 123, "label": "positive", "compound": 0.85},' with slack
+_OUTPUT_FRAME_TOKENS    = 50  # the reply's brackets, code fence and whitespace
+
+# Bump whenever a prompt, the text preparation or the label/score mapping
+# changes so cached results produced by the old prompt are no longer served.
+_PROMPT_VERSION = "4"
+
+_BATCH_SYSTEM_PROMPT = (
+    "You are a sentiment classifier. "
+    "You will receive a numbered list of texts. "
+    "For each, classify sentiment as positive, negative, or neutral, "
+    "and provide a compound score between -1.0 and 1.0. "
+    "Respond with a JSON array only, with one object per input, "
+    'where "i" is the number of the text it classifies. '
+    'Format: [{"i": <number>, "label": "positive"|"negative"|"neutral", "compound": <float>}, ...]'
+)
 
 _openai_client = None
+_async_openai_client = None
+_async_semaphore: asyncio.Semaphore | None = None
 
 
 def _get_openai_client():
     global _openai_client
     if _openai_client is None:
         from openai import OpenAI
-        _openai_client = OpenAI(api_key=_OPENAI_API_KEY)
+        # Retries are handled by sentiment_scheduler, not the SDK
+        _openai_client = OpenAI(api_key=_OPENAI_API_KEY, max_retries=0, timeout=_REQUEST_TIMEOUT)
     return _openai_client
 
 
-def _openai_classify(text: str) -> dict:
-    client = _get_openai_client()
+def _get_async_openai_client():
+    global _async_openai_client
+    if _async_openai_client is None:
+        from openai import AsyncOpenAI
+        _async_openai_client = AsyncOpenAI(api_key=_OPENAI_API_KEY, max_retries=0, timeout=_REQUEST_TIMEOUT)
+    return _async_openai_client
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent async OpenAI requests."""
+    global _async_semaphore
+    if _async_semaphore is None:
+        _async_semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+    return _async_semaphore
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a sentiment classifier. "
-                    "Classify the sentiment of the given text as exactly one of: "
-                    "positive, negative, or neutral. "
-                    "Also provide a compound score between -1.0 (most negative) and 1.0 (most positive). "
-                    "Respond with JSON only, in this exact format: "
-                    '{"label": "positive"|"negative"|"neutral", "compound": <float>}'
-                ),
-            },
-            {"role": "user", "content": text[:1800]},
-        ],
-        temperature=0,
-        response_format={"type": "json_object"},
-    )
 
-    data = json.loads(response.choices[0].message.content)
-    label = str(data.get("label", "neutral")).lower()
-    compound = float(data.get("compound", 0.0))
+def _to_result(label: str, compound: float) -> dict:
+    """Map a label + compound score onto the standard result dict."""
     compound = max(-1.0, min(1.0, compound))
 
     if label == "positive":
@@ -66,33 +128,70 @@ def _openai_classify(text: str) -> dict:
     return {"label": label, "score": round(score, 4), "compound": round(compound, 4)}
 
 
-def _openai_classify_batch_chunk(texts: list[str]) -> list[dict]:
-    """Classify a single chunk of texts in one OpenAI API call."""
-    client = _get_openai_client()
+def _estimate_tokens(text: str) -> int:
+    return max(1, -(-len(text) // _CHARS_PER_TOKEN))
 
-    numbered = "\n".join(f"{i+1}. {t[:500]}" for i, t in enumerate(texts))
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a sentiment classifier. "
-                    "You will receive a numbered list of texts. "
-                    "For each, classify sentiment as positive, negative, or neutral, "
-                    "and provide a compound score between -1.0 and 1.0. "
-                    "Respond with a JSON array only, with one object per input, in order. "
-                    'Format: [{"label": "positive"|"negative"|"neutral", "compound": <float>}, ...]'
-                ),
-            },
-            {"role": "user", "content": numbered},
-        ],
-        temperature=0,
-    )
 
-    raw = response.choices[0].message.content or "[]"
-    raw = raw.strip()
+def _prepare_text(text: str) -> str:
+    """Collapse whitespace (keeps one text per numbered line) and cap its length."""
+    return " ".join(text.split())[:_MAX_TEXT_TOKENS * _CHARS_PER_TOKEN]
+
+
+def _pack_batches(texts: list[str]) -> list[list[int]]:
+    """
+    Greedily group text indices, in order, so each batch call stays within the
+    input token budget and its expected reply within the output token budget.
+    Texts are expected to have been through _prepare_text already.
+    """
+    prompt_tokens = _estimate_tokens(_BATCH_SYSTEM_PROMPT)
+    max_items     = max(1, (_OUTPUT_TOKEN_BUDGET - _OUTPUT_FRAME_TOKENS) // _OUTPUT_TOKENS_PER_ITEM)
+
+    batches: list[list[int]] = []
+    current: list[int] = []
+    used = prompt_tokens
+    for i, text in enumerate(texts):
+        cost = _estimate_tokens(text) + _ITEM_OVERHEAD_TOKENS
+        if current and (used + cost > _INPUT_TOKEN_BUDGET or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], prompt_tokens
+        current.append(i)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_messages(texts: list[str]) -> list[dict]:
+    numbered = "\n".join(f"{i+1}. {t}" for i, t in enumerate(texts))
+    return [
+        {"role": "system", "content": _BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": numbered},
+    ]
+
+
+def _parse_item(item) -> dict | None:
+    """Validate one element of a batch reply; None if it is malformed."""
+    if not isinstance(item, dict):
+        return None
+    label = str(item.get("label", "")).lower()
+    if label not in ("positive", "negative", "neutral"):
+        return None
+    try:
+        compound = float(item.get("compound", 0.0))
+    except (TypeError, ValueError):
+        return None
+    return _to_result(label, compound)
+
+
+def _parse_batch_response(raw: str | None, n: int) -> list[dict | None]:
+    """
+    Parse a JSON-array batch reply into n results, matched to the numbered
+    texts by each item's "i" rather than by position, so a dropped or merged
+    item can't shift the results after it. Texts whose number is missing,
+    repeated or paired with a malformed item come back as None so only those
+    are re-submitted.
+    """
+    raw = (raw or "[]").strip()
     if raw.startswith("```"):
         raw = raw.split("```")[1]
         if raw.startswith("json"):
@@ -102,34 +201,112 @@ def _openai_classify_batch_chunk(texts: list[str]) -> list[dict]:
     try:
         items = json.loads(raw)
     except json.JSONDecodeError:
-        return [{"label": "neutral", "score": 0.0, "compound": 0.0}] * len(texts)
+        return [None] * n
+    if not isinstance(items, list):
+        return [None] * n
 
-    results = []
+    by_number: dict[int, list] = {}
     for item in items:
-        label = str(item.get("label", "neutral")).lower()
-        compound = float(item.get("compound", 0.0))
-        compound = max(-1.0, min(1.0, compound))
-        if label == "positive":
-            score = (compound + 1.0) / 2.0
-        elif label == "negative":
-            score = (1.0 - compound) / 2.0
-        else:
-            score = 1.0 - abs(compound) * 0.5
-        results.append({"label": label, "score": round(score, 4), "compound": round(compound, 4)})
+        number = item.get("i") if isinstance(item, dict) else None
+        if isinstance(number, int) and not isinstance(number, bool) and 1 <= number <= n:
+            by_number.setdefault(number, []).append(item)
+    return [
+        _parse_item(found[0]) if len(found := by_number.get(i + 1, [])) == 1 else None
+        for i in range(n)
+    ]
+
+
+def _placeholders(results: list[dict | None]) -> list[dict]:
+    """Substitute the neutral placeholder for items that never resolved."""
+    return [r if r is not None else {"label": "neutral", "score": 0.0, "compound": 0.0} for r in results]
+
+
+def _openai_classify_batch_chunk(texts: list[str]) -> list[dict]:
+    """
+    Classify a single chunk of texts in one OpenAI API call, retrying through
+    the shared scheduler and re-submitting only missing or malformed items.
+    """
+    client = _get_openai_client()
+    job = sentiment_scheduler.PartialBatch(texts, _limiter, _MAX_ATTEMPTS)
+
+    while job.pending:
+        sub = job.pending_texts()
+        time.sleep(_limiter.reserve(_call_tokens(sub)))
+        try:
+            response = client.chat.completions.create(
+                model=_OPENAI_MODEL,
+                messages=_batch_messages(sub),
+                temperature=0,
+                max_tokens=_batch_max_tokens(len(sub)),
+            )
+        except Exception as e:
+            time.sleep(job.failed(e))
+            continue
+        time.sleep(job.succeeded(_parse_batch_response(response.choices[0].message.content, len(sub))))
+
+    return _placeholders(job.results)
+
+
+def _batch_max_tokens(n: int) -> int:
+    return n * _OUTPUT_TOKENS_PER_ITEM + _OUTPUT_FRAME_TOKENS
+
+
+def _call_tokens(texts: list[str]) -> int:
+    """Tokens a batch call is charged against the TPM budget (prompt + max_tokens)."""
+    prompt = _estimate_tokens(_BATCH_SYSTEM_PROMPT) + sum(
+        _estimate_tokens(t) + _ITEM_OVERHEAD_TOKENS for t in texts
+    )
+    return prompt + _batch_max_tokens(len(texts))
 
-    while len(results) < len(texts):
-        results.append({"label": "neutral", "score": 0.0, "compound": 0.0})
 
-    return results[:len(texts)]
+def _packed_chunks(texts: list[str]) -> list[list[str]]:
+    prepared = [_prepare_text(t) for t in texts]
+    return [[prepared[i] for i in batch] for batch in _pack_batches(prepared)]
 
 
 def _openai_classify_batch(texts: list[str]) -> list[dict]:
-    """Classify texts in batched OpenAI API calls to stay within token limits."""
-    results = []
-    for i in range(0, len(texts), _OPENAI_BATCH_SIZE):
-        chunk = texts[i : i + _OPENAI_BATCH_SIZE]
-        results.extend(_openai_classify_batch_chunk(chunk))
-    return results
+    """Classify texts in token-budgeted OpenAI batch calls, run in parallel."""
+    chunks = _packed_chunks(texts)
+    if len(chunks) == 1:
+        return _openai_classify_batch_chunk(chunks[0])
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_CONCURRENCY)) as executor:
+        chunk_results = list(executor.map(_openai_classify_batch_chunk, chunks))
+    return [r for chunk in chunk_results for r in chunk]
+
+
+async def _openai_classify_batch_chunk_async(texts: list[str]) -> list[dict]:
+    """
+    Async counterpart of _openai_classify_batch_chunk. The semaphore is held
+    only while a request is in flight, never while backing off.
+    """
+    client = _get_async_openai_client()
+    job = sentiment_scheduler.PartialBatch(texts, _limiter, _MAX_ATTEMPTS)
+
+    while job.pending:
+        sub = job.pending_texts()
+        await asyncio.sleep(_limiter.reserve(_call_tokens(sub)))
+        try:
+            async with _get_async_semaphore():
+                response = await client.chat.completions.create(
+                    model=_OPENAI_MODEL,
+                    messages=_batch_messages(sub),
+                    temperature=0,
+                    max_tokens=_batch_max_tokens(len(sub)),
+                )
+        except Exception as e:
+            await asyncio.sleep(job.failed(e))
+            continue
+        await asyncio.sleep(job.succeeded(_parse_batch_response(response.choices[0].message.content, len(sub))))
+
+    return _placeholders(job.results)
+
+
+async def _openai_classify_batch_async(texts: list[str]) -> list[dict]:
+    """Classify all chunks concurrently; the semaphore bounds how many are in flight."""
+    chunks = _packed_chunks(texts)
+    chunk_results = await asyncio.gather(*(_openai_classify_batch_chunk_async(c) for c in chunks))
+    return [r for chunk in chunk_results for r in chunk]
 
 
 def _textblob_classify(text: str) -> dict:
@@ -154,6 +331,155 @@ def _textblob_classify(text: str) -> dict:
     return {"label": label, "score": round(score, 4), "compound": round(polarity, 4)}
 
 
+def _use_openai() -> bool:
+    return _BACKEND == "openai" and bool(_OPENAI_API_KEY)
+
+
+def _use_ml_service() -> bool:
+    return _BACKEND in ("railway", "ml_service") and bool(os.getenv("ML_SERVICE_URL"))
+
+
+def _backend_namespace() -> str:
+    """Identify the backend/model/prompt that results are produced by."""
+    if _BACKEND == "lexicon":
+        return "lexicon"
+    if _use_openai():
+        return f"openai:{_OPENAI_MODEL}:{_PROMPT_VERSION}"
+    if _use_ml_service():
+        import sentiment_ml_service
+        return f"ml_service:{sentiment_ml_service.ML_SERVICE_MODEL}"
+    return "textblob"
+
+
+def cache_namespace() -> str:
+    """
+    Identify everything that decides classify_batch's results: the backend,
+    plus the cascade's local scorer and band when one sits in front of it.
+    Callers that store whole result lists (transcript_cache) key them by this.
+    """
+    namespace = _backend_namespace()
+    if _cascade_enabled():
+        return f"{namespace}+cascade:{_CASCADE}:{_CASCADE_BAND}"
+    return namespace
+
+
+def is_placeholder(result: dict) -> bool:
+    """
+    True for the neutral filler returned when a batch response was missing or
+    unparseable. A genuine neutral result always scores >= 0.5, so these are
+    never mistaken for real classifications — and must never be cached.
+    """
+    return result["label"] == "neutral" and result["score"] == 0.0
+
+
+def _normalize(text: str) -> str:
+    """Whitespace-insensitive form used for cache keys and in-flight dedup."""
+    return " ".join(text.split())
+
+
+def _lookup_cached(texts: list[str]) -> tuple[list[dict], list[int], dict[int, str]]:
+    """
+    Resolve blank texts and cache hits.
+
+    Returns (results, misses, keys): results pre-filled for everything already
+    known, the indices that still need classifying, and their cache keys.
+    """
+    results: list[dict] = [{"label": "neutral", "score": 0.0, "compound": 0.0} for _ in texts]
+    pending = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not pending:
+        return results, [], {}
+
+    # Only the primary backend's results are cached per text, and they don't
+    # depend on the cascade in front of it.
+    namespace = _backend_namespace()
+    keys   = {i: sentiment_cache.make_key(_normalize(texts[i]), namespace) for i in pending}
+    cached = sentiment_cache.get_many(list(keys.values()))
+
+    misses = []
+    for i in pending:
+        if keys[i] in cached:
+            results[i] = cached[keys[i]]
+        else:
+            misses.append(i)
+    return results, misses, keys
+
+
+# ── Single-flight ────────────────────────────────────────────────────────────
+# Cache misses are claimed by key before being classified. A key already being
+# classified by another thread or task is awaited instead of re-sent, so
+# concurrent requests for the same subreddit/places (or a transcript repeating
+# "Yeah." hundreds of times) pay for each distinct text once. Futures are
+# concurrent.futures.Future so sync threads and async tasks can share them.
+
+_inflight: dict[str, Future] = {}
+_inflight_lock = Lock()
+
+
+def _claim(keys: list[str]) -> tuple[dict[str, Future], dict[str, Future]]:
+    """Split keys into (owned — caller must classify, waiting — someone else is)."""
+    owned: dict[str, Future] = {}
+    waiting: dict[str, Future] = {}
+    with _inflight_lock:
+        for key in keys:
+            if key in _inflight:
+                waiting[key] = _inflight[key]
+            else:
+                owned[key] = _inflight[key] = Future()
+    return owned, waiting
+
+
+def _publish(owned: dict[str, Future], fresh: list[dict]) -> None:
+    """Cache fresh results, then resolve the owned futures for any waiters."""
+    sentiment_cache.put_many({
+        key: result for key, result in zip(owned, fresh) if not is_placeholder(result)
+    })
+    with _inflight_lock:
+        for key in owned:
+            _inflight.pop(key, None)
+    for future, result in zip(owned.values(), fresh):
+        if not future.done():
+            future.set_result(result)
+
+
+def _abandon(owned: dict[str, Future], exc: BaseException) -> None:
+    """Fail owned futures that were never resolved so waiters do not hang."""
+    if not isinstance(exc, Exception):
+        exc = RuntimeError("in-flight classification was cancelled")
+    with _inflight_lock:
+        for key, future in owned.items():
+            if _inflight.get(key) is future:
+                del _inflight[key]
+    for future in owned.values():
+        if not future.done():
+            future.set_exception(exc)
+
+
+def _dedupe_misses(texts: list[str], misses: list[int], keys: dict[int, str]) -> dict[str, str]:
+    """One representative text per distinct key, in first-seen order."""
+    unique: dict[str, str] = {}
+    for i in misses:
+        unique.setdefault(keys[i], texts[i])
+    return unique
+
+
+def _classify_uncached(texts: list[str]) -> list[dict]:
+    if _use_openai():
+        return _openai_classify_batch(texts)
+    if _use_ml_service():
+        import sentiment_ml_service
+        return sentiment_ml_service.classify_batch(texts)
+    return [_textblob_classify(t) for t in texts]
+
+
+async def _classify_uncached_async(texts: list[str]) -> list[dict]:
+    if _use_openai():
+        return await _openai_classify_batch_async(texts)
+    if _use_ml_service():
+        import sentiment_ml_service
+        return await sentiment_ml_service.classify_batch_async(texts)
+    return await asyncio.to_thread(lambda: [_textblob_classify(t) for t in texts])
+
+
 def classify(text: str) -> dict:
     """
     Classify sentiment of a single text string.
@@ -165,29 +491,141 @@ def classify(text: str) -> dict:
             "compound": float,   # [-1, 1]
         }
     """
-    if not text or not text.strip():
-        return {"label": "neutral", "score": 0.0, "compound": 0.0}
+    return classify_batch([text])[0]
+
 
-    if _BACKEND == "openai" and _OPENAI_API_KEY:
-        return _openai_classify(text)
+def _record(stats: dict | None, **counts: int) -> None:
+    if stats is not None:
+        for name, value in counts.items():
+            stats[name] = stats.get(name, 0) + value
 
-    return _textblob_classify(text)
 
+def _cascade_enabled() -> bool:
+    return _CASCADE in ("lexicon", "textblob") and (_use_openai() or _use_ml_service())
 
-def classify_batch(texts: list[str]) -> list[dict]:
+
+def _local_classify(texts: list[str]) -> list[dict]:
+    """The cheap first-pass scorer used by cascade mode."""
+    if _CASCADE == "lexicon":
+        import sentiment_lexicon
+        return sentiment_lexicon.classify_batch(texts)
+    return [_textblob_classify(t) for t in texts]
+
+
+def _resolve_confident(results: list[dict], misses: list[int], local: list[dict]) -> list[int]:
+    """
+    Keep local results that fall outside the uncertainty band; return the
+    indices that are still ambiguous and must be escalated to the LLM.
+    """
+    escalate = []
+    for i, result in zip(misses, local):
+        if abs(result["compound"]) >= _CASCADE_BAND:
+            results[i] = result
+        else:
+            escalate.append(i)
+    return escalate
+
+
+def classify_batch(texts: list[str], stats: dict | None = None) -> list[dict]:
     """
     Classify sentiment for a list of texts.
 
-    Uses a single batched OpenAI API call when the OpenAI backend is active,
-    otherwise falls back to calling classify() on each text individually.
+    Cached results are served directly. In cascade mode the rest are scored
+    locally first and only texts inside the uncertainty band go on to the LLM.
+    Remaining texts are de-duplicated — within the batch and against
+    classifications already in flight elsewhere in the process — and each
+    distinct text is classified once, in batched OpenAI API calls when the
+    OpenAI backend is active, otherwise via TextBlob.
+
+    If a stats dict is passed, per-request counts are added to it:
+        total      non-blank texts
+        cached     served from the result cache
+        local      settled by the cascade's local scorer
+        escalated  sent on to the primary backend (the LLM)
 
     Returns a list of dicts in the same order as the input:
         [{"label": ..., "score": ..., "compound": ...}, ...]
     """
     if not texts:
         return []
+    if _BACKEND == "lexicon":
+        import sentiment_lexicon
+        _record(stats, total=len(texts), local=len(texts))
+        return sentiment_lexicon.classify_batch(texts)
+
+    results, misses, keys = _lookup_cached(texts)
+    n_cached = len(keys) - len(misses)
+    n_local  = 0
+    if misses and _cascade_enabled():
+        local    = _local_classify([texts[i] for i in misses])
+        escalate = _resolve_confident(results, misses, local)
+        n_local, misses = len(misses) - len(escalate), escalate
+    _record(stats, total=len(keys), cached=n_cached, local=n_local, escalated=len(misses))
+    if not misses:
+        return results
+
+    unique = _dedupe_misses(texts, misses, keys)
+    owned, waiting = _claim(list(unique))
+    try:
+        if owned:
+            _publish(owned, _classify_uncached([unique[k] for k in owned]))
+    except BaseException as e:
+        _abandon(owned, e)
+        raise
+
+    resolved = {key: future.result() for key, future in {**owned, **waiting}.items()}
+    for i in misses:
+        results[i] = resolved[keys[i]]
+    return results
 
-    if _BACKEND == "openai" and _OPENAI_API_KEY:
-        return _openai_classify_batch(texts)
 
-    return [_textblob_classify(t) if t and t.strip() else {"label": "neutral", "score": 0.0, "compound": 0.0} for t in texts]
+async def classify_async(text: str) -> dict:
+    """Async counterpart of classify(); same return contract."""
+    return (await classify_batch_async([text]))[0]
+
+
+async def classify_batch_async(texts: list[str], stats: dict | None = None) -> list[dict]:
+    """
+    Async counterpart of classify_batch(); same return contract, stats, cascade
+    and single-flight de-duplication.
+
+    All OpenAI chunks are issued concurrently from the event loop, bounded by
+    the process-wide semaphore rather than a per-caller thread pool. Cache
+    I/O and the TextBlob fallback run in worker threads so the loop is never
+    blocked.
+    """
+    if not texts:
+        return []
+    if _BACKEND == "lexicon":
+        import sentiment_lexicon
+        _record(stats, total=len(texts), local=len(texts))
+        return await asyncio.to_thread(sentiment_lexicon.classify_batch, texts)
+
+    results, misses, keys = await asyncio.to_thread(_lookup_cached, texts)
+    n_cached = len(keys) - len(misses)
+    n_local  = 0
+    if misses and _cascade_enabled():
+        local    = await asyncio.to_thread(_local_classify, [texts[i] for i in misses])
+        escalate = _resolve_confident(results, misses, local)
+        n_local, misses = len(misses) - len(escalate), escalate
+    _record(stats, total=len(keys), cached=n_cached, local=n_local, escalated=len(misses))
+    if not misses:
+        return results
+
+    unique = _dedupe_misses(texts, misses, keys)
+    owned, waiting = _claim(list(unique))
+    try:
+        if owned:
+            fresh = await _classify_uncached_async([unique[k] for k in owned])
+            await asyncio.to_thread(_publish, owned, fresh)
+    except BaseException as e:
+        _abandon(owned, e)
+        raise
+
+    resolved = {key: future.result() for key, future in owned.items()}
+    if waiting:
+        shared = await asyncio.gather(*(asyncio.wrap_future(f) for f in waiting.values()))
+        resolved.update(zip(waiting, shared))
+    for i in misses:
+        results[i] = resolved[keys[i]]
+    return results
@@ -0,0 +1,187 @@
+"""
+Sentiment scheduler: rate limiting and retries for OpenAI batch calls.
+
+One process-wide RateLimiter holds two token buckets — requests per minute and
+tokens per minute — shared by every sync thread and async task that calls the
+API. A 429's Retry-After pauses the limiter for everyone, not just the caller
+that hit it.
+
+PartialBatch tracks a single batch call across attempts: transient failures
+(429, 408/409, 5xx, timeouts, connection errors) back off with full jitter,
+and when a reply is missing or has malformed items only those items are
+re-submitted. Items still unresolved after the last attempt come back as None
+so the caller can substitute a placeholder.
+
+Point OPENAI_BASE_URL at a local fake server to exercise all of this without
+touching the real API.
+
+Environment:
+  SENTIMENT_RPM           request budget per minute   (default: 500)
+  SENTIMENT_TPM           token budget per minute     (default: 200000)
+  SENTIMENT_MAX_ATTEMPTS  attempts per batch call     (default: 5)
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+_BACKOFF_BASE = 1.0   # seconds; doubled per attempt
+_BACKOFF_CAP  = 30.0  # seconds
+
+_RETRIABLE_STATUS = {408, 409, 429}
+
+
+class RateLimiter:
+    """Paired RPM / TPM token buckets. Thread-safe; never blocks itself."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self._rpm = float(requests_per_minute)
+        self._tpm = float(tokens_per_minute)
+        self._requests = self._rpm
+        self._tokens   = self._tpm
+        self._updated  = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._requests = min(self._rpm, self._requests + elapsed * self._rpm / 60.0)
+        self._tokens   = min(self._tpm, self._tokens + elapsed * self._tpm / 60.0)
+        self._updated  = now
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Claim one request and `tokens` tokens. Returns how many seconds the
+        caller must wait before sending; the caller does the sleeping so the
+        same limiter serves threads (time.sleep) and tasks (asyncio.sleep).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # A single call larger than the whole budget would never fit — cap it.
+            tokens = min(float(tokens), self._tpm)
+            self._requests -= 1.0
+            self._tokens   -= tokens
+            wait = max(
+                -self._requests * 60.0 / self._rpm,
+                -self._tokens * 60.0 / self._tpm,
+                self._paused_until - now,
+                0.0,
+            )
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for `seconds` (server-supplied Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0.0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt))
+
+
+def retry_after(exc: Exception) -> float | None:
+    """Seconds requested by the server via Retry-After(-ms), if any."""
+    response = getattr(exc, "response", None)
+    headers  = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retriable(exc: Exception) -> bool:
+    """True for rate limits, server errors, timeouts and dropped connections."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in _RETRIABLE_STATUS or status >= 500
+
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import openai
+        return isinstance(exc, openai.APIConnectionError)  # includes APITimeoutError
+    except ImportError:
+        return False
+
+
+class PartialBatch:
+    """
+    Retry state for one batch of texts.
+
+    Typical loop:
+        job = PartialBatch(texts, limiter, max_attempts)
+        while job.pending:
+            sub = job.pending_texts()
+            sleep(limiter.reserve(cost(sub)))
+            try:
+                parsed = send(sub)          # list[dict | None], one per sub text
+            except Exception as e:
+                sleep(job.failed(e))        # re-raises if not retriable
+                continue
+            sleep(job.succeeded(parsed))
+        results = job.results
+    """
+
+    def __init__(self, texts: list[str], limiter: RateLimiter, max_attempts: int):
+        self.texts   = texts
+        self.results: list[dict | None] = [None] * len(texts)
+        self.pending = list(range(len(texts)))
+        self._limiter      = limiter
+        self._max_attempts = max_attempts
+        self._attempt      = 0
+
+    def pending_texts(self) -> list[str]:
+        return [self.texts[i] for i in self.pending]
+
+    def _next_attempt(self) -> bool:
+        self._attempt += 1
+        if self._attempt >= self._max_attempts:
+            print(f"  Warning: giving up on {len(self.pending)} text(s) after {self._attempt} attempts.")
+            self.pending = []
+            return False
+        return True
+
+    def succeeded(self, parsed: list[dict | None]) -> float:
+        """Record a reply; returns the delay before re-submitting any missing items."""
+        still_pending = []
+        for i, result in zip(self.pending, parsed):
+            if result is None:
+                still_pending.append(i)
+            else:
+                self.results[i] = result
+        self.pending = still_pending
+        if self.pending and self._next_attempt():
+            return backoff(self._attempt - 1)
+        return 0.0
+
+    def failed(self, exc: Exception) -> float:
+        """Record a failed call; returns the delay before retrying, or re-raises."""
+        if not is_retriable(exc):
+            raise exc
+        server_delay = retry_after(exc)
+        if not self._next_attempt():
+            return 0.0
+        if server_delay is not None:
+            self._limiter.pause(server_delay)
+            return server_delay + random.uniform(0.0, 0.25)
+        return backoff(self._attempt - 1)
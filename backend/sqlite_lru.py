@@ -0,0 +1,151 @@
+"""
+SQLite-backed key → text store with least-recently-used eviction, shared by
+sentiment_cache and transcript_cache.
+
+Each store is one table (key, value, [size,] last_used). Lookups bump a row's
+recency; writes evict the least-recently-used rows once the store's total
+goes over capacity. The total is the row count, or with sized=True the summed
+byte size of the stored values. It is read once when the connection opens and
+kept up to date by put_many, so writes never scan the table. Other processes
+sharing the file evict against their own running total.
+"""
+
+import sqlite3
+import time
+from threading import Lock
+
+_SQL_CHUNK = 500  # stay under SQLite's bound-parameter limit
+
+
+class SQLiteLRU:
+    def __init__(self, path: str, table: str, value_column: str, capacity: int, sized: bool = False):
+        self.path     = path
+        self.capacity = capacity
+        self.sized    = sized
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._table   = table
+        self._value   = value_column
+        self._size    = "size" if sized else "1"  # what a row counts against capacity
+        self._lock    = Lock()
+        self._db: sqlite3.Connection | None = None
+        self._total   = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return the shared connection, creating the table on first use."""
+        if self._db is None:
+            c = sqlite3.connect(self.path, check_same_thread=False)
+            c.execute("PRAGMA journal_mode=WAL")
+            c.execute("PRAGMA synchronous=NORMAL")
+            size_column = "size INTEGER NOT NULL," if self.sized else ""
+            c.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self._table} (
+                    key       TEXT PRIMARY KEY,
+                    {self._value} TEXT NOT NULL,
+                    {size_column}
+                    last_used REAL NOT NULL
+                )
+            """)
+            c.execute(f"CREATE INDEX IF NOT EXISTS idx_{self._table}_last_used ON {self._table} (last_used)")
+            c.commit()
+            self._total = c.execute(f"SELECT COALESCE(SUM({self._size}), 0) FROM {self._table}").fetchone()[0]
+            self._db = c
+        return self._db
+
+    def _select(self, c: sqlite3.Connection, columns: str, keys: list[str]):
+        """Rows for keys, in chunks of _SQL_CHUNK."""
+        for i in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[i:i + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            yield from c.execute(
+                f"SELECT key, {columns} FROM {self._table} WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Stored values for the keys that are present; bumps their recency."""
+        with self._lock:
+            c = self._conn()
+            found = dict(self._select(c, self._value, list(dict.fromkeys(keys))))
+            if found:
+                now = time.time()
+                c.executemany(
+                    f"UPDATE {self._table} SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in found],
+                )
+                c.commit()
+            self.counters["hits"]   += sum(1 for k in keys if k in found)
+            self.counters["misses"] += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items: dict[str, str]) -> None:
+        """Store values, then evict least-recently-used rows beyond capacity."""
+        now = time.time()
+        rows = {}
+        for key, value in items.items():
+            size = len(value.encode("utf-8")) if self.sized else 1
+            if size <= self.capacity:  # a value bigger than the whole store is not kept
+                rows[key] = (value, size)
+
+        with self._lock:
+            c = self._conn()
+            replaced = sum(size for _, size in self._select(c, self._size, list(rows)))
+            if self.sized:
+                c.executemany(
+                    f"INSERT OR REPLACE INTO {self._table} (key, {self._value}, size, last_used) VALUES (?, ?, ?, ?)",
+                    [(k, value, size, now) for k, (value, size) in rows.items()],
+                )
+            else:
+                c.executemany(
+                    f"INSERT OR REPLACE INTO {self._table} (key, {self._value}, last_used) VALUES (?, ?, ?)",
+                    [(k, value, now) for k, (value, _) in rows.items()],
+                )
+            self.counters["writes"] += len(rows)
+            self._total += sum(size for _, size in rows.values()) - replaced
+
+            excess = self._total - self.capacity
+            if excess > 0:
+                evict = []
+                for key, size in c.execute(
+                    f"SELECT key, {self._size} FROM {self._table} ORDER BY last_used ASC"
+                ):
+                    evict.append(key)
+                    excess      -= size
+                    self._total -= size
+                    if excess <= 0:
+                        break
+                c.executemany(f"DELETE FROM {self._table} WHERE key = ?", [(k,) for k in evict])
+                self.counters["evictions"] += len(evict)
+            c.commit()
+
+    def stats(self, read_db: bool = True) -> dict:
+        """Counters for this process plus the stored rows and their total."""
+        with self._lock:
+            entries, total = (
+                self._conn().execute(
+                    f"SELECT COUNT(*), COALESCE(SUM({self._size}), 0) FROM {self._table}"
+                ).fetchone()
+                if read_db else (0, 0)
+            )
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "entries":   entries,
+                "total":     total,
+                **self.counters,
+                "hit_ratio": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self, read_db: bool = True) -> None:
+        """Drop every stored row and reset the counters."""
+        with self._lock:
+            if read_db:
+                c = self._conn()
+                c.execute(f"DELETE FROM {self._table}")
+                c.commit()
+                self._total = 0
+            for k in self.counters:
+                self.counters[k] = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Same import layout as main.py: backend/ modules are top-level, and so is the
+# transcript pipeline.
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, "condensed_transcript_sentiment_analysis_pipeline"))
+
+# Keep the SQLite caches out of the source tree and plots off-screen.
+_tmp = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ["SENTIMENT_CACHE_PATH"]  = os.path.join(_tmp, "sentiment_cache.db")
+os.environ["TRANSCRIPT_CACHE_PATH"] = os.path.join(_tmp, "transcript_cache.db")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    import sentiment_cache
+    import transcript_cache
+    sentiment_cache.clear()
+    transcript_cache.clear()
+    yield
+
+
+@pytest.fixture
+def punkt(monkeypatch):
+    """
+    Sentence splitting without a download: the installed Punkt model if there
+    is one, otherwise an untrained Punkt tokenizer (splits on ". " and friends).
+    """
+    import nltk
+    import full_sentiment_analyzer_pipeline as pipeline
+
+    monkeypatch.setattr(pipeline, "_nltk_setup", lambda: None)
+    try:
+        tokenizer = pipeline._sentence_tokenizer()
+    except LookupError:
+        tokenizer = nltk.tokenize.PunktSentenceTokenizer()
+    monkeypatch.setattr(pipeline, "_punkt", tokenizer)
+    return tokenizer
+
+
+class FakeServer:
+    """
+    Scripted HTTP endpoint on localhost. Each POST pops the next reply from
+    self.replies — (status, headers, body) or a callable taking the parsed
+    JSON request and returning one — and is logged in self.requests as
+    (path, json, time) for assertions.
+    """
+
+    def __init__(self):
+        import json
+        import threading
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.replies: list = []
+        self.requests: list[tuple[str, dict, float]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                server.requests.append((self.path, body, time.monotonic()))
+                reply = server.replies.pop(0) if server.replies else (500, {}, {"error": "no reply scripted"})
+                status, headers, payload = reply(body) if callable(reply) else reply
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeServer()
+    yield server
+    server.close()
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    import analytics
+    analytics.DB_PATH = str(tmp_path_factory.mktemp("analytics") / "analytics.db")
+    import main
+    return main
+
+
+def _sentences() -> pd.DataFrame:
+    return pd.DataFrame({
+        "interviewee": ["Jane", "Jane"],
+        "role":        ["interviewee", "interviewee"],
+        "speaker":     ["Jane", "Jane"],
+        "line_number": [1, 2],
+        "sentence":    ["Canva is great.", "Figma is slow."],
+        "hf_label":    ["positive", "negative"],
+        "hf_score":    [0.9, 0.8],
+        "hf_compound": [0.9, -0.8],
+    })
+
+
+def test_stage_04_failure_is_reported_once(app, capsys):
+    broken = _sentences().drop(columns="sentence")
+    out = app._analyze_company(broken, "Canva", [], None)
+    assert [r["filename"] for r in out["results"]] == ["pipeline"]
+    assert out["overall_plot"] is None and out["word_stats"] == []
+    assert "[warning]" not in capsys.readouterr().out  # no follow-on AttributeError
+
+
+def test_plot_failure_keeps_results_and_is_logged(app, monkeypatch, capsys):
+    class Index:
+        def __init__(self, *args):
+            pass
+
+        def word_stats_by(self, column):
+            return {}
+
+        def word_stats(self):
+            raise ValueError("no words")
+
+    monkeypatch.setattr(app, "WordIndex", Index)
+    out = app._analyze_company(_sentences(), "Canva", ["figma"], None)
+    assert [r["interviewee"] for r in out["results"]] == ["Jane"]
+    assert out["overall_plot"] is None
+    assert "no words" in capsys.readouterr().out
+
+
+def test_non_streaming_parse_runs_off_the_event_loop(app, monkeypatch, punkt):
+    import asyncio
+    import io
+    import threading
+    from starlette.datastructures import UploadFile
+    import full_sentiment_analyzer_pipeline as pipeline
+    import sentiment_model
+
+    threads = []
+    parse = pipeline.IncrementalRun.parse
+
+    def recording_parse(self, workers=None):
+        threads.append(threading.current_thread())
+        return parse(self, workers)
+
+    monkeypatch.setattr(pipeline.IncrementalRun, "parse", recording_parse)
+    monkeypatch.setattr(sentiment_model, "_BACKEND", "lexicon")
+    upload = UploadFile(io.BytesIO(b"Jane Doe: Canva is great.\n"), filename="Jane_Doe.txt")
+
+    async def call():
+        return await app.analyze_transcripts(
+            files=[upload], company="Canva", companies="", other_services="", parse_workers=1, stream=False,
+        ), threading.current_thread()
+
+    _, loop_thread = asyncio.run(call())
+    assert threads and threads[0] is not loop_thread
@@ -0,0 +1,55 @@
+import re
+
+import pandas as pd
+import pytest
+
+from benchmarks import _same, _stage_04_reference, make_corpus
+from full_sentiment_analyzer_pipeline import DEFAULT_OTHER_SERVICES, MentionIndex, stage_04_separate_services
+
+# Names that start and end with a word character: token matching must agree
+# with the r"\bname\b" regexes it replaced on every sentence below.
+WORD_EDGED = ["Canva", "Monday.com", "Node.js", "AT&T", "google slides", "X"]
+SENTENCES = [
+    "I use Monday.com daily", "monday.company is different", "monday com", "MONDAY.COM!",
+    "Node.js rocks", "Node.jsx is not it", "node js",
+    "AT&T phones", "ATT phones", "Canva's editor", "canva-based", "CanvaPro", "my canva.",
+    "Google Slides, mostly", "googleslides", "X-ray", "Xbox", "", "C++ and C#",
+]
+
+
+def _mentions(names: list[str], sentences: list[str]) -> pd.DataFrame:
+    return MentionIndex(names).scan(pd.Series(sentences))
+
+
+def test_word_edged_names_match_like_the_regex():
+    got = _mentions(WORD_EDGED, SENTENCES)
+    for name in WORD_EDGED:
+        regex = re.compile(r"\b" + re.escape(name) + r"\b", re.IGNORECASE)
+        expected = [bool(regex.search(s)) for s in SENTENCES]
+        assert got[name].tolist() == expected, name
+
+
+@pytest.mark.parametrize("name, sentence, match", [
+    # Punctuation-edged names match as standalone words (the regex never did)
+    ("C++",    "We wrote it in C++ code", True),
+    ("C++",    "c++17 mostly",            True),
+    ("C++",    "abc++ is not a language", False),
+    ("C#",     "I prefer C# to Java",     True),
+    ("C#",     "C is not C#'s sibling",   True),
+    (".NET",   "a .NET stack",            True),
+    (".NET",   "the internet",            False),
+    # Whitespace between tokens is ignored
+    ("Final Cut Pro", "final  cut\tpro",   True),
+    ("AT&T",          "AT & T",            True),
+    ("Monday.com",    "Monday . com",      True),
+    ("Monday.com",    "Monday. Commute",   False),
+])
+def test_token_semantics(name, sentence, match):
+    assert _mentions([name], [sentence])[name].item() is match
+
+
+def test_stage_04_matches_the_regex_reference():
+    sentences = make_corpus(2000, 40, seed=2).rename(columns={"text": "sentence"})
+    expected = _stage_04_reference(sentences, "Canva", DEFAULT_OTHER_SERVICES)
+    got = stage_04_separate_services(sentences, "Canva", DEFAULT_OTHER_SERVICES)
+    assert all(_same(e, g) for e, g in zip(expected, got))
@@ -0,0 +1,105 @@
+"""
+The rewritten stages against the implementations they replaced: the
+streaming .docx reader against python-docx, and the vectorized stage_01 /
+stage_02 against benchmarks.py's row-by-row references.
+
+fixtures/Jordan_Lee.docx is a small interview with the awkward bits of
+WordprocessingML: runs split mid-sentence, tabs (w:tab), line and page breaks,
+a hyperlink, blank and whitespace-only paragraphs, a table (not body-level, so
+skipped) and non-ASCII punctuation.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from docx import Document
+
+import benchmarks
+import full_sentiment_analyzer_pipeline as pipeline
+from benchmarks import _same, _stage_01_reference, _stage_02_reference, make_corpus
+from full_sentiment_analyzer_pipeline import (
+    _combine_parsed,
+    _docx_fast_paragraphs,
+    _iter_docx,
+    _parse_file,
+    stage_01_tag_roles,
+    stage_02_sentence_level,
+)
+
+HERE    = os.path.dirname(os.path.abspath(__file__))
+FIXTURE = os.path.join(HERE, "fixtures", "Jordan_Lee.docx")
+DOCX_FILES = [FIXTURE] + [
+    path for path in [os.path.join(HERE, "..", "..", "YUCG_Analytics_Handbook.docx")] if os.path.exists(path)
+]
+
+
+def _python_docx_lines(path: str) -> list[str]:
+    """stage_00's original .docx reader."""
+    return [p.text.strip() for p in Document(path).paragraphs if p.text.strip()]
+
+
+@pytest.mark.parametrize("path", DOCX_FILES, ids=os.path.basename)
+def test_docx_fast_path_matches_python_docx(path):
+    assert _docx_fast_paragraphs(path) == [p.text for p in Document(path).paragraphs]
+    assert list(_iter_docx(path)) == _python_docx_lines(path)
+
+
+@pytest.mark.parametrize("source", ["path", "bytes", "file"])
+def test_docx_sources_parse_alike(source):
+    with open(FIXTURE, "rb") as f:
+        data = f.read()
+    arg = {"path": FIXTURE, "bytes": data, "file": open(FIXTURE, "rb")}[source]
+    try:
+        assert list(_iter_docx(arg)) == _python_docx_lines(FIXTURE)
+    finally:
+        if source == "file":
+            arg.close()
+
+
+def test_docx_falls_back_to_python_docx(monkeypatch):
+    def unreadable(source):
+        raise KeyError("word/document.xml")
+
+    monkeypatch.setattr(pipeline, "_docx_fast_paragraphs", unreadable)
+    assert list(_iter_docx(FIXTURE)) == _python_docx_lines(FIXTURE)
+
+
+def _fixture_frame() -> pd.DataFrame:
+    return _combine_parsed(["Jordan_Lee.docx"], [_parse_file("Jordan_Lee.docx", FIXTURE)], quiet=True)
+
+
+def _tie_frame() -> pd.DataFrame:
+    # A tie for most lines: value_counts' tie-break has to be reproduced
+    return pd.DataFrame({
+        "interviewee": ["Tie File"] * 4,
+        "line_number": [1, 2, 3, 4],
+        "speaker":     ["Ann", "Bob", "Bob", "Ann"],
+        "timestamp":   [""] * 4,
+        "text":        ["One.", "Two.", "Three.", "Four."],
+    })
+
+
+CORPORA = {
+    "fixture":   _fixture_frame,
+    "synthetic": lambda: make_corpus(3000, 120, seed=1).drop(columns="role"),
+    "tie":       _tie_frame,
+}
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_stage_01_matches_reference(corpus):
+    df = CORPORA[corpus]()
+    assert _same(_stage_01_reference(df), stage_01_tag_roles(df))
+
+
+@pytest.mark.parametrize("corpus", CORPORA)
+def test_stage_02_matches_reference(monkeypatch, punkt, corpus):
+    monkeypatch.setattr(benchmarks, "sent_tokenize", punkt.tokenize)
+    tagged = stage_01_tag_roles(CORPORA[corpus]())
+    sentences = stage_02_sentence_level(tagged)
+    assert _same(_stage_02_reference(tagged), sentences)
+    assert sentences.dtypes.astype(str).to_dict() == {
+        "interviewee": "category", "role": "category", "speaker": "category",
+        "line_number": str(tagged["line_number"].dtype), "sentence": "object",
+    }
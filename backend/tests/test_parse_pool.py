@@ -0,0 +1,39 @@
+import full_sentiment_analyzer_pipeline as pipeline
+
+
+def test_parse_workers_keep_pdf_pages_serial(monkeypatch):
+    """Page ranges get their own pool, except inside a stage_00 worker."""
+    pools = []
+
+    class Pool:
+        def __init__(self, max_workers, initializer=None):
+            pools.append(initializer)
+            self.initializer = initializer
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def map(self, fn, *iterables):
+            if self.initializer:
+                self.initializer()  # what each worker process runs first
+            return list(map(fn, *iterables))
+
+    monkeypatch.setattr(pipeline, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(pipeline, "_IN_PARSE_WORKER", False)
+    monkeypatch.setattr(pipeline, "PDF_MODE", "text")
+    monkeypatch.setattr(pipeline, "PDF_PARALLEL_PAGES", 4)
+    monkeypatch.setattr(pipeline.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(pipeline, "_pdf_page_count", lambda source: 8)
+    monkeypatch.setattr(pipeline, "_pdf_text_range",
+                        lambda args: [f"Jane: page {i}" for i in range(args[1], args[2])])
+
+    assert len(pipeline._pdf_text_layer(b"pdf")) == 8
+    assert pools == [None]
+
+    pools.clear()
+    parsed = pipeline._parse_columns(["a.pdf", "b.pdf"], [b"a", b"b"], workers=2)
+    assert pools == [pipeline._mark_parse_worker]
+    assert parsed[0]["text"] == [f"page {i}" for i in range(8)]
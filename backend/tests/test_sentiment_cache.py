@@ -0,0 +1,57 @@
+import pytest
+
+import sentiment_cache
+from sqlite_lru import SQLiteLRU
+
+RESULT = {"label": "positive", "score": 0.9, "compound": 0.9}
+
+
+@pytest.fixture
+def small_cache(monkeypatch, tmp_path):
+    """A fresh cache file holding at most 5 results."""
+    store = SQLiteLRU(str(tmp_path / "sentiment_cache.db"), table="results", value_column="result", capacity=5)
+    monkeypatch.setattr(sentiment_cache, "_store", store)
+    yield sentiment_cache
+    store.close()
+
+
+def _keys(cache) -> set[str]:
+    return {k for (k,) in cache._store._conn().execute("SELECT key FROM results")}
+
+
+def test_evicts_least_recently_used(small_cache):
+    for n in range(5):
+        small_cache.put_many({f"k{n}": RESULT})
+    small_cache.get_many(["k0"])  # touched: survives
+    small_cache.put_many({"k5": RESULT, "k6": RESULT})
+
+    assert _keys(small_cache) == {"k0", "k3", "k4", "k5", "k6"}
+    assert small_cache.stats()["evictions"] == 2
+
+
+def test_rewrites_do_not_count_as_new_entries(small_cache):
+    small_cache.put_many({f"k{n}": RESULT for n in range(5)})
+    for _ in range(3):
+        small_cache.put_many({"k1": RESULT, "k2": RESULT})
+
+    assert len(_keys(small_cache)) == 5
+    assert small_cache.stats()["evictions"] == 0
+
+
+def test_count_is_picked_up_from_an_existing_file(small_cache):
+    small_cache.put_many({f"k{n}": RESULT for n in range(4)})
+    small_cache._store.close()  # as after a restart
+
+    small_cache.put_many({"k4": RESULT, "k5": RESULT})
+    assert len(_keys(small_cache)) == 5
+
+
+def test_writes_do_not_scan_the_table(small_cache):
+    small_cache.put_many({"warm-up": RESULT})  # connect (counts once) first
+    statements: list[str] = []
+    small_cache._store._db.set_trace_callback(statements.append)
+    for n in range(10):
+        small_cache.put_many({f"k{n}": RESULT})
+
+    assert not [s for s in statements if "COUNT(" in s or "SUM(" in s]
+    assert len(_keys(small_cache)) == 5
@@ -0,0 +1,81 @@
+"""
+The scoring rules on a small hand-made lexicon, so expected compounds can be
+worked out by hand and don't move with the VADER lexicon's version.
+"""
+
+import math
+
+import pytest
+
+import sentiment_lexicon
+
+
+@pytest.fixture(autouse=True)
+def lexicon(monkeypatch):
+    for name in ("_vocab", "_valence", "_negator", "_booster", "_SEP_ID", "_BANG_ID", "_BUT_ID"):
+        monkeypatch.setattr(sentiment_lexicon, name, None, raising=False)  # restored afterwards
+    sentiment_lexicon._build({"good": 1.9, "bad": -2.5, "love": 3.2})
+
+
+def compound(valence_sum: float) -> float:
+    return round(valence_sum / math.sqrt(valence_sum ** 2 + 15), 4)
+
+
+def scores(*texts: str) -> list[float]:
+    return [r["compound"] for r in sentiment_lexicon.classify_batch(list(texts))]
+
+
+def test_plain_valence():
+    assert scores("good", "bad app", "love") == [compound(1.9), compound(-2.5), compound(3.2)]
+
+
+def test_negation_flips_and_damps():
+    assert scores("not good", "isn't bad", "never really good") == [
+        compound(1.9 * -0.74), compound(-2.5 * -0.74), compound((1.9 + 0.293) * -0.74),
+    ]
+
+
+def test_negators_beyond_three_tokens_do_not_count():
+    assert scores("not that it is good") == [compound(1.9)]
+
+
+def test_boosters_push_away_from_zero_with_decay():
+    assert scores("very good", "very bad", "very much good", "slightly good") == [
+        compound(1.9 + 0.293), compound(-2.5 - 0.293), compound(1.9 + 0.293 * 0.95), compound(1.9 - 0.293),
+    ]
+
+
+def test_but_shifts_weight_to_the_second_clause():
+    assert scores("good but bad", "bad but good but love") == [
+        compound(1.9 * 0.5 - 2.5 * 1.5), compound(-2.5 * 0.5 + (1.9 + 3.2) * 1.5),
+    ]
+
+
+def test_exclamation_marks_add_emphasis_up_to_four():
+    assert scores("good!!", "bad!", "good!!!!!!") == [
+        compound(1.9 + 2 * 0.292), compound(-2.5 - 0.292), compound(1.9 + 4 * 0.292),
+    ]
+
+
+def test_caps_emphasise_only_in_mixed_case_text():
+    assert scores("GOOD app", "so BAD", "GOOD APP", "Good app") == [
+        compound(1.9 + 0.733), compound(-2.5 - 0.733 - 0.293), compound(1.9), compound(1.9),
+    ]
+
+
+def test_texts_do_not_affect_each_other():
+    # A negator or "but" ending one text doesn't reach into the next
+    assert scores("not", "good", "but", "good") == [0.0, compound(1.9), 0.0, compound(1.9)]
+
+
+def test_labels_and_scores():
+    good, bad, neutral = sentiment_lexicon.classify_batch(["good", "bad", "the app"])
+    assert (good["label"], good["score"]) == ("positive", round((compound(1.9) + 1) / 2, 4))
+    assert (bad["label"], bad["score"]) == ("negative", round((1 - compound(-2.5)) / 2, 4))
+    assert neutral == {"label": "neutral", "score": 1.0, "compound": 0.0}
+
+
+def test_blank_texts_get_the_neutral_placeholder():
+    assert sentiment_lexicon.classify_batch([]) == []
+    placeholder = {"label": "neutral", "score": 0.0, "compound": 0.0}
+    assert sentiment_lexicon.classify_batch(["", "  \n", "good"])[:2] == [placeholder, placeholder]
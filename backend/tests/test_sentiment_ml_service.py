@@ -0,0 +1,110 @@
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+import sentiment_ml_service
+import sentiment_scheduler
+
+
+def echo(request: dict) -> tuple[int, dict, dict]:
+    """An /analyze reply scoring each text by its length, so order is checkable."""
+    return 200, {}, {"results": [
+        {"label": "positive", "score": 0.9, "compound": len(t) / 100} for t in request["texts"]
+    ]}
+
+
+def error(status: int, headers: dict | None = None) -> tuple[int, dict, dict]:
+    return status, headers or {}, {"error": f"HTTP {status}"}
+
+
+def _point_at(monkeypatch, url: str) -> None:
+    monkeypatch.setattr(sentiment_ml_service, "ML_SERVICE_URL", url)
+    monkeypatch.setattr(sentiment_ml_service, "_client", None)
+    monkeypatch.setattr(sentiment_ml_service, "_async_client", None)
+    monkeypatch.setattr(sentiment_ml_service, "_async_semaphore", None)
+    monkeypatch.setattr(sentiment_ml_service, "_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(sentiment_ml_service, "_TIMEOUT", 5.0)
+    monkeypatch.setattr(sentiment_scheduler, "_BACKOFF_BASE", 0.01)
+
+
+@pytest.fixture
+def ml_service(fake_server, monkeypatch):
+    """sentiment_ml_service pointed at fake_server, with fast backoff."""
+    _point_at(monkeypatch, fake_server.url)
+    return fake_server
+
+
+def test_transient_errors_are_retried(ml_service):
+    ml_service.replies = [error(503), error(500), echo]
+    results = sentiment_ml_service.classify_batch(["abc"])
+
+    assert results == [{"label": "positive", "score": 0.9, "compound": 0.03}]
+    assert [path for path, _, _ in ml_service.requests] == ["/analyze"] * 3
+
+
+@pytest.mark.parametrize("headers", [{"Retry-After": "0.3"}, {"retry-after-ms": "300"}])
+def test_429_waits_for_retry_after(ml_service, headers):
+    ml_service.replies = [error(429, headers), echo]
+    sentiment_ml_service.classify_batch(["abc"])
+
+    (_, _, first), (_, _, second) = ml_service.requests
+    assert second - first >= 0.3
+
+
+def test_gives_up_after_max_attempts(ml_service):
+    ml_service.replies = [error(500)] * 3
+    with pytest.raises(httpx.HTTPStatusError):
+        sentiment_ml_service.classify_batch(["abc"])
+    assert len(ml_service.requests) == 3
+
+
+def test_client_errors_are_not_retried(ml_service):
+    ml_service.replies = [error(400)]
+    with pytest.raises(httpx.HTTPStatusError):
+        sentiment_ml_service.classify_batch(["abc"])
+    assert len(ml_service.requests) == 1
+
+
+def test_result_count_mismatch_is_an_error(ml_service):
+    # A reply that doesn't line up with the texts can't be attributed to them;
+    # it's a service bug, not a transient failure, so it isn't retried either.
+    ml_service.replies = [(200, {}, {"results": [{"label": "positive", "score": 0.9, "compound": 0.9}]})]
+    with pytest.raises(RuntimeError, match="1 results for 2 texts"):
+        sentiment_ml_service.classify_batch(["a", "b"])
+    assert len(ml_service.requests) == 1
+
+
+def test_connection_errors_are_retried(monkeypatch):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # nothing listens here once the socket closes
+    _point_at(monkeypatch, f"http://127.0.0.1:{port}")
+    attempts = []
+    backoff = sentiment_scheduler.backoff
+    monkeypatch.setattr(sentiment_scheduler, "backoff", lambda attempt: attempts.append(attempt) or backoff(attempt))
+
+    with pytest.raises(httpx.ConnectError):
+        sentiment_ml_service.classify_batch(["abc"])
+    assert attempts == [0, 1]
+
+
+def test_batches_keep_input_order(ml_service, monkeypatch):
+    monkeypatch.setattr(sentiment_ml_service, "_BATCH_SIZE", 2)
+    texts = ["a" * n for n in range(1, 8)]
+    ml_service.replies = [echo] * 4
+
+    results = sentiment_ml_service.classify_batch(texts)
+    assert [r["compound"] for r in results] == [len(t) / 100 for t in texts]
+    assert sorted(len(body["texts"]) for _, body, _ in ml_service.requests) == [1, 2, 2, 2]
+
+
+def test_async_retries_and_keeps_order(ml_service, monkeypatch):
+    monkeypatch.setattr(sentiment_ml_service, "_BATCH_SIZE", 2)
+    texts = ["a" * n for n in range(1, 6)]
+    ml_service.replies = [error(503), echo, echo, echo]
+
+    results = asyncio.run(sentiment_ml_service.classify_batch_async(texts))
+    assert [r["compound"] for r in results] == [len(t) / 100 for t in texts]
+    assert len(ml_service.requests) == 4
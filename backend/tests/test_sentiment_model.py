@@ -0,0 +1,212 @@
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+
+import sentiment_cache
+import sentiment_model
+
+RESULT = {"label": "positive", "score": 0.9, "compound": 0.8}
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Switch sentiment_model's env-derived settings for one test."""
+    def use(name, cascade="", band=0.5):
+        monkeypatch.setattr(sentiment_model, "_BACKEND", name)
+        monkeypatch.setattr(sentiment_model, "_OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(sentiment_model, "_CASCADE", cascade)
+        monkeypatch.setattr(sentiment_model, "_CASCADE_BAND", band)
+    return use
+
+
+def test_namespace_tells_lexicon_from_textblob(backend):
+    backend("lexicon")
+    lexicon = sentiment_model.cache_namespace()
+    backend("textblob")
+    assert lexicon != sentiment_model.cache_namespace()
+
+
+def test_namespace_covers_cascade_mode_and_band(backend):
+    seen = set()
+    for cascade, band in [("", 0.5), ("lexicon", 0.5), ("textblob", 0.5), ("lexicon", 0.3)]:
+        backend("openai", cascade, band)
+        seen.add(sentiment_model.cache_namespace())
+    assert len(seen) == 4
+
+
+def test_cascade_is_ignored_without_a_primary_backend(backend):
+    backend("textblob", "lexicon", 0.3)
+    assert sentiment_model.cache_namespace() == "textblob"
+
+
+def test_per_text_cache_is_shared_across_cascade_settings(backend):
+    # Only the primary backend's results are cached per text; they're valid
+    # whatever cascade sits in front of it.
+    backend("openai")
+    plain = sentiment_model._backend_namespace()
+    backend("openai", "lexicon", 0.3)
+    assert sentiment_model._backend_namespace() == plain
+
+
+@pytest.fixture
+def single_flight(backend, monkeypatch):
+    """
+    Count backend calls and _claim()s; the backend holds its first call until
+    a second caller has claimed its texts, so the two always overlap.
+    """
+    backend("textblob")
+    calls, claims = [], []
+    claim = sentiment_model._claim
+    monkeypatch.setattr(sentiment_model, "_claim", lambda keys: claims.append(keys) or claim(keys))
+
+    def classify(texts):
+        calls.append(texts)
+        while len(claims) < 2:
+            time.sleep(0.01)
+        if texts[0] == "boom":
+            raise RuntimeError("backend down")
+        return [RESULT for _ in texts]
+
+    async def classify_async(texts):
+        calls.append(texts)
+        while len(claims) < 2:
+            await asyncio.sleep(0.01)
+        return [RESULT for _ in texts]
+
+    monkeypatch.setattr(sentiment_model, "_classify_uncached", classify)
+    monkeypatch.setattr(sentiment_model, "_classify_uncached_async", classify_async)
+    return calls
+
+
+def _concurrently(fn, *args) -> list:
+    """Run fn(*args) on two threads at once; their results or exceptions."""
+    out = [None, None]
+
+    def run(n):
+        try:
+            out[n] = fn(*args)
+        except Exception as e:
+            out[n] = e
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    return out
+
+
+def test_concurrent_identical_texts_are_classified_once(single_flight):
+    out = _concurrently(sentiment_model.classify_batch, ["Great app.", "Great  app."])
+    assert out == [[RESULT, RESULT], [RESULT, RESULT]]
+    assert single_flight == [["Great app."]]
+    assert not sentiment_model._inflight
+
+
+def test_concurrent_identical_texts_are_classified_once_async(single_flight):
+    async def both():
+        return await asyncio.gather(*(sentiment_model.classify_batch_async(["Slow sync."]) for _ in range(2)))
+
+    assert asyncio.run(both()) == [[RESULT], [RESULT]]
+    assert single_flight == [["Slow sync."]]
+    assert not sentiment_model._inflight
+
+
+def test_owner_failure_reaches_waiters_and_clears_the_claim(single_flight):
+    out = _concurrently(sentiment_model.classify_batch, ["boom"])
+    assert [str(e) for e in out] == ["backend down", "backend down"]
+    assert single_flight == [["boom"]]
+    assert not sentiment_model._inflight
+
+
+LOCAL = {"Love it.": 0.9, "Hate it.": -0.7, "Right at the band.": 0.5, "It's fine.": 0.1, "Meh.": -0.49}
+
+
+@pytest.fixture
+def cascade(backend, monkeypatch):
+    """OpenAI behind a lexicon cascade (band 0.5), both replaced by recorders."""
+    backend("openai", "lexicon", 0.5)
+    escalated = []
+
+    def local(texts):
+        return [{"label": "neutral", "score": 0.5, "compound": LOCAL[t]} for t in texts]
+
+    def llm(texts):
+        escalated.extend(texts)
+        return [RESULT for _ in texts]
+
+    async def llm_async(texts):
+        return llm(texts)
+
+    monkeypatch.setattr(sentiment_model, "_local_classify", local)
+    monkeypatch.setattr(sentiment_model, "_classify_uncached", llm)
+    monkeypatch.setattr(sentiment_model, "_classify_uncached_async", llm_async)
+    return escalated
+
+
+@pytest.mark.parametrize("run", [
+    sentiment_model.classify_batch,
+    lambda texts, stats: asyncio.run(sentiment_model.classify_batch_async(texts, stats)),
+], ids=["sync", "async"])
+def test_cascade_escalates_only_the_uncertainty_band(cascade, run):
+    texts = list(LOCAL)
+    stats: dict = {}
+    results = run(texts, stats)
+
+    assert cascade == ["It's fine.", "Meh."]
+    assert [r["compound"] for r in results] == [0.9, -0.7, 0.5, 0.8, 0.8]
+    assert stats == {"total": 5, "cached": 0, "local": 3, "escalated": 2}
+
+    # Only the LLM's answers are cached per text
+    namespace = sentiment_model._backend_namespace()
+    keys = {sentiment_cache.make_key(t, namespace): t for t in texts}
+    assert sorted(keys[k] for k in sentiment_cache.get_many(list(keys))) == ["It's fine.", "Meh."]
+
+    stats.clear()
+    assert run(texts, stats) == results
+    assert cascade == ["It's fine.", "Meh."]
+    assert stats == {"total": 5, "cached": 2, "local": 3, "escalated": 0}
+
+
+def _texts(n: int, seed: int = 0) -> list[str]:
+    """n prepared texts from a few words to past the truncation limit."""
+    rng = random.Random(seed)
+    words = "the export is slow but support was quick and helpful".split()
+    return [
+        sentiment_model._prepare_text(" ".join(rng.choices(words, k=rng.choice([1, 5, 40, 300, 800]))))
+        for _ in range(n)
+    ]
+
+
+def _check_packing(texts: list[str]) -> list[list[int]]:
+    batches = sentiment_model._pack_batches(texts)
+    assert [i for batch in batches for i in batch] == list(range(len(texts)))
+    prompt = sentiment_model._estimate_tokens(sentiment_model._BATCH_SYSTEM_PROMPT)
+    for batch in batches:
+        used = prompt + sum(
+            sentiment_model._estimate_tokens(texts[i]) + sentiment_model._ITEM_OVERHEAD_TOKENS for i in batch
+        )
+        assert used <= sentiment_model._INPUT_TOKEN_BUDGET or len(batch) == 1
+        assert sentiment_model._batch_max_tokens(len(batch)) <= sentiment_model._OUTPUT_TOKEN_BUDGET
+    return batches
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_packed_batches_keep_order_and_budgets(monkeypatch, seed):
+    monkeypatch.setattr(sentiment_model, "_INPUT_TOKEN_BUDGET", 2000)
+    monkeypatch.setattr(sentiment_model, "_OUTPUT_TOKEN_BUDGET", 500)
+    assert len(_check_packing(_texts(300, seed))) > 1
+
+
+def test_many_short_texts_fill_but_do_not_overrun_the_output_budget():
+    batches = _check_packing(["Yes."] * 1000)
+    assert len(batches[0]) == (sentiment_model._OUTPUT_TOKEN_BUDGET - sentiment_model._OUTPUT_FRAME_TOKENS) \
+        // sentiment_model._OUTPUT_TOKENS_PER_ITEM
+
+
+def test_a_text_over_the_input_budget_gets_a_batch_of_its_own(monkeypatch):
+    monkeypatch.setattr(sentiment_model, "_INPUT_TOKEN_BUDGET", 100)
+    assert sentiment_model._pack_batches(["short", "x" * 2000, "short"]) == [[0], [1], [2]]
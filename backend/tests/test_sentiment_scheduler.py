@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+openai = pytest.importorskip("openai")
+
+import sentiment_model
+import sentiment_scheduler
+from sentiment_scheduler import RateLimiter, retry_after
+
+
+def completion(items: list) -> tuple[int, dict, dict]:
+    """
+    A chat.completions reply whose content is the JSON array items. Items
+    without an "i" are numbered by position.
+    """
+    items = [{"i": n, **item} for n, item in enumerate(items, 1)]
+    return 200, {}, {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{
+            "index": 0, "finish_reason": "stop",
+            "message": {"role": "assistant", "content": json.dumps(items)},
+        }],
+    }
+
+
+def error(status: int, headers: dict | None = None) -> tuple[int, dict, dict]:
+    return status, headers or {}, {"error": {"message": f"HTTP {status}", "type": "test"}}
+
+
+def numbered(request: dict) -> list[str]:
+    """The texts a batch call sent, without their "n. " prefixes."""
+    return [line.split(". ", 1)[1] for line in request["messages"][1]["content"].splitlines()]
+
+
+@pytest.fixture
+def openai_api(fake_server, monkeypatch):
+    """sentiment_model's OpenAI calls pointed at fake_server, with fast backoff."""
+    monkeypatch.setenv("OPENAI_BASE_URL", fake_server.url + "/v1")
+    monkeypatch.setattr(sentiment_model, "_OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(sentiment_model, "_openai_client", None)
+    monkeypatch.setattr(sentiment_model, "_async_openai_client", None)
+    monkeypatch.setattr(sentiment_model, "_async_semaphore", None)
+    monkeypatch.setattr(sentiment_model, "_MAX_ATTEMPTS", 4)
+    monkeypatch.setattr(sentiment_model, "_limiter", RateLimiter(60_000, 10**9))
+    monkeypatch.setattr(sentiment_scheduler, "_BACKOFF_BASE", 0.01)
+    return fake_server
+
+
+POSITIVE = {"label": "positive", "compound": 0.8}
+NEGATIVE = {"label": "negative", "compound": -0.6}
+
+
+@pytest.mark.parametrize("headers, delay", [
+    ({"Retry-After": "0.3"}, 0.3),
+    ({"retry-after-ms": "300"}, 0.3),
+])
+def test_429_waits_for_retry_after(openai_api, headers, delay):
+    openai_api.replies = [error(429, headers), completion([POSITIVE, NEGATIVE])]
+    results = sentiment_model._openai_classify_batch_chunk(["good", "bad"])
+
+    assert [r["label"] for r in results] == ["positive", "negative"]
+    (_, _, first), (_, _, second) = openai_api.requests
+    assert second - first >= delay
+
+
+def test_retry_after_pauses_every_caller(openai_api):
+    openai_api.replies = [error(429, {"Retry-After": "0.5"}), completion([POSITIVE]), completion([POSITIVE])]
+    first = threading.Thread(target=sentiment_model._openai_classify_batch_chunk, args=(["a"],))
+    first.start()
+    while not openai_api.requests:
+        time.sleep(0.01)
+    time.sleep(0.05)  # the 429 has been handled and the limiter paused
+    sentiment_model._openai_classify_batch_chunk(["b"])  # a second caller, never rate limited itself
+    first.join()
+
+    rate_limited_at = openai_api.requests[0][2]
+    assert len(openai_api.requests) == 3
+    assert all(at - rate_limited_at >= 0.5 for _, _, at in openai_api.requests[1:])
+
+
+@pytest.mark.parametrize("status", [500, 503, 408])
+def test_transient_errors_are_retried(openai_api, status):
+    openai_api.replies = [error(status), completion([POSITIVE])]
+    assert sentiment_model._openai_classify_batch_chunk(["good"])[0]["label"] == "positive"
+    assert len(openai_api.requests) == 2
+
+
+def test_only_missing_items_are_resubmitted(openai_api):
+    openai_api.replies = [
+        completion([POSITIVE, {"label": "ecstatic"}]),  # 2nd malformed, 3rd missing
+        completion([NEGATIVE, POSITIVE]),
+    ]
+    results = sentiment_model._openai_classify_batch_chunk(["a", "b", "c"])
+
+    assert [r["label"] for r in results] == ["positive", "negative", "positive"]
+    assert [numbered(body) for _, body, _ in openai_api.requests] == [["a", "b", "c"], ["b", "c"]]
+
+
+def test_results_are_matched_by_number_not_position(openai_api):
+    openai_api.replies = [
+        # 2nd dropped, 3rd answered twice, 4th out of order, 9 out of range
+        completion([
+            {"i": 4, **NEGATIVE}, {"i": 1, **POSITIVE},
+            {"i": 3, **POSITIVE}, {"i": 3, **NEGATIVE}, {"i": 9, **POSITIVE},
+        ]),
+        completion([NEGATIVE, POSITIVE]),
+    ]
+    results = sentiment_model._openai_classify_batch_chunk(["a", "b", "c", "d"])
+
+    assert [r["label"] for r in results] == ["positive", "negative", "positive", "negative"]
+    assert [numbered(body) for _, body, _ in openai_api.requests] == [["a", "b", "c", "d"], ["b", "c"]]
+
+
+def test_client_errors_are_not_retried(openai_api):
+    openai_api.replies = [error(400)]
+    with pytest.raises(openai.BadRequestError):
+        sentiment_model._openai_classify_batch_chunk(["good"])
+    assert len(openai_api.requests) == 1
+
+
+def test_gives_up_with_placeholders(openai_api):
+    openai_api.replies = [error(500)] * 4
+    results = sentiment_model._openai_classify_batch_chunk(["a", "b"])
+
+    assert len(openai_api.requests) == 4
+    assert all(sentiment_model.is_placeholder(r) for r in results)
+
+
+def test_async_calls_share_the_retry_policy(openai_api):
+    openai_api.replies = [
+        error(429, {"Retry-After": "0.2"}),
+        completion([POSITIVE]),  # 2nd item missing: re-submitted alone
+        completion([NEGATIVE]),
+    ]
+    results = asyncio.run(sentiment_model._openai_classify_batch_chunk_async(["a", "b"]))
+
+    assert [r["label"] for r in results] == ["positive", "negative"]
+    assert [numbered(body) for _, body, _ in openai_api.requests] == [["a", "b"], ["a", "b"], ["b"]]
+    assert openai_api.requests[1][2] - openai_api.requests[0][2] >= 0.2
+
+
+def test_retry_after_http_date():
+    class Error(Exception):
+        class response:
+            headers = {"retry-after": formatdate(time.time() + 30, usegmt=True)}
+
+    assert 25 < retry_after(Error()) <= 30
+
+
+def test_limiter_waits_once_the_budget_is_spent():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10**9)
+    waits = [limiter.reserve(1) for _ in range(61)]
+    assert max(waits[:60]) == 0.0
+    assert 0.9 < waits[60] <= 1.0  # one request per second once the bucket is empty
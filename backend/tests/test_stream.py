@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pandas.testing as pdt
+import pytest
+
+import transcript_cache
+import full_sentiment_analyzer_pipeline as pipeline
+from full_sentiment_analyzer_pipeline import IncrementalRun, stage_01_tag_roles
+
+UPLOADS = [
+    (f"Person_{n}.txt", f"Interviewer: Question {n}? Go on.\nPerson {n}: Answer {n}. It was fine.\n".encode())
+    for n in range(8)
+] + [("Empty.txt", b"")]
+
+
+def _positive(texts, stats=None):
+    return [{"label": "positive", "score": 0.9, "compound": 0.9} for _ in texts]
+
+
+class SlowBackend:
+    """classify_batch stand-in that takes a while and logs what overlapped with what."""
+
+    def __init__(self, delay: float):
+        self.delay   = delay
+        self.lock    = threading.Lock()
+        self.running = 0
+        self.peak    = 0
+        self.started: list[float] = []
+        self.texts   = 0
+
+    def __call__(self, texts, stats=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.started.append(time.perf_counter())
+            self.texts += len(texts)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        if stats is not None:
+            stats["total"] = stats.get("total", 0) + len(texts)
+        return _positive(texts)
+
+
+def test_stream_matches_staged_run(monkeypatch, punkt):
+    monkeypatch.setattr(pipeline, "classify_batch", _positive)
+    staged = IncrementalRun.from_uploads(UPLOADS)
+    combined = stage_01_tag_roles(staged.parse(workers=1))
+    sentences = staged.split(combined)
+    sentiment = staged.classify(sentences)
+
+    transcript_cache.clear()
+    frames = IncrementalRun.from_uploads(UPLOADS).stream(workers=1, batch_size=3, in_flight=3)
+    for expected, got in zip((combined, sentences, sentiment), frames):
+        pdt.assert_frame_equal(expected, got)
+
+
+def test_classify_overlaps_parsing_and_itself(monkeypatch, punkt):
+    backend = SlowBackend(delay=0.2)
+    monkeypatch.setattr(pipeline, "classify_batch", backend)
+    parse_file = pipeline._parse_file
+    parsed: list[float] = []
+
+    def slow_parse(fname, source):
+        time.sleep(0.05)
+        parsed.append(time.perf_counter())
+        return parse_file(fname, source)
+
+    monkeypatch.setattr(pipeline, "_parse_file", slow_parse)
+    stats: dict = {}
+    start = time.perf_counter()
+    IncrementalRun.from_uploads(UPLOADS).stream(workers=1, stats=stats, batch_size=1, in_flight=4)
+    elapsed = time.perf_counter() - start
+
+    assert backend.started[0] < parsed[-1]  # classification starts before parsing ends
+    assert backend.peak > 1                 # and several batches are in flight at once
+    assert len(backend.started) == len(UPLOADS)
+    assert stats["total"] == backend.texts  # every batch's stats merged
+    assert elapsed < len(UPLOADS) * backend.delay
+
+
+def test_stream_surfaces_classify_errors(monkeypatch, punkt):
+    def broken(texts, stats=None):
+        raise RuntimeError("backend down")
+
+    monkeypatch.setattr(pipeline, "classify_batch", broken)
+    with pytest.raises(RuntimeError, match="backend down"):
+        IncrementalRun.from_uploads(UPLOADS).stream(workers=1, batch_size=1, in_flight=2)
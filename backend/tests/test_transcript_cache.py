@@ -0,0 +1,133 @@
+import pytest
+
+import sentiment_model
+import transcript_cache
+from sqlite_lru import SQLiteLRU
+import full_sentiment_analyzer_pipeline as pipeline
+from full_sentiment_analyzer_pipeline import IncrementalRun, stage_01_tag_roles
+
+TRANSCRIPT = (
+    b"Interviewer: How do you find the editor? Tell me more.\n"
+    b"Jane Doe: I love it. The export is slow though.\n"
+    b"Jane Doe: Mostly it just works.\n"
+)
+
+
+def test_entries_round_trip_as_json():
+    entry = {"columns": {"text": ["a", "b"], "timestamp": [None, "0:01"]}, "pos": [0, 1], "sentences": ["a", "b"]}
+    key = transcript_cache.make_key(b"bytes", "ns")
+    transcript_cache.put_many({key: entry})
+    assert transcript_cache.get_many([key]) == {key: entry}
+
+
+def test_non_json_entries_are_rejected():
+    with pytest.raises(TypeError):
+        transcript_cache.put_many({"k": {"payload": object()}})
+
+
+@pytest.fixture
+def small_cache(monkeypatch, tmp_path):
+    """A fresh cache file holding at most 100 bytes of payloads."""
+    store = SQLiteLRU(str(tmp_path / "transcript_cache.db"), table="files", value_column="payload",
+                      capacity=100, sized=True)
+    monkeypatch.setattr(transcript_cache, "_store", store)
+    yield transcript_cache
+    store.close()
+
+
+def _entry(n: int) -> dict:
+    """An entry whose JSON payload is exactly 30 bytes."""
+    return {"text": str(n) * 19}
+
+
+def _keys(cache) -> set[str]:
+    return {k for (k,) in cache._store._conn().execute("SELECT key FROM files")}
+
+
+def test_evicts_least_recently_used_files_by_size(small_cache):
+    for n in range(3):
+        small_cache.put_many({f"k{n}": _entry(n)})
+    small_cache.get_many(["k0"])  # touched: survives
+    small_cache.put_many({"k3": _entry(3)})
+
+    assert _keys(small_cache) == {"k0", "k2", "k3"}
+    assert small_cache.stats()["bytes"] == 90
+    assert small_cache.stats()["evictions"] == 1
+
+
+def test_oversized_files_are_not_kept(small_cache):
+    small_cache.put_many({"big": {"text": "x" * 200}, "k0": _entry(0)})
+    assert _keys(small_cache) == {"k0"}
+
+
+def test_rewrites_replace_their_size(small_cache):
+    small_cache.put_many({"k0": _entry(0), "k1": _entry(1), "k2": _entry(2)})
+    for _ in range(3):
+        small_cache.put_many({"k1": _entry(1)})
+    assert small_cache.stats()["evictions"] == 0
+
+    small_cache.put_many({"k1": {"text": "1"}})  # 12 bytes
+    small_cache.put_many({"k3": {"text": "3"}})
+    assert _keys(small_cache) == {"k0", "k1", "k2", "k3"}
+    assert small_cache.stats()["bytes"] == 84
+    assert small_cache.stats()["evictions"] == 0
+
+
+def test_size_is_picked_up_from_an_existing_file(small_cache):
+    small_cache.put_many({"k0": _entry(0), "k1": _entry(1)})
+    small_cache._store.close()  # as after a restart
+
+    small_cache.put_many({"k2": _entry(2), "k3": _entry(3)})
+    assert _keys(small_cache) == {"k1", "k2", "k3"}
+
+
+def test_writes_do_not_scan_the_table(small_cache):
+    small_cache.put_many({"warm-up": _entry(0)})  # connect (sums once) first
+    statements: list[str] = []
+    small_cache._store._db.set_trace_callback(statements.append)
+    for n in range(10):
+        small_cache.put_many({f"k{n}": _entry(n)})
+
+    assert not [s for s in statements if "SUM(" in s or "COUNT(" in s]
+    assert len(_keys(small_cache)) == 3
+
+
+@pytest.fixture
+def classify_calls(monkeypatch):
+    """Replace the backend with a counter so reuse is visible."""
+    calls = []
+
+    def fake(texts, stats=None):
+        calls.append(len(texts))
+        return [{"label": "positive", "score": 0.9, "compound": 0.9} for _ in texts]
+
+    monkeypatch.setattr(pipeline, "classify_batch", fake)
+    return calls
+
+
+def _run():
+    run = IncrementalRun.from_uploads([("Jane_Doe.txt", TRANSCRIPT)])
+    df = stage_01_tag_roles(run.parse(workers=1))
+    run.classify(run.split(df))
+    return run
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("_BACKEND", "lexicon"),
+    ("_CASCADE", "textblob"),
+    ("_CASCADE_BAND", 0.2),
+])
+def test_changing_sentiment_setup_reclassifies(monkeypatch, punkt, classify_calls, setting, value):
+    monkeypatch.setattr(sentiment_model, "_BACKEND", "openai")
+    monkeypatch.setattr(sentiment_model, "_OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(sentiment_model, "_CASCADE", "lexicon")
+    monkeypatch.setattr(sentiment_model, "_CASCADE_BAND", 0.5)
+
+    _run()
+    assert len(classify_calls) == 1
+    assert _run().reused == 1
+    assert len(classify_calls) == 1  # same setup: parsed lines and sentiment reused
+
+    monkeypatch.setattr(sentiment_model, setting, value)
+    assert _run().reused == 1        # the parse is still reused...
+    assert len(classify_calls) == 2  # ...but the sentences are classified again
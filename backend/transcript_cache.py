@@ -0,0 +1,77 @@
+"""
+Transcript cache: per-file stage results for the transcript pipeline.
+
+Each transcript file is keyed by a SHA-256 of (namespace, file bytes), where the
+namespace encodes the pipeline version and the parser settings that produced
+the entry — changing either automatically invalidates old entries. An entry
+holds the file's parsed lines, its sentence split and, per sentiment backend,
+its sentence classifications, so re-uploading a set with one new interview only
+parses and classifies the new file. Backed by the same SQLite LRU store as
+sentiment_cache, with least-recently-used files evicted once the stored
+payloads exceed the size cap.
+Entries are stored as JSON, so they must be plain lists/dicts/strings/numbers
+and reading the database never runs code from it.
+
+Environment:
+  TRANSCRIPT_CACHE           "0"/"false"/"off" disables the cache (default: on)
+  TRANSCRIPT_CACHE_PATH      SQLite file (default: backend/transcript_cache.db)
+  TRANSCRIPT_CACHE_MAX_MB    Size cap on stored payloads in MB (default: 512)
+"""
+
+import hashlib
+import json
+import os
+
+from sqlite_lru import SQLiteLRU
+
+ENABLED   = os.getenv("TRANSCRIPT_CACHE", "1").lower() not in ("0", "false", "off")
+DB_PATH   = os.getenv("TRANSCRIPT_CACHE_PATH", os.path.join(os.path.dirname(__file__), "transcript_cache.db"))
+MAX_BYTES = int(float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+_store = SQLiteLRU(DB_PATH, table="files", value_column="payload", capacity=MAX_BYTES, sized=True)
+
+
+def make_key(data: bytes, namespace: str) -> str:
+    """Content address for a file's bytes under a given pipeline namespace."""
+    h = hashlib.sha256(namespace.encode("utf-8"))
+    h.update(b"\x00")
+    h.update(data)
+    return h.hexdigest()
+
+
+def get_many(keys: list[str]) -> dict[str, dict]:
+    """
+    Look up cached file entries. Returns {key: entry} for hits only and bumps
+    their recency so they survive eviction.
+    """
+    if not ENABLED or not keys:
+        return {}
+    return {k: json.loads(v) for k, v in _store.get_many(keys).items()}
+
+
+def put_many(items: dict[str, dict]) -> None:
+    """
+    Store file entries, then evict least-recently-used files beyond MAX_BYTES.
+    A file bigger than the whole cache is not kept.
+    """
+    if not ENABLED or not items:
+        return
+    _store.put_many({k: json.dumps(v, separators=(",", ":")) for k, v in items.items()})
+
+
+def stats() -> dict:
+    """Hit/miss counters for this process plus the current on-disk footprint."""
+    s = _store.stats(read_db=ENABLED)
+    return {
+        "enabled":   ENABLED,
+        "entries":   s["entries"],
+        "bytes":     s["total"],
+        "max_bytes": _store.capacity,
+        **_store.counters,
+        "hit_ratio": s["hit_ratio"],
+    }
+
+
+def clear() -> None:
+    """Drop every cached file and reset the counters."""
+    _store.clear(read_db=ENABLED)
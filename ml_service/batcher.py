@@ -0,0 +1,115 @@
+# ml_service/batcher.py
+# Dynamic micro-batching for /analyze
+#
+# Concurrent requests each used to get their own forward pass at batch size
+# 1–20. The batcher instead queues every request's texts, waits up to
+# max_wait_ms (or until max_batch_size texts are waiting), runs ONE batched
+# inference on a dedicated worker thread, and routes each slice of results
+# back to the request that sent it. If a batch fails, its requests are re-run
+# one at a time so only the ones that actually fail get the exception.
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        infer: Callable[[list[str]], list],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self._infer = infer
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        # One thread: the model is never run concurrently with itself
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, texts: list[str]) -> list:
+        """Queue texts for the next batch; resolves to their results, in order."""
+        if not texts:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[list[str], asyncio.Future]]:
+        """Block for one request, then gather more until the batch is full or the wait expires."""
+        loop = asyncio.get_running_loop()
+        pending = [await self._queue.get()]
+        size = len(pending[0][0])
+        deadline = loop.time() + self._max_wait
+
+        while size < self._max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    def _infer_all(self, texts: list[str]) -> list:
+        """Runs on the worker thread; oversized batches go through in max_batch_size slices."""
+        results = []
+        for i in range(0, len(texts), self._max_batch_size):
+            results.extend(self._infer(texts[i:i + self._max_batch_size]))
+        return results
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = await self._collect()
+            live = [(texts, fut) for texts, fut in pending if not fut.done()]
+            if not live:
+                continue
+
+            texts = [t for request_texts, _ in live for t in request_texts]
+            try:
+                results = await loop.run_in_executor(self._executor, self._infer_all, texts)
+            except Exception as e:
+                if len(live) == 1:
+                    logger.exception("Batched inference failed")
+                    if not live[0][1].done():
+                        live[0][1].set_exception(e)
+                    continue
+                logger.warning("Batched inference failed (%s); retrying its %d requests one by one", e, len(live))
+                for request_texts, fut in live:
+                    await self._run_alone(request_texts, fut)
+                continue
+
+            offset = 0
+            for request_texts, fut in live:
+                if not fut.done():
+                    fut.set_result(results[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+    async def _run_alone(self, texts: list[str], future: asyncio.Future) -> None:
+        """Infer one request's texts by themselves; a failure only fails this request."""
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self._infer_all, texts)
+        except Exception as e:
+            logger.exception("Inference failed")
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(results)
@@ -0,0 +1,100 @@
+# ml_service/benchmark.py
+# Compare inference engines against the fp32 baseline
+#
+# Runs a fixed, seeded text set (short review snippets mixed with long posts)
+# through each engine with the same length bucketing /analyze uses, and
+# reports throughput, p50/p99 batch latency and label agreement with fp32.
+#
+#   python benchmark.py                         # fp32 vs int8 vs onnx
+#   python benchmark.py --engines int8 --texts 2000 --batch-size 32
+
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+import bucketing
+import engines
+
+MODEL_ID   = os.getenv("ML_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+MAX_TOKENS = 512
+
+_SNIPPETS = [
+    "Great service, will come back.",
+    "The food was cold and the staff ignored us.",
+    "It was fine, nothing special.",
+    "Absolutely loved the atmosphere!",
+    "Way too expensive for what you get.",
+    "Parking was a nightmare but the coffee made up for it.",
+    "Not bad at all.",
+    "I wouldn't recommend this place to anyone.",
+]
+
+
+def make_texts(n: int, seed: int = 0) -> list[str]:
+    """Deterministic mix: ~80% one-sentence snippets, ~20% long multi-sentence posts."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        if rng.random() < 0.8:
+            texts.append(rng.choice(_SNIPPETS))
+        else:
+            texts.append(" ".join(rng.choices(_SNIPPETS, k=rng.randint(10, 40)))[:1000])
+    return texts
+
+
+def run(forward, tokenizer, texts: list[str], batch_size: int, bucket_size: int) -> dict:
+    predict = lambda batch: bucketing.predict(tokenizer, forward, batch, bucket_size, MAX_TOKENS)[0]
+    predict(texts[:batch_size])  # warm-up
+
+    latencies, labels = [], []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        t0 = time.perf_counter()
+        probs = predict(texts[i:i + batch_size])
+        latencies.append(time.perf_counter() - t0)
+        labels.extend(probs.argmax(axis=1).tolist())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "texts_per_s": len(texts) / elapsed,
+        "p50_ms":      float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms":      float(np.percentile(latencies, 99)) * 1000,
+        "labels":      labels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ml_service inference engines against fp32")
+    parser.add_argument("--engines", nargs="+", default=["int8", "onnx"], choices=engines.ENGINES)
+    parser.add_argument("--texts", type=int, default=1000, help="Size of the fixed text set")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per batch (like ML_BATCH_MAX_SIZE)")
+    parser.add_argument("--bucket-size", type=int, default=8, help="Texts per length bucket (like ML_BUCKET_SIZE)")
+    parser.add_argument("--onnx-path", default=os.path.join("onnx", MODEL_ID.replace("/", "--") + ".onnx"))
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
+    texts = make_texts(args.texts)
+
+    rows = []
+    for name in ["fp32", *[e for e in args.engines if e != "fp32"]]:
+        # Fresh weights per engine: int8 quantizes its model in place.
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_ID)
+        forward = engines.load(name, model, args.onnx_path)
+        print(f"Running {name}...")
+        rows.append((name, run(forward, tokenizer, texts, args.batch_size, args.bucket_size)))
+        del model, forward
+
+    baseline = np.array(rows[0][1]["labels"])
+    print(f"\n{len(texts)} texts, batch size {args.batch_size}, bucket size {args.bucket_size}\n")
+    print(f"{'engine':<8}{'texts/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'agreement':>12}")
+    for name, r in rows:
+        agreement = float((np.array(r["labels"]) == baseline).mean())
+        print(f"{name:<8}{r['texts_per_s']:>10.1f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}{agreement:>11.2%}")
+
+
+if __name__ == "__main__":
+    main()
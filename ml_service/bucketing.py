@@ -0,0 +1,59 @@
+# ml_service/bucketing.py
+# Length-bucketed inference with dynamic padding
+#
+# Passing a mixed batch straight to the model pads every text to the longest
+# one, so a single 512-token post makes twenty 15-token review snippets cost
+# 512 tokens each. Here the batch is tokenized once up front, sorted by token
+# length, and cut into buckets of similar length; each bucket is padded only
+# to its own longest text. Results are scattered back into request order.
+
+from typing import Callable
+
+import numpy as np
+
+
+def predict(
+    tokenizer,
+    forward: Callable[[dict], np.ndarray],
+    texts: list[str],
+    bucket_size: int,
+    max_length: int = 512,
+) -> tuple[np.ndarray, list[int], list[int]]:
+    """
+    Run `forward` (padded encoding → class probabilities) over texts in
+    length-sorted buckets.
+
+    Returns (probs, tokens, padded), all in the original text order:
+      probs   — one row of class probabilities per text
+      tokens  — real token count per text
+      padded  — padded length each text actually ran at
+    """
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)
+    lengths = [len(ids) for ids in encoded["input_ids"]]
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+    probs: np.ndarray | None = None
+    padded = [0] * len(texts)
+    for start in range(0, len(order), bucket_size):
+        bucket = order[start:start + bucket_size]
+        batch = tokenizer.pad(
+            {key: [encoded[key][i] for i in bucket] for key in encoded.keys()},
+            padding="longest",
+            return_tensors="pt",
+        )
+        bucket_probs = forward(batch)
+        if probs is None:
+            probs = np.empty((len(texts), bucket_probs.shape[1]), dtype=bucket_probs.dtype)
+        probs[bucket] = bucket_probs
+
+        width = batch["input_ids"].shape[1]
+        for i in bucket:
+            padded[i] = width
+
+    return probs, lengths, padded
+
+
+def padding_ratio(tokens: list[int], padded: list[int]) -> float:
+    """Share of the computed positions that were padding (0.0 = none wasted)."""
+    total = sum(padded)
+    return round(1.0 - sum(tokens) / total, 4) if total else 0.0
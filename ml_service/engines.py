@@ -0,0 +1,94 @@
+# ml_service/engines.py
+# Inference engines for the sentiment model
+#
+# Every engine turns a padded encoding (input_ids / attention_mask tensors)
+# into class probabilities, so bucketing.predict and the /analyze contract
+# don't care which one is running:
+#
+#   fp32  — the PyTorch model as loaded (default)
+#   int8  — dynamic int8 quantization of every nn.Linear; roughly a quarter of
+#           the fp32 weight memory and faster matmuls on CPU
+#   onnx  — the model exported once to ONNX and run by ONNX Runtime
+#           (needs `pip install onnxruntime`)
+
+import logging
+import os
+from typing import Callable
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("fp32", "int8", "onnx")
+
+Forward = Callable[[dict], np.ndarray]
+
+
+def _torch_forward(model) -> Forward:
+    def forward(batch) -> np.ndarray:
+        with torch.inference_mode():
+            logits = model(input_ids=batch["input_ids"], attention_mask=batch["attention_mask"]).logits
+        return torch.softmax(logits, dim=-1).numpy()
+    return forward
+
+
+def _quantize(model):
+    # In place: the fp32 Linear weights are replaced, not kept alongside.
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _export_onnx(model, path: str) -> None:
+    """Export with dynamic batch and sequence axes (first run only)."""
+    logger.info(f"Exporting ONNX model to {path}...")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    dummy = torch.ones((1, 8), dtype=torch.long)
+    axes = {0: "batch", 1: "sequence"}
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (dummy, dummy),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": {0: "batch"}},
+            opset_version=17,
+        )
+
+
+def _onnx_forward(model, path: str) -> Forward:
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise RuntimeError("ML_ENGINE=onnx requires onnxruntime: pip install onnxruntime")
+
+    if not os.path.exists(path):
+        _export_onnx(model, path)
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = torch.get_num_threads()
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def forward(batch) -> np.ndarray:
+        (logits,) = session.run(["logits"], {
+            "input_ids":      batch["input_ids"].numpy(),
+            "attention_mask": batch["attention_mask"].numpy(),
+        })
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+    return forward
+
+
+def load(name: str, model, onnx_path: str) -> Forward:
+    """
+    Build the forward function for engine `name` from the fp32 model.
+    int8 quantizes `model` in place; load a fresh copy to compare against fp32.
+    """
+    model.eval()
+    if name == "fp32":
+        return _torch_forward(model)
+    if name == "int8":
+        return _torch_forward(_quantize(model))
+    if name == "onnx":
+        return _onnx_forward(model, onnx_path)
+    raise ValueError(f"Unknown ML_ENGINE {name!r}; choose one of {', '.join(ENGINES)}")
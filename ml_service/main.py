@@ -2,14 +2,23 @@
 # Cardiff RoBERTa sentiment microservice
 # Deploy this to Railway when ready to switch from OpenAI to the ML microservice
 
+import asyncio
+import json
 import os
 import logging
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import Headers
 from pydantic import BaseModel
 from transformers import pipeline
 
+import bucketing
+import engines
+import supervisor
+from batcher import MicroBatcher
+from result_cache import ResultCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,21 +32,52 @@ app.add_middleware(
 )
 
 ML_SERVICE_SECRET = os.getenv("ML_SERVICE_SECRET", "")
+# Override with a tiny sequence-classification model for local testing
+MODEL_ID = os.getenv("ML_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+
+# Micro-batching: texts from concurrent requests are pooled for up to
+# ML_BATCH_MAX_WAIT_MS (or until ML_BATCH_MAX_SIZE texts) per forward pass.
+ML_BATCH_MAX_SIZE    = int(os.getenv("ML_BATCH_MAX_SIZE", "32"))
+ML_BATCH_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "5"))
+# Length buckets: each batch is sorted by token length and run in buckets of
+# this many texts, each padded only to its own longest text.
+ML_BUCKET_SIZE       = int(os.getenv("ML_BUCKET_SIZE", "8"))
+MAX_TOKENS           = 512
+MAX_CHARS            = 1000
+# /analyze_stream reads, scores and writes back this many texts at a time.
+ML_STREAM_CHUNK_SIZE = int(os.getenv("ML_STREAM_CHUNK_SIZE", "64"))
+# Result cache: LRU of this many results per process (0 disables); with a
+# spill path, evicted entries go to SQLite instead of being dropped.
+ML_CACHE_SIZE        = int(os.getenv("ML_CACHE_SIZE", "50000"))
+ML_CACHE_SPILL_PATH  = os.getenv("ML_CACHE_SPILL_PATH") or None
+ML_CACHE_SPILL_MAX   = int(os.getenv("ML_CACHE_SPILL_MAX_ENTRIES", "1000000"))
+# Inference engine: fp32 (default), int8 (dynamic quantization) or onnx
+# (ONNX Runtime; the export is written to ML_ONNX_PATH on first start).
+ML_ENGINE            = os.getenv("ML_ENGINE", "fp32").lower()
+ML_ONNX_PATH         = os.getenv("ML_ONNX_PATH", os.path.join("onnx", MODEL_ID.replace("/", "--") + ".onnx"))
 
 # -------------------------------------------------------------------
 # Model loads ONCE at startup and stays in memory.
 # Every request reuses this — no reloading per request.
 # This is why the microservice solves the Vercel memory problem.
 # -------------------------------------------------------------------
+if supervisor.ML_TORCH_THREADS > 0:
+    supervisor.pin_threads(supervisor.ML_TORCH_THREADS)
 logger.info("Loading Cardiff sentiment model...")
 sentiment_pipeline = pipeline(
     task="sentiment-analysis",
-    model="cardiffnlp/twitter-roberta-base-sentiment-latest",
+    model=MODEL_ID,
     top_k=None,
     truncation=True,
-    max_length=512
+    max_length=MAX_TOKENS
 )
-logger.info("Model ready.")
+tokenizer = sentiment_pipeline.tokenizer
+id2label  = sentiment_pipeline.model.config.id2label
+forward   = engines.load(ML_ENGINE, sentiment_pipeline.model, ML_ONNX_PATH)
+# Only the engine keeps a reference to the weights it needs; for int8/onnx
+# this lets the fp32 copy be freed.
+del sentiment_pipeline
+logger.info(f"Model ready ({ML_ENGINE}).")
 
 LABEL_MAP = {
     "LABEL_0": "negative",
@@ -46,14 +86,92 @@ LABEL_MAP = {
 }
 
 
-@app.middleware("http")
-async def verify_secret(request: Request, call_next):
-    if request.url.path == "/health":
-        return await call_next(request)
-    if ML_SERVICE_SECRET:
-        if request.headers.get("X-Internal-Secret", "") != ML_SERVICE_SECRET:
-            return JSONResponse(status_code=403, content={"error": "Forbidden"})
-    return await call_next(request)
+def _format(result: list[dict]) -> dict:
+    best = max(result, key=lambda x: x["score"])
+    label = LABEL_MAP.get(best["label"], best["label"])
+    score = round(best["score"], 4)
+    compound = score if label == "positive" else (-score if label == "negative" else 0.0)
+    return {
+        "label": label,
+        "score": score,
+        "compound": round(compound, 4)
+    }
+
+
+def infer(texts: list[str]) -> list[dict]:
+    """
+    Length-bucketed forward passes over texts → formatted results, in order.
+    Each result also carries its real and padded token counts, which /analyze
+    strips off and reports as the request's padding ratio.
+    """
+    probs, tokens, padded = bucketing.predict(tokenizer, forward, texts, ML_BUCKET_SIZE, MAX_TOKENS)
+    results = []
+    for row, n_tokens, n_padded in zip(probs.tolist(), tokens, padded):
+        result = _format([{"label": id2label[i], "score": p} for i, p in enumerate(row)])
+        result["tokens"], result["padded"] = n_tokens, n_padded
+        results.append(result)
+    return results
+
+
+_heartbeat: asyncio.Task | None = None
+batcher = MicroBatcher(infer, max_batch_size=ML_BATCH_MAX_SIZE, max_wait_ms=ML_BATCH_MAX_WAIT_MS)
+cache = ResultCache(f"{MODEL_ID}:{ML_ENGINE}", ML_CACHE_SIZE, ML_CACHE_SPILL_PATH, ML_CACHE_SPILL_MAX)
+
+
+async def score(texts: list[str]) -> tuple[list[dict], float]:
+    """
+    Cached results for repeat texts, inference for the rest (each distinct
+    text once). Returns results in order and the padding ratio of the misses.
+    """
+    keys = [cache.key(t) for t in texts]
+    results = await cache.get_many(keys)
+
+    misses = list(dict.fromkeys(k for k, r in zip(keys, results) if r is None))
+    if not misses:
+        return results, 0.0
+    miss_texts = {k: t for k, t in zip(keys, texts)}
+    fresh = dict(zip(misses, await batcher.submit([miss_texts[k] for k in misses])))
+
+    tokens = [r.pop("tokens") for r in fresh.values()]
+    padded = [r.pop("padded") for r in fresh.values()]
+    await cache.put_many(fresh)
+    results = [r if r is not None else dict(fresh[k]) for k, r in zip(keys, results)]
+    return results, bucketing.padding_ratio(tokens, padded)
+
+
+@app.on_event("startup")
+async def start_batcher():
+    global _heartbeat
+    await batcher.start()
+    supervisor.mark_ready()
+    _heartbeat = asyncio.create_task(supervisor.heartbeat())
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
+
+
+class VerifySecret:
+    """
+    X-Internal-Secret check on everything but /health. Plain ASGI rather than
+    @app.middleware("http"): that wraps every response in a StreamingResponse
+    which listens on receive() and would eat /analyze_stream's request body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] != "/health" and ML_SERVICE_SECRET:
+            if Headers(scope=scope).get("X-Internal-Secret", "") != ML_SERVICE_SECRET:
+                response = JSONResponse(status_code=403, content={"error": "Forbidden"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(VerifySecret)
 
 
 class AnalyzeRequest(BaseModel):
@@ -63,37 +181,115 @@ class AnalyzeRequest(BaseModel):
 
 @app.get("/health")
 def health():
-    return {"status": "ok", "model": "cardiffnlp/twitter-roberta-base-sentiment-latest"}
+    workers = supervisor.worker_status()
+    if workers is None:
+        return {"status": "ok", "model": MODEL_ID, "engine": ML_ENGINE}
+    status = "ok" if all(w["ready"] for w in workers) else "degraded"
+    return {"status": status, "model": MODEL_ID, "engine": ML_ENGINE, "workers": workers}
+
+
+@app.get("/metrics")
+def metrics():
+    return {"model": MODEL_ID, "engine": ML_ENGINE, "cache": cache.metrics()}
 
 
 @app.post("/analyze")
-def analyze(request: AnalyzeRequest):
+async def analyze(request: AnalyzeRequest):
     if request.texts:
-        texts = [t[:1000] for t in request.texts]
+        texts = [t[:MAX_CHARS] for t in request.texts]
     elif request.text:
-        texts = [request.text[:1000]]
+        texts = [request.text[:MAX_CHARS]]
     else:
         return JSONResponse(status_code=400, content={"error": "Provide 'text' or 'texts'"})
 
-    raw_results = sentiment_pipeline(texts)
-
-    formatted = []
-    for result in raw_results:
-        best = max(result, key=lambda x: x["score"])
-        label = LABEL_MAP.get(best["label"], best["label"])
-        score = round(best["score"], 4)
-        compound = score if label == "positive" else (-score if label == "negative" else 0.0)
-        formatted.append({
-            "label": label,
-            "score": score,
-            "compound": round(compound, 4)
-        })
+    formatted, ratio = await score(texts)
 
     if request.texts:
-        return {"results": formatted}
-    return {"result": formatted[0]}
+        return {"results": formatted, "padding_ratio": ratio}
+    return {"result": formatted[0], "padding_ratio": ratio}
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator reads the request body as it goes.
+    Starlette's version listens on receive() for a disconnect while streaming,
+    which races request.stream() for the same messages and silently drops body
+    chunks. Here the generator owns receive(); a client disconnect surfaces as
+    ClientDisconnect from request.stream() or as a failed send.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _ndjson_lines(request: Request):
+    """Non-blank lines of the request body, as they arrive."""
+    buffer = b""
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _parse_line(line: bytes) -> str | None:
+    """A line is {"text": "..."} or a bare JSON string; None if it's neither."""
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return None
+    text = item.get("text") if isinstance(item, dict) else item
+    return text[:MAX_CHARS] if isinstance(text, str) else None
+
+
+async def _score_chunk(chunk: list[tuple[int, str | None]]):
+    texts = [text for _, text in chunk if text is not None]
+    results = iter((await score(texts))[0])
+    for index, text in chunk:
+        if text is None:
+            row = {"index": index, "error": "Expected {\"text\": ...} or a JSON string"}
+        else:
+            row = {"index": index, **next(results)}
+        yield json.dumps(row) + "\n"
+
+
+async def _stream_results(request: Request):
+    chunk: list[tuple[int, str | None]] = []
+    index = 0
+    async for line in _ndjson_lines(request):
+        chunk.append((index, _parse_line(line)))
+        index += 1
+        if len(chunk) >= ML_STREAM_CHUNK_SIZE:
+            async for row in _score_chunk(chunk):
+                yield row
+            chunk = []
+    if chunk:
+        async for row in _score_chunk(chunk):
+            yield row
+
+
+@app.post("/analyze_stream")
+async def analyze_stream(request: Request):
+    """
+    NDJSON in, NDJSON out: one {"text": ...} (or JSON string) per request line,
+    one {"index", "label", "score", "compound"} per response line, in input
+    order. Texts are read and scored ML_STREAM_CHUNK_SIZE at a time, so memory
+    stays flat and results start flowing before the upload finishes.
+    """
+    return _DuplexStreamingResponse(_stream_results(request), media_type="application/x-ndjson")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    if supervisor.ML_WORKERS > 1:
+        supervisor.serve(
+            app, "0.0.0.0", 8001, supervisor.ML_WORKERS,
+            warmup=lambda: infer(["Warm-up text."]), engine=ML_ENGINE,
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,210 @@
+# ml_service/result_cache.py
+# In-process LRU cache of formatted results, in front of inference
+#
+# Callers re-send the same reviews and posts constantly. Results are keyed by
+# a SHA-256 of (namespace, truncated text) — the namespace being model id and
+# engine — and held in an in-memory LRU. With a spill path set, entries
+# evicted from memory go to a SQLite file instead of being dropped, and a
+# disk hit is promoted back into memory. Only misses reach the model.
+#
+# The memory tier is used from the event loop thread only, so no locking.
+# Spill reads and writes run on one I/O thread per process so a disk lookup
+# never stalls the loop. In pre-forked mode each worker has its own memory
+# tier; the spill file is shared (SQLite WAL), and each worker evicts against
+# its own running count of the spill rows.
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _rss_bytes() -> int | None:
+    """Resident set size of this process (Linux), or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _entry_size(key: bytes, result: dict) -> int:
+    return (
+        sys.getsizeof(key) + sys.getsizeof(result)
+        + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in result.items())
+    )
+
+
+class ResultCache:
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int,
+        spill_path: str | None = None,
+        spill_max_entries: int = 1_000_000,
+    ):
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._memory: OrderedDict[bytes, dict] = OrderedDict()
+        self._memory_bytes = 0
+        self._spill_path = spill_path if max_entries > 0 else None
+        self._spill_max_entries = spill_max_entries
+        self._db: sqlite3.Connection | None = None
+        self._db_pid: int | None = None
+        self._io: ThreadPoolExecutor | None = None
+        self._io_pid: int | None = None
+        # Spill rows and the last eviction-order seq, read once at open and
+        # then tracked here so writes don't scan the table
+        self._spill_entries = 0
+        self._spill_seq = 0
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "spilled": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def _spill(self) -> sqlite3.Connection | None:
+        """The spill connection, opened lazily per process (never shared across fork)."""
+        if self._spill_path is None:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            self._db, self._db_pid = self._open(self._spill_path), os.getpid()
+            self._spill_entries, self._spill_seq = self._db.execute(
+                "SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM spill"
+            ).fetchone()
+        return self._db
+
+    async def _on_io_thread(self, fn, *args):
+        """Run a spill operation on this process's single I/O thread."""
+        if self._io is None or self._io_pid != os.getpid():
+            # Threads don't survive fork(): each worker starts its own
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache-spill")
+            self._io_pid = os.getpid()
+        return await asyncio.get_running_loop().run_in_executor(self._io, fn, *args)
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS spill (
+                key    BLOB PRIMARY KEY,
+                result TEXT NOT NULL,
+                seq    INTEGER NOT NULL
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_spill_seq ON spill (seq)")
+        db.commit()
+        return db
+
+    def key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self._namespace}\x00{text}".encode("utf-8")).digest()
+
+    async def get_many(self, keys: list[bytes]) -> list[dict | None]:
+        """Cached result per key (a copy), or None for misses."""
+        if not self.enabled:
+            return [None] * len(keys)
+
+        found: list[dict | None] = []
+        missing: list[int] = []
+        for i, key in enumerate(keys):
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._counters["hits"] += 1
+                found.append(dict(result))
+            else:
+                found.append(None)
+                missing.append(i)
+
+        if missing and self._spill_path is not None:
+            from_disk = await self._on_io_thread(self._read_spill, [keys[i] for i in missing])
+            promoted = {}
+            for i in missing:
+                result = from_disk.get(keys[i])
+                if result is not None:
+                    self._counters["disk_hits"] += 1
+                    found[i] = dict(result)
+                    promoted[keys[i]] = result
+            missing = [i for i in missing if found[i] is None]
+            if promoted:
+                await self.put_many(promoted)
+
+        self._counters["misses"] += len(missing)
+        return found
+
+    async def put_many(self, items: dict[bytes, dict]) -> None:
+        if not self.enabled:
+            return
+        for key, result in items.items():
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= _entry_size(key, old)
+            self._memory[key] = dict(result)
+            self._memory_bytes += _entry_size(key, result)
+
+        evicted = {}
+        while len(self._memory) > self._max_entries:
+            key, result = self._memory.popitem(last=False)
+            self._memory_bytes -= _entry_size(key, result)
+            evicted[key] = result
+        self._counters["evictions"] += len(evicted)
+        if evicted and self._spill_path is not None:
+            await self._on_io_thread(self._write_spill, evicted)
+            self._counters["spilled"] += len(evicted)
+
+    def _read_spill(self, keys: list[bytes]) -> dict[bytes, dict]:
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, result in self._spill().execute(
+                f"SELECT key, result FROM spill WHERE key IN ({placeholders})", chunk
+            ):
+                found[bytes(key)] = json.loads(result)
+        return found
+
+    def _write_spill(self, items: dict[bytes, dict]) -> None:
+        db = self._spill()
+        keys = list(items)
+        existing = 0
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            (n,) = db.execute(f"SELECT COUNT(*) FROM spill WHERE key IN ({placeholders})", chunk).fetchone()
+            existing += n
+        db.executemany(
+            "INSERT OR REPLACE INTO spill (key, result, seq) VALUES (?, ?, ?)",
+            [(key, json.dumps(result), self._spill_seq + n) for n, (key, result) in enumerate(items.items(), start=1)],
+        )
+        self._spill_seq += len(items)
+        self._spill_entries += len(items) - existing
+        excess = self._spill_entries - self._spill_max_entries
+        if excess > 0:
+            self._spill_entries -= db.execute(
+                "DELETE FROM spill WHERE key IN (SELECT key FROM spill ORDER BY seq LIMIT ?)", (excess,)
+            ).rowcount
+        db.commit()
+
+    def metrics(self) -> dict:
+        c = self._counters
+        lookups = c["hits"] + c["disk_hits"] + c["misses"]
+        metrics = {
+            "enabled":           self.enabled,
+            **c,
+            "hit_ratio":         round((c["hits"] + c["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            "entries":           len(self._memory),
+            "max_entries":       self._max_entries,
+            "memory_bytes":      self._memory_bytes,
+            "process_rss_bytes": _rss_bytes(),
+        }
+        if self._spill_path is not None:
+            # Known once the spill file has been opened by this process
+            metrics["spill_entries"] = self._spill_entries if self._db_pid == os.getpid() else None
+        return metrics
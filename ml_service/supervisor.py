@@ -0,0 +1,177 @@
+# ml_service/supervisor.py
+# Pre-forked multi-worker mode (ML_WORKERS > 1)
+#
+# Running N uvicorn workers the usual way imports main.py N times: N model
+# loads and N copies of the weights. Instead the supervisor process loads and
+# warms the model once, binds the listening socket, and forks the workers.
+# Forked children share the parent's weight pages copy-on-write — inference
+# only reads them — so N workers cost roughly one model's RAM.
+#
+# Each worker pins its torch intra-op thread count (ML_TORCH_THREADS, default
+# cores / workers) so the workers don't oversubscribe the CPU. Workers publish
+# pid, readiness and a heartbeat into a small shared-memory table that /health
+# reports from whichever worker answers. A worker that exits is re-forked from
+# the supervisor, again without reloading the model.
+
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+ML_WORKERS       = int(os.getenv("ML_WORKERS", "1"))
+ML_TORCH_THREADS = int(os.getenv("ML_TORCH_THREADS", "0"))  # 0 = cores / workers
+
+HEARTBEAT_INTERVAL = 1.0   # seconds
+HEARTBEAT_TIMEOUT  = 5.0   # a worker silent for longer is reported not ready
+
+# Shared per-worker slots: [pid, ready, last heartbeat (time.time())]
+_SLOT = 3
+_table = None
+_index: int | None = None
+
+
+def threads_per_worker(workers: int) -> int:
+    if ML_TORCH_THREADS > 0:
+        return ML_TORCH_THREADS
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def pin_threads(threads: int) -> None:
+    import torch
+    torch.set_num_threads(threads)
+
+
+# -------------------------------------------------------------------
+# Worker side — no-ops when running as a single plain process
+# -------------------------------------------------------------------
+
+def mark_ready() -> None:
+    if _table is not None:
+        _table[_index * _SLOT + 1] = 1.0
+        _table[_index * _SLOT + 2] = time.time()
+
+
+async def heartbeat() -> None:
+    """Runs for the worker's lifetime, refreshing its heartbeat."""
+    import asyncio
+    while _table is not None:
+        _table[_index * _SLOT + 2] = time.time()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+def worker_status() -> list[dict] | None:
+    """Per-worker readiness as seen from shared memory; None in single-process mode."""
+    if _table is None:
+        return None
+    now = time.time()
+    status = []
+    for i in range(len(_table) // _SLOT):
+        pid, ready, beat = _table[i * _SLOT:(i + 1) * _SLOT]
+        age = now - beat if beat else None
+        status.append({
+            "worker":          i,
+            "pid":             int(pid),
+            "ready":           bool(ready) and age is not None and age < HEARTBEAT_TIMEOUT,
+            "heartbeat_age_s": round(age, 1) if age is not None else None,
+        })
+    return status
+
+
+# -------------------------------------------------------------------
+# Supervisor side
+# -------------------------------------------------------------------
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, index: int, threads: int) -> None:
+    """Child process body; never returns."""
+    global _index
+    _index = index
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    _table[index * _SLOT] = os.getpid()
+    _table[index * _SLOT + 1] = 0.0
+    pin_threads(threads)
+
+    import uvicorn
+    code = 0
+    try:
+        uvicorn.Server(uvicorn.Config(app, log_level="info")).run(sockets=[sock])
+    except Exception:
+        logger.exception(f"Worker {index} crashed")
+        code = 1
+    finally:
+        _table[index * _SLOT + 1] = 0.0
+        os._exit(code)
+
+
+def _spawn(app, sock: socket.socket, index: int, threads: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        _run_worker(app, sock, index, threads)
+    logger.info(f"Worker {index} started (pid {pid}, {threads} torch threads)")
+    return pid
+
+
+def serve(app, host: str, port: int, workers: int, warmup: Callable[[], None], engine: str) -> None:
+    """Warm the already-loaded model, then fork `workers` uvicorn workers and babysit them."""
+    global _table
+    if engine == "onnx":
+        # ONNX Runtime's thread pool does not survive fork()
+        raise RuntimeError("ML_WORKERS > 1 supports the fp32 and int8 engines, not onnx")
+
+    threads = threads_per_worker(workers)
+    # Warm up single-threaded so no intra-op pool is running when we fork.
+    pin_threads(1)
+    warmup()
+    # Keep the GC from touching (and so copying) every pre-fork object's pages.
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(host, port)
+    _table = multiprocessing.RawArray("d", workers * _SLOT)
+    pids = {_spawn(app, sock, i, threads): i for i in range(workers)}
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while pids:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = pids.pop(pid, None)
+        if index is None:
+            continue
+        _table[index * _SLOT + 1] = 0.0
+        if not stopping:
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}; restarting")
+            time.sleep(1.0)
+            pids[_spawn(app, sock, index, threads)] = index
+
+    sock.close()
+    logger.info("All workers stopped.")
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The service is a flat set of modules run from ml_service/ (`python main.py`),
+# so tests import them the same way.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py loads its model at import; keep that small unless told otherwise.
+os.environ.setdefault("ML_MODEL", "hf-internal-testing/tiny-random-RobertaForSequenceClassification")
+os.environ.setdefault("ML_CACHE_SIZE", "0")
@@ -0,0 +1,63 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+httpx = pytest.importorskip("httpx")
+uvicorn = pytest.importorskip("uvicorn")
+
+import main
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            pytest.fail("uvicorn did not start")
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=10)
+
+
+@pytest.mark.parametrize("n", [1, main.ML_STREAM_CHUNK_SIZE + 1, 2000])
+def test_chunked_upload_returns_one_row_per_line(base_url, n):
+    def body():
+        # Many small chunks: each one is a separate http.request message, which
+        # is what a receive() listener racing request.stream() used to swallow.
+        for i in range(n):
+            yield (json.dumps({"text": f"review number {i} was fine"}) + "\n").encode()
+
+    r = httpx.post(
+        f"{base_url}/analyze_stream",
+        content=body(),
+        headers={"X-Internal-Secret": main.ML_SERVICE_SECRET},
+        timeout=30,
+    )
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines() if line]
+    assert len(rows) == n
+    assert [row["index"] for row in rows] == list(range(n))
+    assert all("label" in row for row in rows)
+
+
+def test_bad_lines_keep_their_index(base_url):
+    body = b'{"text": "good"}\nnot json\n"bare string"\n\n{"nope": 1}\n'
+    r = httpx.post(
+        f"{base_url}/analyze_stream", content=iter([body[:10], body[10:]]),
+        headers={"X-Internal-Secret": main.ML_SERVICE_SECRET}, timeout=30,
+    )
+    rows = [json.loads(line) for line in r.text.splitlines() if line]
+    assert [row["index"] for row in rows] == [0, 1, 2, 3]
+    assert ["error" in row for row in rows] == [False, True, False, True]
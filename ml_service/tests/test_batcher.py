@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from batcher import MicroBatcher
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Model:
+    """Upper-cases its inputs, recording each batch; fails on any text "bad"."""
+
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[str]:
+        self.batches.append(list(texts))
+        if "bad" in texts:
+            raise ValueError("bad input")
+        return [t.upper() for t in texts]
+
+
+async def started(model: Model, **kwargs) -> MicroBatcher:
+    batcher = MicroBatcher(model, **kwargs)
+    await batcher.start()
+    return batcher
+
+
+def test_full_batch_does_not_wait():
+    model = Model()
+
+    async def go():
+        batcher = await started(model, max_batch_size=4, max_wait_ms=5000)
+        try:
+            t0 = time.monotonic()
+            out = await asyncio.gather(*(batcher.submit([t]) for t in "abcd"))
+            return out, time.monotonic() - t0
+        finally:
+            await batcher.stop()
+
+    out, elapsed = run(go())
+    assert out == [["A"], ["B"], ["C"], ["D"]]
+    assert model.batches == [["a", "b", "c", "d"]]
+    assert elapsed < 1
+
+
+def test_requests_within_the_wait_share_a_batch():
+    model = Model()
+
+    async def go():
+        batcher = await started(model, max_batch_size=100, max_wait_ms=100)
+        try:
+            async def later(delay, texts):
+                await asyncio.sleep(delay)
+                return await batcher.submit(texts)
+
+            return await asyncio.gather(later(0, ["a"]), later(0.02, ["b"]), later(0.3, ["c"]))
+        finally:
+            await batcher.stop()
+
+    assert run(go()) == [["A"], ["B"], ["C"]]
+    assert model.batches == [["a", "b"], ["c"]]
+
+
+def test_results_are_routed_to_their_request():
+    model = Model()
+
+    async def go():
+        batcher = await started(model, max_batch_size=4, max_wait_ms=50)
+        try:
+            return await asyncio.gather(batcher.submit(["a", "b", "c"]), batcher.submit(["d", "e"]), batcher.submit([]))
+        finally:
+            await batcher.stop()
+
+    assert run(go()) == [["A", "B", "C"], ["D", "E"], []]
+    assert model.batches == [["a", "b", "c", "d"], ["e"]]  # a batch over the limit runs in slices
+
+
+def test_failure_only_fails_the_requests_that_fail():
+    model = Model()
+
+    async def go():
+        batcher = await started(model, max_batch_size=10, max_wait_ms=50)
+        try:
+            first = await asyncio.gather(
+                batcher.submit(["a"]), batcher.submit(["bad", "b"]), batcher.submit(["c"]),
+                return_exceptions=True,
+            )
+            return first, await batcher.submit(["d"])  # the worker is still running
+        finally:
+            await batcher.stop()
+
+    (ok, failed, also_ok), after = run(go())
+    assert (ok, also_ok, after) == (["A"], ["C"], ["D"])
+    assert isinstance(failed, ValueError)
+    assert model.batches == [["a", "bad", "b", "c"], ["a"], ["bad", "b"], ["c"], ["d"]]
+
+
+def test_lone_failing_request_is_not_retried():
+    model = Model()
+
+    async def go():
+        batcher = await started(model, max_batch_size=10, max_wait_ms=1)
+        try:
+            with pytest.raises(ValueError):
+                await batcher.submit(["bad"])
+        finally:
+            await batcher.stop()
+
+    run(go())
+    assert model.batches == [["bad"]]
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from result_cache import ResultCache
+
+RESULT = {"label": "positive", "score": 0.9, "compound": 0.9}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / "spill.db")
+
+
+def test_memory_lru(spill_path):
+    async def go():
+        cache = ResultCache("m", max_entries=2)
+        keys = [cache.key(t) for t in "abc"]
+        await cache.put_many({keys[0]: RESULT, keys[1]: RESULT})
+        await cache.get_many([keys[0]])               # a is now most recent
+        await cache.put_many({keys[2]: RESULT})       # evicts b
+        return await cache.get_many(keys)
+
+    assert [r is not None for r in run(go())] == [True, False, True]
+
+
+def test_evicted_entries_spill_and_come_back(spill_path):
+    async def go():
+        cache = ResultCache("m", max_entries=1, spill_path=spill_path)
+        a, b = cache.key("a"), cache.key("b")
+        await cache.put_many({a: RESULT})
+        await cache.put_many({b: RESULT})             # a spills to disk
+        found = await cache.get_many([a, b])
+        return found, cache.metrics()
+
+    found, metrics = run(go())
+    assert found == [RESULT, RESULT]
+    assert metrics["disk_hits"] == 1 and metrics["hits"] == 1 and metrics["spilled"] >= 1
+
+
+def test_spill_cap_is_kept_without_counting_the_table(spill_path):
+    async def go():
+        cache = ResultCache("m", max_entries=1, spill_path=spill_path, spill_max_entries=3)
+        statements: list[str] = []
+        await cache.put_many({cache.key("warm"): RESULT})
+        await cache.put_many({cache.key("up"): RESULT})   # opens the spill file
+        await cache._on_io_thread(lambda: cache._spill().set_trace_callback(statements.append))
+        for n in range(10):
+            await cache.put_many({cache.key(str(n)): RESULT})
+        await cache._on_io_thread(lambda: cache._spill().set_trace_callback(None))
+        rows = await cache._on_io_thread(lambda: cache._spill().execute("SELECT COUNT(*) FROM spill").fetchone()[0])
+        return statements, rows, cache.metrics()
+
+    statements, rows, metrics = run(go())
+    assert rows == 3 and metrics["spill_entries"] == 3
+    assert not [s for s in statements if "MAX(seq)" in s or s.strip() == "SELECT COUNT(*) FROM spill"]
+
+
+def test_spill_count_and_order_survive_reopening(spill_path):
+    async def fill(names):
+        cache = ResultCache("m", max_entries=1, spill_path=spill_path, spill_max_entries=3)
+        for name in names:
+            await cache.put_many({cache.key(name): RESULT})
+        return cache
+
+    run(fill(["a", "b", "c"]))                 # a, b spilled (c only in memory, lost)
+    cache = run(fill(["d", "e", "f"]))         # after a restart: d, e spill, oldest (a) evicted
+
+    async def on_disk():
+        return await cache._on_io_thread(cache._read_spill, [cache.key(n) for n in "abcdef"])
+
+    assert set(run(on_disk())) == {cache.key(n) for n in "bde"}
+
+
+def test_spill_io_runs_off_the_event_loop(spill_path, monkeypatch):
+    threads = set()
+    read = ResultCache._read_spill
+
+    def spy(self, keys):
+        threads.add(threading.get_ident())
+        return read(self, keys)
+
+    monkeypatch.setattr(ResultCache, "_read_spill", spy)
+
+    async def go():
+        cache = ResultCache("m", max_entries=1, spill_path=spill_path)
+        await cache.get_many([cache.key("missing")])
+        return threading.get_ident()
+
+    loop_thread = run(go())
+    assert threads and loop_thread not in threads